@@ -11,17 +11,36 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    from app import log
+    log.init_app(app)
+
+    from app import database
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = database.engine_options(app.config)
     db.init_app(app)
+    database.init_app(app)
     jwt.init_app(app)
     CORS(app, supports_credentials=True)
 
-    from app.routes import auth, interview, info
+    from app import metrics, profiling
+    metrics.init_app(app)
+    profiling.init_app(app)
+
+    from app.routes import auth, interview, info, video, admin
+    from app.routes import metrics as metrics_routes
     app.register_blueprint(auth.bp)
     app.register_blueprint(interview.bp)
     app.register_blueprint(info.bp)
+    app.register_blueprint(video.bp)
+    app.register_blueprint(metrics_routes.bp)
+    app.register_blueprint(admin.bp)
     
 
+    from app.migrations import run_migrations
     with app.app_context():
-        db.create_all()
+        # 없는 테이블은 create_all, 기존 테이블의 인덱스 등은 마이그레이션으로 (여러 프로세스가 동시에 시작해도 한 번씩)
+        run_migrations()
+
+    from app.services import question_pool
+    question_pool.init_app(app)
 
     return app
@@ -0,0 +1,278 @@
+"""
+ASGI 서빙 모드 (저장소 루트의 asgi.py: uvicorn asgi:app)
+- LLM 을 기다리는 엔드포인트는 요청을 Flask 로 넘기기 전에 이 이벤트 루프 위에서 LLM 결과를 먼저 받아 둔다
+  (AsyncOpenAI, app/prefetch.py). 기다리는 동안 스레드를 점유하지 않으므로 수백 개의 LLM 호출이
+  한 프로세스 안에서 동시에 진행돼도 /info 같은 빠른 요청은 스레드 풀에서 바로 처리된다
+    GET /api/interview            : async_generate_question
+    GET /api/interview/start      : 질문 풀에서 꺼내고, 비어 있으면 async_generate_question
+    GET /api/interview/analysis   : 분석 작업을 큐에 넣고 완료를 await (LLM 호출은 ANALYSIS_WORKERS 풀에서)
+                                    → 뷰는 WSGI 모드와 같이 작업 결과를 DB 에서 읽어 응답
+- 미리 받은 질문 세트가 응답으로 나가지 못하면 (인증/뷰 오류, 연결 끊김) 풀에 되돌린다
+  /api/analysis/info 는 이미 작업 큐 + 202 응답이라 요청 안에서 LLM 을 기다리지 않으므로 그대로 둔다
+- 그 밖의 처리(JWT, CORS, DB, 메트릭/프로파일링 훅, 응답 형식)는 전부 기존 Flask 앱이
+  ASGI_THREADS 크기의 스레드 풀에서 그대로 한다
+- 요청 본문은 Flask 가 읽는 만큼 receive() 로 받고, 응답은 조각마다 바로 send() 한다 (_WsgiRequest)
+- Flask 의 async def 뷰는 요청마다 새 이벤트 루프를 만들어 끝날 때까지 워커 스레드를 붙잡으므로 쓰지 않는다
+"""
+
+import io
+import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from flask_jwt_extended import decode_token
+
+from app import profiling
+from app.log import get_logger
+from app.prefetch import PREFETCH_KEY, PREFETCH_PROFILE_KEY
+from app.services import analysis_jobs, question_pool
+from app.services.llm_service import async_generate_question
+
+logger = get_logger(__name__)
+
+ANALYSIS_POLL_INTERVAL = 0.5  # 다른 워커가 실행 중인 작업을 기다릴 때 DB 확인 간격 (초)
+
+
+class _WsgiInput(io.RawIOBase):
+    """
+    wsgi.input: 워커 스레드가 읽는 만큼만 이벤트 루프의 receive() 로 본문을 받아 온다
+    (본문 전체를 메모리/임시 파일에 모아 두지 않으므로 영상 업로드의 Content-Length 확인과 조각 단위 쓰기가 그대로 동작)
+    """
+
+    def __init__(self, receive, loop: asyncio.AbstractEventLoop):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = b""
+        self._more = True
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer and self._more:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message["type"] == "http.disconnect":
+                # 본문이 Content-Length 보다 짧게 끝나면 werkzeug 가 ClientDisconnected 로 처리
+                self._more = False
+                break
+            self._buffer = message.get("body", b"")
+            self._more = message.get("more_body", False)
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class _WsgiRequest:
+    """ASGI 요청 하나를 Flask(WSGI) 앱으로 실행 (run() 은 스레드 풀에서 호출)"""
+
+    def __init__(self, app, scope, receive, send, loop: asyncio.AbstractEventLoop, extra_environ: Dict[str, Any]):
+        self.app = app
+        self.scope = scope
+        self.send = send
+        self.loop = loop
+        self.environ = _build_environ(scope, io.BufferedReader(_WsgiInput(receive, loop)))
+        self.environ.update(extra_environ)
+        self.response_start: Optional[Dict[str, Any]] = None
+        self.started = False
+
+    def start_response(self, status: str, response_headers, exc_info=None):
+        if exc_info is not None and self.started:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.response_start = {
+            "type": "http.response.start",
+            "status": int(status.split(" ", 1)[0]),
+            "headers": [(name.lower().encode("latin1"), value.encode("latin1")) for name, value in response_headers],
+        }
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        if not self.started:
+            asyncio.run_coroutine_threadsafe(self.send(self.response_start), self.loop).result()
+            self.started = True
+        asyncio.run_coroutine_threadsafe(self.send(message), self.loop).result()
+
+    def succeeded(self) -> bool:
+        """2xx 응답 헤더까지 보냈는지"""
+        return self.started and 200 <= self.response_start["status"] < 300
+
+    def run(self) -> None:
+        iterable = self.app(self.environ, self.start_response)
+        try:
+            # 스트리밍 응답은 조각마다 바로 보냄
+            for chunk in iterable:
+                if chunk:
+                    self._send({"type": "http.response.body", "body": chunk, "more_body": True})
+            self._send({"type": "http.response.body", "body": b""})
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+
+
+def _build_environ(scope, wsgi_input) -> Dict[str, Any]:
+    """ASGI http scope → WSGI environ (PEP 3333)"""
+    script_name = scope.get("root_path", "").encode("utf8").decode("latin1")
+    path_info = scope["path"].encode("utf8").decode("latin1")
+    if script_name and path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": script_name,
+        "PATH_INFO": path_info,
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+        "SERVER_PROTOCOL": "HTTP/" + scope.get("http_version", "1.1"),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": wsgi_input,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    server = scope.get("server") or ("localhost", 80)
+    environ["SERVER_NAME"] = server[0]
+    environ["SERVER_PORT"] = str(server[1] or 80)
+    if scope.get("client"):
+        environ["REMOTE_ADDR"] = scope["client"][0]
+        environ["REMOTE_PORT"] = str(scope["client"][1])
+    for name, value in scope.get("headers") or []:
+        name = name.decode("latin1")
+        if name == "content-length":
+            key = "CONTENT_LENGTH"
+        elif name == "content-type":
+            key = "CONTENT_TYPE"
+        else:
+            key = "HTTP_" + name.upper().replace("-", "_")
+        value = value.decode("latin1")
+        environ[key] = environ[key] + "," + value if key in environ else value
+    if "CONTENT_LENGTH" not in environ:
+        # chunked 본문: werkzeug 가 길이 제한 없이 끝(more_body=False)까지 읽음
+        environ["wsgi.input_terminated"] = True
+    return environ
+
+
+class AsgiApp:
+    def __init__(self, app, threads: int):
+        self.app = app
+        self.executor = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix="asgi-wsgi")
+        self.prefetchers: Dict[Tuple[str, str], Callable[..., Awaitable[Any]]] = {
+            ("GET", "/api/interview"): self._prefetch_question,
+            ("GET", "/api/interview/start"): self._prefetch_start,
+            ("GET", "/api/interview/analysis"): self._prefetch_analysis,
+        }
+        # 미리 받은 결과가 응답으로 나가지 못했을 때 (인증/뷰 오류, 연결 끊김) 되돌리는 함수
+        self.releasers: Dict[Tuple[str, str], Callable[[Any], Any]] = {
+            ("GET", "/api/interview/start"): question_pool.return_question_set,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            raise ValueError(f"unsupported scope type: {scope['type']}")
+
+        extra_environ: Dict[str, Any] = {}
+        route = (scope.get("method"), scope.get("path"))
+        prefetch = self.prefetchers.get(route)
+        if prefetch is not None:
+            user_id = self._identity(scope)
+            # 인증이 안 되면 미리 받지 않고 Flask 가 기존처럼 401/422 응답
+            if user_id is not None:
+                profile = profiling.start_prefetch()
+                if profile is not None:
+                    extra_environ[PREFETCH_PROFILE_KEY] = profile
+                try:
+                    extra_environ[PREFETCH_KEY] = await prefetch(scope, user_id)
+                except Exception as e:
+                    logger.warning("LLM prefetch failed", path=scope["path"], error=str(e))
+                    extra_environ[PREFETCH_KEY] = e
+        loop = asyncio.get_running_loop()
+        request = _WsgiRequest(self.app, scope, receive, send, loop, extra_environ)
+        try:
+            await loop.run_in_executor(self.executor, request.run)
+        finally:
+            value = extra_environ.get(PREFETCH_KEY)
+            release = self.releasers.get(route)
+            if release is not None and value and not isinstance(value, Exception) and not request.succeeded():
+                await self._release(release, value, scope["path"])
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _release(self, release, value, path: str) -> None:
+        try:
+            await self._run_sync(release, value)
+            logger.info("Unused prefetch released", path=path)
+        except Exception as e:
+            logger.warning("Prefetch release failed", path=path, error=str(e))
+
+    def _identity(self, scope) -> Optional[str]:
+        """
+        Authorization: Bearer access 토큰의 identity (서명/만료 확인만 하므로 이벤트 루프에서 바로 실행).
+        jwt_required 가 거절할 토큰(refresh 토큰 등)이면 None → 미리 받지 않음
+        """
+        header = dict(scope.get("headers") or []).get(b"authorization", b"").decode("latin1")
+        if not header.startswith("Bearer "):
+            return None
+        with self.app.app_context():
+            try:
+                claims = decode_token(header[len("Bearer "):])
+            except Exception:
+                return None
+        if claims.get("type") != "access":
+            return None
+        return claims[self.app.config["JWT_IDENTITY_CLAIM"]]
+
+    async def _run_sync(self, fn, *args):
+        """DB 를 쓰는 짧은 동기 함수를 앱 컨텍스트 안에서 스레드 풀로 실행"""
+        def call():
+            with self.app.app_context():
+                return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+
+    async def _prefetch_question(self, scope, user_id):
+        return await async_generate_question()
+
+    async def _prefetch_start(self, scope, user_id):
+        return await self._run_sync(question_pool.take_pooled_question_list) or await async_generate_question()
+
+    async def _prefetch_analysis(self, scope, user_id):
+        """뷰와 같은 작업(analysis_jobs.current_job)이 끝날 때까지 기다림. 결과는 뷰가 DB 에서 읽음"""
+        query = parse_qs(scope.get("query_string", b"").decode("latin1"))
+        session_id = (query.get("session_id") or query.get("sessionId") or [None])[0]
+        job_id = await self._run_sync(lambda: analysis_jobs.current_job(user_id, session_id).id)
+
+        timeout = self.app.config["ANALYSIS_JOB_TIMEOUT"]
+        deadline = asyncio.get_running_loop().time() + timeout
+        future = analysis_jobs.job_future(job_id)
+        if future is not None:
+            try:
+                # shield: 시간이 지나도 작업 future 를 취소하지 않음 (다른 요청도 같은 작업을 기다림)
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Analysis job wait timed out", job_id=job_id)
+        status = await self._run_sync(_job_status, user_id, job_id)
+        # 다른 워커가 넣은 작업이면 끝날 때까지 DB 로 확인
+        while status in analysis_jobs.ACTIVE_STATUSES and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(ANALYSIS_POLL_INTERVAL)
+            status = await self._run_sync(_job_status, user_id, job_id)
+        # 완료/실패 응답은 뷰가 만듦 (시간 안에 끝나지 않았으면 뷰가 202)
+        return None
+
+
+def _job_status(user_id, job_id: str) -> str:
+    return analysis_jobs.get_job(user_id, job_id).status
+
+
+def create_asgi_app(app) -> AsgiApp:
+    logger.info("ASGI app configured", threads=app.config["ASGI_THREADS"])
+    return AsgiApp(app, app.config["ASGI_THREADS"])
@@ -0,0 +1,80 @@
+"""
+DB 백엔드 설정
+- DATABASE_URL 이 없으면 기존 SQLite 파일(database/interview.db)을 사용한다
+- SQLite: 연결마다 WAL / synchronous / busy_timeout / mmap_size PRAGMA 를 적용해서
+  읽기가 쓰기를 막지 않고, 동시에 쓰는 요청은 "database is locked" 대신 잠금이 풀릴 때까지 기다리게 한다
+- 커넥션 풀 크기/overflow 는 모든 백엔드에 적용, 서버형 DB(PostgreSQL 등)는 pre-ping/recycle 도 사용
+  (PostgreSQL 은 드라이버가 필요: pip install psycopg2-binary)
+"""
+
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from app import db
+from app.log import get_logger
+
+logger = get_logger(__name__)
+
+
+def backend(uri: str) -> str:
+    """'sqlite', 'postgresql' 등 드라이버를 뺀 백엔드 이름"""
+    return make_url(uri).get_backend_name()
+
+
+def engine_options(config) -> Dict[str, Any]:
+    """SQLALCHEMY_ENGINE_OPTIONS 로 넘길 값 (db.init_app 전에 설정해야 함)"""
+    options: Dict[str, Any] = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    # 요청 스레드 + 분석/질문 풀 워커가 함께 쓰므로 SQLite 도 풀 크기를 설정 (기본 5 + 10 은 쉽게 바닥남)
+    # 메모리 DB 는 연결 하나를 공유하는 풀을 쓰므로 제외
+    if url.database not in (None, "", ":memory:"):
+        options.setdefault("pool_size", config["DB_POOL_SIZE"])
+        options.setdefault("max_overflow", config["DB_MAX_OVERFLOW"])
+        options.setdefault("pool_timeout", config["DB_POOL_TIMEOUT"])
+
+    if url.get_backend_name() == "sqlite":
+        # pysqlite 의 timeout 도 busy handler 이므로 PRAGMA busy_timeout 과 같은 값으로 맞춤
+        connect_args = dict(options.get("connect_args") or {})
+        connect_args.setdefault("timeout", config["SQLITE_BUSY_TIMEOUT_MS"] / 1000)
+        options["connect_args"] = connect_args
+        return options
+
+    options.setdefault("pool_recycle", config["DB_POOL_RECYCLE"])
+    options.setdefault("pool_pre_ping", config["DB_POOL_PRE_PING"])
+    return options
+
+
+def _sqlite_pragmas(config) -> Dict[str, Any]:
+    pragmas = {
+        "busy_timeout": config["SQLITE_BUSY_TIMEOUT_MS"],
+        "synchronous": config["SQLITE_SYNCHRONOUS"],
+        "mmap_size": config["SQLITE_MMAP_SIZE"],
+    }
+    if config["SQLITE_WAL"]:
+        pragmas = {"journal_mode": "WAL", **pragmas}
+    return pragmas
+
+
+def init_app(app) -> None:
+    """db.init_app 이후에 호출: SQLite 면 새 연결마다 PRAGMA 적용"""
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    if backend(uri) != "sqlite":
+        logger.info("Database configured", backend=backend(uri),
+                    pool_size=app.config["DB_POOL_SIZE"], max_overflow=app.config["DB_MAX_OVERFLOW"])
+        return
+
+    pragmas = _sqlite_pragmas(app.config)
+
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    with app.app_context():
+        event.listen(db.engine, "connect", _apply_pragmas)
+    logger.info("Database configured", backend="sqlite", **pragmas)
@@ -0,0 +1,61 @@
+"""
+답변/영상 요청이 가리키는 인터뷰 행 찾기
+1) interview_id                 : /api/interview/start 응답의 questionList[i].interview_id (기본 키 조회)
+2) session_id + question_order  : ix_interview_user_session_order 인덱스 조회 (SSE 의 question index 와 같은 값)
+3) session_id + question        : (deprecated) 질문 본문 비교. 인덱스가 없고 같은 질문이 두 번 나오면 첫 행만 찾음
+"""
+
+from typing import Any, Mapping, Optional
+
+from app import db
+from app.models import Interview
+from app.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class InvalidLookup(ValueError):
+    pass
+
+
+def _int_arg(args: Mapping[str, Any], key: str) -> Optional[int]:
+    value = args.get(key)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise InvalidLookup(f"Invalid {key}")
+
+
+def has_lookup_args(args: Mapping[str, Any]) -> bool:
+    return bool(args.get("interview_id")) or (
+        bool(args.get("session_id")) and (args.get("question_order") not in (None, "") or bool(args.get("question")))
+    )
+
+
+def find_interview(user_id, args: Mapping[str, Any]) -> Optional[Interview]:
+    """
+    request.form 또는 JSON dict 에서 위 순서대로 인터뷰를 찾는다. 없으면 None.
+    interview_id / question_order 가 정수가 아니면 InvalidLookup
+    """
+    interview_id = _int_arg(args, "interview_id")
+    if interview_id is not None:
+        interview = db.session.get(Interview, interview_id)
+        if interview is None or str(interview.user_id) != str(user_id):
+            return None
+        return interview
+
+    session_id = args.get("session_id")
+    question_order = _int_arg(args, "question_order")
+    if question_order is not None:
+        return Interview.query.filter_by(
+            user_id=user_id, session_id=session_id, question_order=question_order
+        ).first()
+
+    if args.get("question") is None:
+        return None
+    logger.warning("Deprecated interview lookup by question text", session_id=session_id)
+    return Interview.query.filter_by(
+        user_id=user_id, question=args.get("question"), session_id=session_id
+    ).first()
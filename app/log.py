@@ -0,0 +1,192 @@
+"""
+구조화 로깅 (print 대체)
+- 요청 스레드는 로그 레코드를 큐에 넣기만 하고, 포맷/출력은 백그라운드 스레드(QueueListener)가 한다
+  (큐가 가득 차면 기다리지 않고 버린 뒤 개수만 센다)
+- 한 줄에 JSON 하나 (LOG_FORMAT=text 면 사람이 읽기 쉬운 형식)
+- 로거별 레벨: LOG_LEVELS="app.routes.interview=DEBUG,app.services.llm_client=WARNING"
+- 큰 응답/질문 목록 같은 payload 는 payload() 로 감싸서 넘기면 LOG_PAYLOAD_SAMPLE_RATE 비율로만
+  본문(LOG_PAYLOAD_MAX_CHARS 까지)을 남기고 나머지는 크기 요약만 남긴다. 직렬화도 백그라운드에서 한다
+
+사용:
+    logger = get_logger(__name__)
+    logger.info("Analysis job queued", job_id=job.id, session_id=session_id)
+    logger.debug("Analysis info", data=payload(data))
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import datetime
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+ROOT_LOGGER = "app"
+
+_config: Dict[str, Any] = {"payload_max_chars": 2000, "payload_sample_rate": 0.0}
+
+
+# -----------------------------
+# payload 샘플링
+# -----------------------------
+class _Payload:
+    """로그 필드 값으로 쓰는 큰 객체. 실제 직렬화는 포맷 시점(백그라운드 스레드)에 한다"""
+
+    __slots__ = ("obj", "sampled")
+
+    def __init__(self, obj: Any, sampled: bool):
+        self.obj = obj
+        self.sampled = sampled
+
+    def render(self) -> Any:
+        size = len(self.obj) if isinstance(self.obj, (list, dict, str)) else None
+        if not self.sampled:
+            return {"omitted": True, "type": type(self.obj).__name__, "size": size}
+        text = json.dumps(self.obj, ensure_ascii=False, default=str)
+        limit = _config["payload_max_chars"]
+        if len(text) > limit:
+            return {"truncated": True, "size": size, "chars": len(text), "head": text[:limit]}
+        return self.obj
+
+
+def payload(obj: Any) -> _Payload:
+    return _Payload(obj, random.random() < _config["payload_sample_rate"])
+
+
+# -----------------------------
+# 로거
+# -----------------------------
+class _FieldsAdapter(logging.LoggerAdapter):
+    """logger.info("msg", key=value, ...) 형태로 구조화 필드를 받는다"""
+
+    _reserved = ("exc_info", "stack_info", "stacklevel", "extra")
+
+    def process(self, msg, kwargs):
+        fields = {k: kwargs.pop(k) for k in list(kwargs) if k not in self._reserved}
+        kwargs.setdefault("extra", {})["fields"] = fields
+        return msg, kwargs
+
+
+def get_logger(name: str) -> _FieldsAdapter:
+    return _FieldsAdapter(logging.getLogger(name), {})
+
+
+def _render_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: (v.render() if isinstance(v, _Payload) else v) for k, v in fields.items()}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        entry.update(_render_fields(getattr(record, "fields", {})))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _render_fields(getattr(record, "fields", {}))
+        if fields:
+            line += " " + " ".join(f"{k}={json.dumps(v, ensure_ascii=False, default=str)}" for k, v in fields.items())
+        return line
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """
+    큐가 가득 차면 버리고 개수만 센다 (요청 스레드가 로그 때문에 기다리지 않도록).
+    fork 된 워커에서는 리스너 스레드가 없으므로 처음 로그를 남길 때 새로 띄운다.
+    """
+
+    def __init__(self, log_queue: "queue.Queue", target: logging.Handler):
+        super().__init__(log_queue)
+        self.target = target
+        self.dropped = 0
+        self._listener: Optional[QueueListener] = None
+        self._listener_pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_listener(self) -> None:
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._start_lock:
+            if self._listener_pid == pid:
+                return
+            self._listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+            self._listener.start()
+            self._listener_pid = pid
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 구현은 여기서 메시지를 포맷하지만, 포맷은 리스너 스레드에서 하도록 그대로 넘김
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self) -> None:
+        if self._listener is not None and self._listener_pid == os.getpid():
+            self._listener.stop()
+            self._listener_pid = None
+
+
+_handler: Optional[_NonBlockingQueueHandler] = None
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            name, level = part.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def dropped_count() -> int:
+    return _handler.dropped if _handler is not None else 0
+
+
+def init_app(app) -> None:
+    """app 로거 트리에 큐 핸들러를 붙이고 레벨을 설정 (여러 번 불러도 핸들러는 하나)"""
+    global _handler
+    _config["payload_max_chars"] = app.config["LOG_PAYLOAD_MAX_CHARS"]
+    _config["payload_sample_rate"] = app.config["LOG_PAYLOAD_SAMPLE_RATE"]
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(app.config["LOG_LEVEL"].upper())
+    for name, level in _parse_levels(app.config["LOG_LEVELS"]).items():
+        logging.getLogger(name).setLevel(level)
+
+    if _handler is None:
+        target = logging.StreamHandler(sys.stdout)
+        target.setFormatter(TextFormatter() if app.config["LOG_FORMAT"] == "text" else JsonFormatter())
+        _handler = _NonBlockingQueueHandler(queue.Queue(maxsize=app.config["LOG_QUEUE_SIZE"]), target)
+        root.addHandler(_handler)
+        # 루트 로거(werkzeug 등)와 중복 출력하지 않음
+        root.propagate = False
+        # 종료 시 큐에 남은 로그를 모두 출력
+        atexit.register(_handler.stop)
+
+        from app import metrics
+        metrics.register_collector(lambda: metrics.render_family(
+            "log_records_dropped_total", "Log records dropped because the log queue was full", "counter",
+            [({}, dropped_count())]
+        ))
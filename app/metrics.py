@@ -0,0 +1,266 @@
+"""
+Prometheus 텍스트 형식 메트릭 (외부 라이브러리 없이 직접 구현)
+- HTTP: 라우트별 요청 수/지연 시간 히스토그램, 처리 중인 요청 수
+- LLM: 모델별 호출 지연 시간, 토큰 사용량, 오류/재시도 수 (llm_client 에서 기록)
+- DB: 요청(라우트)별 SQL 쿼리 수와 실행 시간 (SQLAlchemy 이벤트로 기록)
+- GET /metrics 로 노출 (app/routes/metrics.py)
+
+값은 프로세스 메모리에만 있으므로 워커가 여러 개면 워커마다 따로 수집된다.
+"""
+
+import math
+import time
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+        REGISTRY.append(self)
+
+    def _key(self, labels: Sequence[str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(v) for v in labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.extend(self._render_one(labels, value))
+        return lines
+
+    def _render_one(self, labels, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [버킷별 개수..., 합계, 개수]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def _render_one(self, labels, state) -> List[str]:
+        lines = []
+        cumulative = 0
+        for i, bound in enumerate(self.buckets):
+            cumulative += state[i]
+            le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        plain = _format_labels(self.labelnames, labels)
+        lines.append(f"{self.name}_sum{plain} {_format_value(state[-2])}")
+        lines.append(f"{self.name}_count{plain} {state[-1]}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+# 렌더링 시점에 값을 읽어 오는 수집기 (질문 풀 크기처럼 다른 모듈이 가진 상태)
+_collectors: List[Callable[[], List[str]]] = []
+
+
+def register_collector(fn: Callable[[], List[str]]) -> None:
+    _collectors.append(fn)
+
+
+def render_family(name: str, documentation: str, kind: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """수집기에서 쓰는 헬퍼: (라벨 dict, 값) 목록을 텍스트 형식 줄로 변환"""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+    return lines
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        try:
+            lines.extend(collector())
+        except Exception as e:
+            lines.append(f"# collector {getattr(collector, '__name__', '?')} failed: {_escape(e)}")
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------------
+# 메트릭 정의
+# -----------------------------
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled", ("route",))
+
+LLM_LATENCY = Histogram("llm_request_duration_seconds", "LLM call latency per attempt", ("model", "stream"))
+LLM_FIRST_TOKEN = Histogram("llm_time_to_first_token_seconds", "Streaming LLM time to first delta", ("model",))
+LLM_REQUESTS = Counter("llm_requests_total", "LLM calls by final outcome", ("model", "stream", "outcome"))
+LLM_ERRORS = Counter("llm_errors_total", "LLM call errors per attempt", ("model", "error"))
+LLM_RETRIES = Counter("llm_retries_total", "LLM call retries", ("model",))
+LLM_TOKENS = Counter("llm_tokens_total", "LLM token usage reported by the provider", ("model", "kind"))
+
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed", ("route",))
+DB_QUERY_LATENCY = Histogram("db_query_duration_seconds", "SQL statement latency", ("route",), DB_BUCKETS)
+DB_QUERIES_PER_REQUEST = Histogram("db_queries_per_request", "SQL statements per HTTP request", ("route",), COUNT_BUCKETS)
+DB_TIME_PER_REQUEST = Histogram("db_time_per_request_seconds", "Total SQL time per HTTP request", ("route",), DB_BUCKETS)
+
+
+def _route() -> str:
+    """요청 경로 대신 URL 규칙을 라벨로 써서 session_id 등으로 라벨이 무한히 늘지 않게 함"""
+    if not has_request_context():
+        return "background"
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def record_llm_usage(model: str, usage) -> None:
+    if usage is None:
+        return
+    LLM_TOKENS.inc(model, "prompt", amount=getattr(usage, "prompt_tokens", 0) or 0)
+    LLM_TOKENS.inc(model, "completion", amount=getattr(usage, "completion_tokens", 0) or 0)
+
+
+# -----------------------------
+# SQLAlchemy 쿼리 계측
+# -----------------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("_metrics_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    route = _route()
+    DB_QUERIES.inc(route)
+    DB_QUERY_LATENCY.observe(elapsed, route)
+    if has_request_context() and "_metrics_db_count" in g:
+        g._metrics_db_count += 1
+        g._metrics_db_time += elapsed
+
+
+def _handle_error(context):
+    # 실패한 쿼리는 after_cursor_execute 가 호출되지 않으므로 시작 시각만 버림
+    started = context.connection.info.get("_metrics_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+_db_listening = False
+
+
+def _listen_db() -> None:
+    global _db_listening
+    if _db_listening:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _db_listening = True
+
+
+# -----------------------------
+# Flask 요청 계측
+# -----------------------------
+def _before_request():
+    route = _route()
+    g._metrics_route = route
+    g._metrics_started = time.perf_counter()
+    g._metrics_status = "500"
+    g._metrics_db_count = 0
+    g._metrics_db_time = 0.0
+    HTTP_IN_FLIGHT.inc(route)
+
+
+def _after_request(response):
+    g._metrics_status = str(response.status_code)
+    return response
+
+
+def _teardown_request(exc):
+    # 스트리밍 응답(stream_with_context)은 스트림이 끝난 뒤에 호출되므로 전체 전송 시간이 기록됨
+    if "_metrics_started" not in g:
+        return
+    route = g._metrics_route
+    elapsed = time.perf_counter() - g._metrics_started
+    HTTP_IN_FLIGHT.dec(route)
+    HTTP_REQUESTS.inc(request.method, route, g._metrics_status)
+    HTTP_LATENCY.observe(elapsed, request.method, route)
+    DB_QUERIES_PER_REQUEST.observe(g._metrics_db_count, route)
+    DB_TIME_PER_REQUEST.observe(g._metrics_db_time, route)
+
+
+def init_app(app) -> None:
+    if not app.config["METRICS_ENABLED"]:
+        return
+    _listen_db()
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
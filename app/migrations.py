@@ -0,0 +1,184 @@
+"""
+스키마 마이그레이션
+- db.create_all() 은 없는 테이블만 만들고 기존 테이블은 바꾸지 않는다
+- 이미 운영 중인 DB 파일에 필요한 변경(인덱스, 컬럼 추가 등)을 버전 순서대로 적용한다
+- 적용된 버전은 schema_migration 테이블에 기록되어 한 번만 실행된다
+- 여러 프로세스가 동시에 시작해도 (preload 없는 gunicorn -w N, uvicorn 워커 등) 스키마 변경은
+  잠금(SQLite BEGIN IMMEDIATE / PostgreSQL advisory lock) 안에서 한 프로세스씩 하고,
+  잠금을 잡은 뒤 적용 기록을 다시 읽어서 먼저 적용된 버전은 건너뛴다
+"""
+
+import json
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import inspect, select, text
+
+from app import db
+from app.log import get_logger
+from app.models import SchemaMigration
+
+logger = get_logger(__name__)
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = []
+# PostgreSQL pg_advisory_xact_lock 키 (임의의 고정값)
+MIGRATION_LOCK_KEY = 7240131
+
+
+def migration(version: int, description: str):
+    def decorator(fn):
+        MIGRATIONS.append((version, description, fn))
+        return fn
+    return decorator
+
+
+def _create_indexes(conn, model, names: List[str]) -> None:
+    """모델에 선언된 인덱스 중 이름이 일치하는 것만 생성 (이미 있으면 건너뜀)"""
+    for index in model.__table__.indexes:
+        if index.name in names:
+            index.create(conn, checkfirst=True)
+
+
+def _add_column(conn, table: str, column: str, ddl: str) -> None:
+    """컬럼이 없을 때만 ALTER TABLE ... ADD COLUMN"""
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+# -----------------------------
+# 마이그레이션 목록 (버전은 절대 바꾸지 말고 새로 추가만 할 것)
+# -----------------------------
+@migration(1, "interview / analysis_job / analysis_cache 인덱스")
+def _add_indexes(conn):
+    from app.models import Interview, AnalysisJob, AnalysisCache
+    _create_indexes(conn, Interview, [
+        "ix_interview_user_session_order",
+        "ix_interview_user_timestamp",
+        "ix_interview_user_id",
+    ])
+    _create_indexes(conn, AnalysisJob, ["ix_analysis_job_user_session"])
+    _create_indexes(conn, AnalysisCache, ["ix_analysis_cache_user_session", "ix_analysis_cache_content_hash"])
+
+
+@migration(2, "interview_session 테이블 + 기존 interview 행으로 백필")
+def _backfill_interview_sessions(conn):
+    from app.models import Interview, InterviewSession, AnalysisJob
+    from app.services.llm_analysis import EMPTY_ANALYSIS
+    InterviewSession.__table__.create(conn, checkfirst=True)
+    _create_indexes(conn, InterviewSession, ["ix_interview_session_user_created"])
+
+    existing = {row.id for row in conn.execute(select(InterviewSession.id))}
+    itv = Interview.__table__
+    rows = conn.execute(
+        select(itv.c.session_id, itv.c.user_id, itv.c.type, itv.c.timestamp,
+               itv.c.useranswer, itv.c.analysis, itv.c.score)
+        .where(itv.c.session_id.isnot(None))
+        .order_by(itv.c.session_id, itv.c.question_order, itv.c.id)
+    )
+    sessions: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        if row.session_id in existing:
+            continue
+        session = sessions.get(row.session_id)
+        if session is None:
+            session = sessions[row.session_id] = {
+                "id": row.session_id, "user_id": row.user_id, "type": row.type,
+                "created_at": row.timestamp, "updated_at": row.timestamp,
+                "question_count": 0, "answered_count": 0, "analyzed_count": 0,
+            }
+        session["question_count"] += 1
+        session["answered_count"] += row.useranswer != "응답 없음"
+        session["analyzed_count"] += row.score is not None and (row.analysis or "") not in EMPTY_ANALYSIS
+        if row.timestamp is not None:
+            session["created_at"] = min(filter(None, (session["created_at"], row.timestamp)))
+            session["updated_at"] = max(filter(None, (session["updated_at"], row.timestamp)))
+
+    # 총평/overall_scores 는 세션마다 가장 최근에 완료된 분석 작업 결과에서 가져옴
+    job = AnalysisJob.__table__
+    latest_results: Dict[str, str] = {}
+    for row in conn.execute(
+        select(job.c.session_id, job.c.result)
+        .where(job.c.status == "done", job.c.session_id.isnot(None))
+        .order_by(job.c.created_at)
+    ):
+        if row.session_id in sessions:
+            latest_results[row.session_id] = row.result
+
+    for session_id, session in sessions.items():
+        complete = session["answered_count"] == session["question_count"]
+        session["status"] = "answered" if complete else "in_progress"
+        session["summary"] = session["overall_scores"] = None
+        if session_id in latest_results:
+            try:
+                result = json.loads(latest_results[session_id])
+            except ValueError:
+                continue
+            session["summary"] = result.get("summary", "")
+            session["overall_scores"] = json.dumps(result.get("scores", {}), ensure_ascii=False)
+            if complete:
+                session["status"] = "analyzed"
+
+    if sessions:
+        conn.execute(InterviewSession.__table__.insert(), list(sessions.values()))
+    logger.info("Interview sessions backfilled", sessions=len(sessions))
+
+
+@migration(3, "question_pool_state 테이블 + 리필 예약 행")
+def _add_question_pool_state(conn):
+    from app.models import QuestionPoolState
+    state = QuestionPoolState.__table__
+    state.create(conn, checkfirst=True)
+    if conn.execute(select(state.c.id).where(state.c.id == 1)).first() is None:
+        conn.execute(state.insert().values(id=1, pending=0, version=0))
+
+
+@migration(4, "interview.analysis_requested_at 컬럼")
+def _add_analysis_requested_at(conn):
+    _add_column(conn, "interview", "analysis_requested_at", "DATETIME")
+
+
+@migration(5, "interview_session / analysis_job answers_version 컬럼")
+def _add_answers_version(conn):
+    _add_column(conn, "interview_session", "answers_version", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(conn, "analysis_job", "answers_version", "INTEGER NOT NULL DEFAULT 0")
+
+
+@contextmanager
+def _schema_lock():
+    """다른 프로세스의 스키마 변경이 끝날 때까지 기다린 뒤 잡는 트랜잭션 (나가면 커밋, 예외면 롤백)"""
+    with db.engine.connect() as conn:
+        dialect = conn.dialect.name
+        if dialect == "sqlite":
+            # 처음부터 쓰기 잠금을 잡음 (다른 프로세스는 busy_timeout 동안 기다림)
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        elif dialect == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def run_migrations() -> List[int]:
+    """
+    없는 테이블을 만들고(create_all) 아직 적용되지 않은 마이그레이션을 순서대로 적용한 뒤, 적용한 버전 목록을 반환.
+    다른 프로세스가 이미 적용한 버전은 성공으로 보고 건너뛴다
+    """
+    db.session.close()
+    done = []
+    with _schema_lock() as conn:
+        db.metadata.create_all(conn)
+        applied = {row.version for row in conn.execute(select(SchemaMigration.__table__.c.version))}
+        for version, description, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
+            if version in applied:
+                continue
+            fn(conn)
+            conn.execute(
+                SchemaMigration.__table__.insert().values(version=version, description=description)
+            )
+            logger.info("Migration applied", version=version, description=description)
+            done.append(version)
+    return done
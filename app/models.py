@@ -22,3 +22,86 @@ class Interview(db.Model):
     summary = db.Column(db.Text, nullable=True, default="응답 없음")  # 전체 요약
     score = db.Column(db.Float)
     timestamp = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    # 답변 단위 분석을 요청한 시각 (분석이 끝나면 NULL). 세션 분석이 이 값이 남은 행을 기다림 (워커 프로세스와 무관)
+    analysis_requested_at = db.Column(db.DateTime, nullable=True)
+
+    # 기존 DB 파일에는 app/migrations.py 가 같은 이름으로 추가함
+    __table_args__ = (
+        db.Index('ix_interview_user_session_order', 'user_id', 'session_id', 'question_order'),
+        db.Index('ix_interview_user_timestamp', 'user_id', 'timestamp', 'id'),
+        db.Index('ix_interview_user_id', 'user_id', 'id'),
+    )
+
+class InterviewSession(db.Model):
+    # 세션 단위 데이터 (목록/결과 조회는 이 행 하나만 읽음), id 는 Interview.session_id 와 같은 UUID
+    id = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    type = db.Column(db.String(80), nullable=False, default="응답 없음")  # 첫 번째 질문의 type
+    status = db.Column(db.String(20), nullable=False, default="in_progress")  # in_progress / answered / analyzed
+    summary = db.Column(db.Text)  # 세션 분석 총평
+    overall_scores = db.Column(db.Text)  # 세션 분석 overall_scores JSON (구체성/논리성/적합성/표현력/전문성)
+    question_count = db.Column(db.Integer, nullable=False, default=0)
+    answered_count = db.Column(db.Integer, nullable=False, default=0)
+    analyzed_count = db.Column(db.Integer, nullable=False, default=0)  # 항목별 analysis/score 가 저장된 질문 수
+    answers_version = db.Column(db.Integer, nullable=False, default=0)  # 답변이 제출될 때마다 +1 (분석 작업이 본 답변과 비교)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_interview_session_user_created', 'user_id', 'created_at', 'id'),
+    )
+
+class QuestionSet(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    payload = db.Column(db.Text, nullable=False)  # generate_question() 결과 (questionList JSON)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+class QuestionPoolState(db.Model):
+    # 풀 리필 예약 (행 하나, id=1). 여러 워커 프로세스가 같은 풀을 중복으로 채우지 않도록 DB 에 둔다
+    id = db.Column(db.Integer, primary_key=True)
+    pending = db.Column(db.Integer, nullable=False, default=0)  # 예약되어 생성 중인 질문 세트 수
+    version = db.Column(db.Integer, nullable=False, default=0)  # 조건부 UPDATE 용 (바꿀 때마다 +1)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+class AnalysisJob(db.Model):
+    id = db.Column(db.String(36), primary_key=True)  # UUID
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    session_id = db.Column(db.String(36), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued / running / done / failed
+    result = db.Column(db.Text)  # analysisByLLM 결과 JSON
+    error = db.Column(db.Text)
+    answers_version = db.Column(db.Integer, nullable=False, default=0)  # 분석을 시작할 때의 InterviewSession.answers_version
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_analysis_job_user_session', 'user_id', 'session_id', 'created_at'),
+    )
+
+class AnalysisCache(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    session_id = db.Column(db.String(36), nullable=True)
+    content_hash = db.Column(db.String(64), nullable=False, index=True)  # 입력 항목 + 모델 + 프롬프트 버전의 sha256
+    result = db.Column(db.Text, nullable=False)  # LLM 응답 JSON (items, summary, overall_scores)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_analysis_cache_user_session', 'user_id', 'session_id'),
+    )
+
+class SchemaMigration(db.Model):
+    version = db.Column(db.Integer, primary_key=True)
+    description = db.Column(db.String(200), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+class VideoUpload(db.Model):
+    id = db.Column(db.String(36), primary_key=True)  # UUID
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    interview_id = db.Column(db.Integer, db.ForeignKey('interview.id'), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    size = db.Column(db.Integer, nullable=False)  # 전체 파일 크기 (bytes)
+    received = db.Column(db.Integer, nullable=False, default=0)  # 디스크에 기록이 확인된 오프셋
+    status = db.Column(db.String(20), nullable=False, default="uploading")  # uploading / writing (청크 기록 중) / complete
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
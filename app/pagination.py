@@ -0,0 +1,69 @@
+"""
+커서(keyset) 페이지네이션
+- (timestamp, id) 순으로 (descending 이면 최신순으로) 정렬하고, 마지막으로 본 행의 (timestamp, id) 를 커서로 넘긴다
+  (id 는 정수 또는 UUID 문자열 기본 키)
+- OFFSET 을 쓰지 않으므로 이력이 아무리 많아도 페이지당 비용이 일정하다
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Union
+
+from flask import current_app, request
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(timestamp: Optional[datetime], row_id: Union[int, str]) -> str:
+    raw = json.dumps([timestamp.isoformat() if timestamp else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], Union[int, str]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (datetime.fromisoformat(timestamp) if timestamp else None), (row_id if isinstance(row_id, str) else int(row_id))
+    except Exception as e:
+        raise InvalidCursor(str(e))
+
+
+def get_page_args() -> Tuple[int, Optional[Tuple[Optional[datetime], Union[int, str]]]]:
+    """요청 쿼리의 limit / cursor 를 읽는다. 잘못된 커서면 InvalidCursor"""
+    default = current_app.config["PAGE_SIZE_DEFAULT"]
+    maximum = current_app.config["PAGE_SIZE_MAX"]
+    try:
+        limit = int(request.args.get("limit", default))
+    except ValueError:
+        limit = default
+    limit = max(1, min(limit, maximum))
+
+    cursor = request.args.get("cursor")
+    return limit, (decode_cursor(cursor) if cursor else None)
+
+
+def paginate(query, timestamp_col, id_col, limit: int, cursor,
+             descending: bool = False) -> Tuple[List[Any], Optional[str]]:
+    """
+    query 를 (timestamp_col, id_col) 오름차순(descending 이면 내림차순)으로 limit 개만 가져온다.
+    다음 페이지가 있으면 next_cursor 를, 없으면 None 을 함께 반환.
+    """
+    key = tuple_(timestamp_col, id_col)
+    if cursor is not None:
+        query = query.filter(key < tuple_(*cursor) if descending else key > tuple_(*cursor))
+
+    if descending:
+        query = query.order_by(timestamp_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(timestamp_col, id_col)
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, timestamp_col.key), getattr(last, id_col.key))
@@ -0,0 +1,20 @@
+"""
+ASGI 모드(app/asgi.py)에서 뷰보다 먼저 이벤트 루프 위에서 받아 둔 LLM 결과
+- 뷰는 prefetched() 가 None 이면(WSGI 모드, 인증 실패 등) 기존처럼 직접 LLM 을 호출한다
+- 미리 받다가 난 예외는 뷰 안에서 다시 올려서 기존과 같은 오류 응답이 나가게 한다
+- 프로파일링이 켜져 있으면 미리 받는 동안의 LLM 호출과 시작 시각도 넘겨서 요청 프로파일에 합친다 (app/profiling.py)
+"""
+
+from typing import Any
+
+from flask import request
+
+PREFETCH_KEY = "interview.prefetched"
+PREFETCH_PROFILE_KEY = "interview.prefetch_profile"
+
+
+def prefetched() -> Any:
+    value = request.environ.get(PREFETCH_KEY)
+    if isinstance(value, Exception):
+        raise value
+    return value
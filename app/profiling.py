@@ -0,0 +1,301 @@
+"""
+요청 단위 프로파일링 (기본 꺼짐, PROFILING_ENABLED=true 로 켬)
+- 모든 요청을 가볍게 추적하다가 PROFILING_SAMPLE_RATE 비율로 뽑힌 요청이나
+  PROFILING_SLOW_MS 보다 오래 걸린 요청만 저장한다
+- 호출 스택: 백그라운드 스레드가 PROFILING_INTERVAL_MS 마다 처리 중인 요청 스레드의 스택을 떠서
+  collapsed stack("a;b;c" → 횟수) 형태로 모은다 (flamegraph.pl / speedscope 로 바로 볼 수 있음)
+- SQL 문(파라미터 제외)과 실행 시간, LLM 호출(모델/지연 시간/오류)을 함께 기록
+  (ASGI 모드에서 Flask 로 넘기기 전에 이벤트 루프에서 한 LLM 호출과 그 대기 시간도 포함)
+- 저장: 메모리의 최근 목록(/api/admin/profiles) + PROFILING_DIR 에 JSON 파일 (최근 PROFILING_MAX_FILES 개만 유지)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import random
+import datetime
+import threading
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.log import get_logger
+from app.prefetch import PREFETCH_PROFILE_KEY
+
+logger = get_logger(__name__)
+
+MAX_STACK_DEPTH = 64
+MAX_SQL = 500
+MAX_LLM = 100
+TOP_STACKS = 200
+
+_lock = threading.Lock()
+# 스레드 ident → 처리 중인 요청의 stacks Counter
+_active: Dict[int, Counter] = {}
+# 최근 저장된 프로파일 (오래된 것부터, 최대 PROFILING_KEEP 개)
+_recent: "deque[Dict[str, Any]]" = deque()
+_config: Dict[str, Any] = {}
+_sampler_pid: Optional[int] = None
+_db_listening = False
+# ASGI 요청 하나가 Flask 로 넘어가기 전에 이벤트 루프에서 한 LLM 호출 (start_prefetch 가 요청 태스크마다 설정)
+_prefetch_llm: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("prefetch_llm", default=None)
+
+
+# -----------------------------
+# 스택 샘플러
+# -----------------------------
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    # 패키지 경로는 마지막 두 단계만 남김 (site-packages/… 를 짧게)
+    short = "/".join(path.replace("\\", "/").split("/")[-2:])
+    return f"{short}:{code.co_name}"
+
+
+def _collapse(frame) -> str:
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+def _sample_loop(interval: float) -> None:
+    own = threading.get_ident()
+    while True:
+        time.sleep(interval)
+        with _lock:
+            if not _active:
+                continue
+            active = dict(_active)
+        frames = sys._current_frames()
+        for ident, stacks in active.items():
+            frame = frames.get(ident)
+            if frame is None or ident == own:
+                continue
+            stack = _collapse(frame)
+            with _lock:
+                stacks[stack] += 1
+
+
+def _ensure_sampler() -> None:
+    """프로세스마다 샘플러 스레드 하나 (fork 이후에는 새로 띄운다)"""
+    global _sampler_pid
+    pid = os.getpid()
+    with _lock:
+        if _sampler_pid == pid:
+            return
+        _sampler_pid = pid
+    thread = threading.Thread(
+        target=_sample_loop,
+        args=(_config["interval_ms"] / 1000.0,),
+        name="profiling-sampler",
+        daemon=True,
+    )
+    thread.start()
+
+
+# -----------------------------
+# SQL / LLM 기록
+# -----------------------------
+def _profile() -> Optional[Dict[str, Any]]:
+    if not has_request_context():
+        return None
+    return g.get("_profile")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _profile() is not None:
+        conn.info.setdefault("_profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _profile()
+    started = conn.info.get("_profile_started")
+    if profile is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if len(profile["sql"]) < MAX_SQL:
+        profile["sql"].append({"statement": statement, "duration_ms": round(elapsed * 1000, 3)})
+    else:
+        profile["sql_dropped"] += 1
+
+
+def _handle_error(context):
+    started = context.connection.info.get("_profile_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def record_llm_call(model: str, stream: bool, duration: float, error: Optional[str] = None) -> None:
+    """llm_client 가 호출 시도마다 부름 (요청 밖의 백그라운드 작업이면 무시)"""
+    profile = _profile()
+    calls = profile["llm"] if profile is not None else _prefetch_llm.get()
+    if calls is None or len(calls) >= MAX_LLM:
+        return
+    calls.append({
+        "model": model,
+        "stream": stream,
+        "duration_ms": round(duration * 1000, 3),
+        "error": error,
+    })
+
+
+def start_prefetch() -> Optional[Dict[str, Any]]:
+    """
+    ASGI 모드에서 요청 태스크가 LLM 결과를 미리 받기 전에 부름 (프로파일링이 꺼져 있으면 None).
+    반환값을 environ[PREFETCH_PROFILE_KEY] 로 넘기면 요청 프로파일의 시작 시각과 llm 목록에 합쳐진다
+    """
+    if not _config:
+        return None
+    calls: List[Dict[str, Any]] = []
+    _prefetch_llm.set(calls)
+    return {"started": time.perf_counter(), "llm": calls}
+
+
+# -----------------------------
+# 저장
+# -----------------------------
+def _write_file(profile: Dict[str, Any]) -> None:
+    directory = _config["dir"]
+    os.makedirs(directory, exist_ok=True)
+    route = re.sub(r"[^A-Za-z0-9]+", "_", profile["route"]).strip("_") or "root"
+    filename = f"{profile['started_at'].replace(':', '').replace('-', '')}_{route}_{profile['id'][:8]}.json"
+    with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False)
+
+    # 오래된 파일부터 지워서 최근 MAX_FILES 개만 유지
+    files = sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+    for name in files[:max(0, len(files) - _config["max_files"])]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+
+
+def _store(profile: Dict[str, Any]) -> None:
+    with _lock:
+        _recent.append(profile)
+        while len(_recent) > _config["keep"]:
+            _recent.popleft()
+    try:
+        _write_file(profile)
+    except OSError as e:
+        logger.warning("Failed to write profile", profile_id=profile["id"], error=str(e))
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """최근 프로파일 요약 (최신순)"""
+    with _lock:
+        profiles = list(_recent)
+    return [
+        {
+            **{key: p[key] for key in ("id", "started_at", "method", "path", "route", "status", "duration_ms", "reason")},
+            "sql_count": len(p["sql"]) + p["sql_dropped"],
+            "llm_count": len(p["llm"]),
+            "samples": p["samples"],
+        }
+        for p in reversed(profiles)
+    ]
+
+
+def get_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    with _lock:
+        for p in _recent:
+            if p["id"] == profile_id:
+                return p
+    return None
+
+
+# -----------------------------
+# Flask 훅
+# -----------------------------
+def _before_request():
+    prefetch = request.environ.get(PREFETCH_PROFILE_KEY)
+    g._profile = {
+        "id": str(uuid.uuid4()),
+        "started_at": datetime.datetime.utcnow().isoformat(timespec="milliseconds"),
+        "method": request.method,
+        "path": request.path,
+        "route": request.url_rule.rule if request.url_rule is not None else "unmatched",
+        "sql": [],
+        "sql_dropped": 0,
+        "llm": list(prefetch["llm"]) if prefetch else [],
+    }
+    # 미리 받는 동안 기다린 시간도 요청 시간에 포함 (느린 요청 판정)
+    g._profile_started = prefetch["started"] if prefetch else time.perf_counter()
+    g._profile_stacks = Counter()
+    g._profile_status = 500
+    with _lock:
+        _active[threading.get_ident()] = g._profile_stacks
+
+
+def _after_request(response):
+    if "_profile" in g:
+        g._profile_status = response.status_code
+    return response
+
+
+def _teardown_request(exc):
+    # 스트리밍 응답은 스트림이 끝난 뒤에 호출됨
+    if "_profile" not in g:
+        return
+    with _lock:
+        _active.pop(threading.get_ident(), None)
+    profile = g.pop("_profile")
+    elapsed_ms = (time.perf_counter() - g._profile_started) * 1000
+
+    if elapsed_ms >= _config["slow_ms"]:
+        reason = "slow"
+    elif random.random() < _config["sample_rate"]:
+        reason = "sampled"
+    else:
+        return
+
+    with _lock:
+        stacks = dict(g._profile_stacks)
+    top = sorted(stacks.items(), key=lambda kv: kv[1], reverse=True)[:TOP_STACKS]
+    profile.update({
+        "status": g._profile_status,
+        "duration_ms": round(elapsed_ms, 3),
+        "reason": reason,
+        "error": repr(exc) if exc is not None else None,
+        "interval_ms": _config["interval_ms"],
+        "samples": sum(stacks.values()),
+        "stacks": dict(top),
+    })
+    _store(profile)
+    logger.info("Request profiled", reason=reason, method=profile["method"], path=profile["path"],
+                duration_ms=round(elapsed_ms), profile_id=profile["id"])
+
+
+def init_app(app) -> None:
+    global _db_listening
+    if not app.config["PROFILING_ENABLED"]:
+        return
+    _config.update({
+        "sample_rate": app.config["PROFILING_SAMPLE_RATE"],
+        "slow_ms": app.config["PROFILING_SLOW_MS"],
+        "interval_ms": max(1, app.config["PROFILING_INTERVAL_MS"]),
+        "dir": app.config["PROFILING_DIR"],
+        "max_files": app.config["PROFILING_MAX_FILES"],
+        "keep": app.config["PROFILING_KEEP"],
+    })
+    if not _db_listening:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _db_listening = True
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    # gunicorn --preload 처럼 fork 되는 경우를 위해 첫 요청 때 샘플러를 띄움
+    app.before_request(_ensure_sampler)
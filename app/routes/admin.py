@@ -0,0 +1,36 @@
+import hmac
+
+from flask import Blueprint, jsonify, request, current_app
+from app import profiling
+
+bp = Blueprint('admin', __name__)
+
+
+def _authorized():
+    # 프로파일에는 SQL 문과 호출 경로가 들어 있으므로 별도 관리자 토큰으로만 조회
+    # 상수 시간 비교 (응답 시간으로 토큰을 한 글자씩 맞춰 볼 수 없도록)
+    token = current_app.config['PROFILING_ADMIN_TOKEN']
+    return bool(token) and hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode())
+
+
+# 최근 저장된 요청 프로파일 목록 (최신순)
+@bp.route('/api/admin/profiles', methods=['GET'])
+def get_profiles():
+    if not current_app.config['PROFILING_ENABLED'] or not current_app.config['PROFILING_ADMIN_TOKEN']:
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Profiling disabled'}), 404
+    if not _authorized():
+        return jsonify({'result': 'fail', 'code': '401', 'message': 'Unauthorized'}), 401
+    return jsonify({'result': 'ok', 'data': profiling.list_profiles()})
+
+
+# 프로파일 하나 (호출 스택, SQL, LLM 호출 전체)
+@bp.route('/api/admin/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    if not current_app.config['PROFILING_ENABLED'] or not current_app.config['PROFILING_ADMIN_TOKEN']:
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Profiling disabled'}), 404
+    if not _authorized():
+        return jsonify({'result': 'fail', 'code': '401', 'message': 'Unauthorized'}), 401
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Profile not found'}), 404
+    return jsonify({'result': 'ok', 'data': profile})
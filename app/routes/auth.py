@@ -2,10 +2,12 @@ from flask import Blueprint, request, jsonify, redirect
 from flask_jwt_extended import create_access_token
 from app import db
 from app.models import User
+from app.log import get_logger, payload
 import requests
 from flask import current_app
 
 bp = Blueprint('auth', __name__)
+logger = get_logger(__name__)
 
 @bp.route('/api/auth/join', methods=['POST'])
 def join():
@@ -23,7 +25,7 @@ def join():
 
     # token = create_access_token(identity=user.id)
     token = create_access_token(identity=str(user.id))
-    print("[User Joined]", user.username, user.email, token)
+    logger.info("User joined", user_id=user.id, username=user.username)
     return jsonify({'result': 'ok', 'data': {'token': token, 'username': user.username, 'email': user.email}})
 
 
@@ -95,7 +97,7 @@ def kakao_callback():
         kakao_account = user_info.get('kakao_account', {})
         email = kakao_account.get('email', f"{kakao_id}@kakao.com")
         nickname = kakao_account.get('profile', {}).get('nickname', f"user_{kakao_id}")
-        print("[Kakao 사용자 정보]", user_info)
+        logger.debug("Kakao user info", kakao_id=kakao_id, user_info=payload(user_info))
         user = User.query.filter_by(email=email).first()
         if not user:
             user = User(username=nickname, email=email, password='kakao')
@@ -104,13 +106,13 @@ def kakao_callback():
             
         # token = create_access_token(identity=user.id)
         token = create_access_token(identity=str(user.id))
-        print("[Kakao 로그인 성공]", user.username, user.email)
+        logger.info("Kakao login", user_id=user.id, username=user.username)
         
         # 메인 페이지로 바로 리다이렉트하면서 토큰과 사용자 정보 전달
         frontend_url = f"http://localhost:3000/?kakao_login=success&token={token}&username={user.username}&email={user.email}"
         return redirect(frontend_url)
 
     except Exception as e:
-        print("Exception:", e)
+        logger.exception("Kakao login failed")
         return jsonify({'result': 'fail', 'message': 'Internal Server Error', 'detail': str(e)}), 500
 
@@ -1,9 +1,13 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, current_app, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
-from app.models import Interview
+from app.models import Interview, InterviewSession
+from app.pagination import get_page_args, paginate, InvalidCursor
+from app.interview_lookup import find_interview, has_lookup_args, InvalidLookup
+from app.prefetch import prefetched
+from app.log import get_logger, payload
 import uuid
-from datetime import datetime
+import json
 import os
 from werkzeug.utils import secure_filename
 
@@ -11,17 +15,27 @@ from werkzeug.utils import secure_filename
 # from app.services.test_question import generate_question
 
 # 실제 인터뷰 Q,A 생성 서비스
-from app.services.llm_service import generate_question
+from app.services.llm_service import generate_question, stream_questions
 
-from app.services.llm_analysis import analysisByLLM
+from app.services.llm_analysis import invalidate_analysis_cache, stream_analysis
+from app.services import question_pool
+from app.services import analysis_jobs
+from app.services import structured_output
+from app.services import interview_sessions
 
 bp = Blueprint('interview', __name__)
+logger = get_logger(__name__)
 
 # Interview Question Test API
 @bp.route('/api/interview', methods=['GET'])
 @jwt_required()
 def get_interview_question():
-    question = generate_question()
+    # ASGI 모드에서는 이벤트 루프에서 미리 받아 둔 결과 (app/asgi.py, 실패했으면 빈 목록)
+    question = prefetched()
+    if question is None:
+        question = generate_question()
+    if not question:
+        return jsonify({'result': 'fail', 'code': '500', 'message': 'Failed to generate question'}), 500
     return jsonify({'result': 'ok', 'data': {'question': question}})
 
 # Interview Question API
@@ -32,18 +46,21 @@ def start_interview():
     generate a new interview question using the LLM service
     using Qwen or other LLMs to generate a question
     '''
-    print("[Interview Start] Generating question...")
     user_id = get_jwt_identity()
-    print("user_id : ", user_id)
     
     # 새로운 인터뷰 세션 ID 생성
     session_id = str(uuid.uuid4())
-    print(f"[New Session] Session ID: {session_id}")
+    logger.info("Interview started", user_id=user_id, session_id=session_id)
     
-    questionList = generate_question() # <- QustionList should contain keys like 'question', 'type'
-    print(f"[Question Count] Generated {len(questionList)} questions")
+    # 미리 생성해 둔 질문 풀에서 꺼냄 (비어 있으면 LLM 직접 호출)
+    # ASGI 모드에서는 풀에서 꺼내거나 이벤트 루프에서 생성해 둔 세트 (app/asgi.py)
+    questionList = prefetched() # <- QustionList should contain keys like 'question', 'type'
+    if questionList is None:
+        questionList = question_pool.take_question_list()
+    logger.debug("Questions ready", session_id=session_id, count=len(questionList))
     
     # questionList의 모든 질문들을 같은 session_id로 저장
+    interviews = []
     for i, q in enumerate(questionList):
         interview = Interview(
             user_id=user_id,
@@ -54,6 +71,9 @@ def start_interview():
             question_order=i  # 질문 순서 추가
         )
         db.session.add(interview)
+        interviews.append(interview)
+    if questionList:
+        interview_sessions.create(user_id, session_id, questionList)
     
     db.session.commit()
     
@@ -63,11 +83,95 @@ def start_interview():
     return jsonify({
         'result': 'ok', 
         'data': {
-            'questionList': questionList,
+            # 답변 제출 시 interview_id (또는 session_id + question_order) 로 행을 가리킴
+            'questionList': _with_interview_ids(questionList, interviews),
             'session_id': session_id  # 프론트엔드에 세션 ID 전달
         }
     })
 
+# 질문 풀 상태 조회 (크기, 리필 진행 수, hit/miss)
+@bp.route('/api/interview/pool', methods=['GET'])
+@jwt_required()
+def get_question_pool():
+    return jsonify({'result': 'ok', 'data': question_pool.get_stats()})
+
+# LLM 구조화 출력 통계 (모델별 파싱/스키마 실패 횟수와 비율)
+@bp.route('/api/llm/stats', methods=['GET'])
+@jwt_required()
+def get_llm_stats():
+    return jsonify({'result': 'ok', 'data': structured_output.get_stats()})
+
+def _with_interview_ids(questionList, interviews):
+    """저장된 순서대로 각 질문에 interview_id / question_order 를 붙인 새 목록"""
+    return [
+        {**q, 'interview_id': itv.id, 'question_order': itv.question_order}
+        for q, itv in zip(questionList, interviews)
+    ]
+
+def _sse(event, data):
+    """Server-Sent Events 메시지 한 개"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+# Interview Question API (SSE 스트리밍)
+# 질문이 하나 완성될 때마다 'question' 이벤트로 바로 보내고, 끝나면 세션을 저장한 뒤 'done' 이벤트를 보냄
+# EventSource 는 헤더를 못 붙이므로 ?jwt=<token> 쿼리로도 인증 가능
+@bp.route('/api/interview/start/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def start_interview_stream():
+    user_id = get_jwt_identity()
+    session_id = str(uuid.uuid4())
+    logger.info("Interview stream started", user_id=user_id, session_id=session_id)
+
+    def generate():
+        yield _sse('session', {'session_id': session_id})
+
+        # 질문 풀에 준비된 세트가 있으면 바로 전부 보냄
+        questionList = question_pool.take_pooled_question_list()
+        if questionList:
+            for i, q in enumerate(questionList):
+                yield _sse('question', {'index': i, **q})
+        else:
+            questionList = []
+            try:
+                for q in stream_questions():
+                    yield _sse('question', {'index': len(questionList), **q})
+                    questionList.append(q)
+            except Exception:
+                logger.exception("Question stream generation failed", session_id=session_id)
+                yield _sse('error', {'code': '500', 'message': 'Failed to generate question'})
+                return
+
+            # 3개를 다 받지 못했으면 자리표시 질문으로 채우지 않고 실패 (세션도 저장하지 않음)
+            if len(questionList) < 3:
+                logger.warning("Question stream incomplete", session_id=session_id, count=len(questionList))
+                yield _sse('error', {'code': '500', 'message': 'Failed to generate question'})
+                return
+
+        # 모든 질문을 받은 뒤 세션 전체를 한 번에 저장
+        interviews = [
+            Interview(
+                user_id=user_id,
+                question=q['question'],
+                LLM_gen_answer=q['answer'],
+                type=q['type'],
+                session_id=session_id,
+                question_order=i
+            )
+            for i, q in enumerate(questionList)
+        ]
+        db.session.add_all(interviews)
+        interview_sessions.create(user_id, session_id, questionList)
+        db.session.commit()
+
+        # 'question' 이벤트의 index 가 question_order, 저장 후에는 interview_id 도 전달
+        yield _sse('done', {'session_id': session_id, 'questionList': _with_interview_ids(questionList, interviews)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @bp.route('/api/interview/answer', methods=['POST'])
 @jwt_required()
 def next_question():
@@ -75,32 +179,32 @@ def next_question():
     # if not data or 'question' not in data or 'useranswer' not in data or 'video' not in data or 'type' not in data:
     #     print("[Error] Invalid input data:", data)
     #     return jsonify({'result': 'fail', 'code': '400', 'message': 'Invalid input'}), 400
-    if 'question' not in request.form or 'useranswer' not in request.form or 'type' not in request.form:
-        print("[Error] Invalid form data:", request.form)
+    # 답변할 행: interview_id 또는 session_id + question_order (session_id + question 본문은 deprecated)
+    if not has_lookup_args(request.form) or 'useranswer' not in request.form or 'type' not in request.form:
+        logger.warning("Invalid answer form", fields=sorted(request.form.keys()))
         return jsonify({'result': 'fail', 'code': '400', 'message': 'Invalid form data'}), 400
        
     user_id = get_jwt_identity()
-    question_text = request.form.get('question')
     user_answer_text = request.form.get('useranswer') # 클라이언트에서 'answer' 키로 보내므로 'answer'로 받음
     interview_type = request.form.get('type')
-    session_id = request.form.get('session_id')
     
-    interview = Interview.query.filter_by(
-        user_id=user_id, 
-        question=question_text,
-        session_id=session_id
-    ).first()
+    try:
+        interview = find_interview(user_id, request.form)
+    except InvalidLookup as e:
+        return jsonify({'result': 'fail', 'code': '400', 'message': str(e)}), 400
     
     if not interview:
         return jsonify({'result': 'fail', 'code': '404', 'message': 'Interview not found'}), 404
+    session_id = interview.session_id
     
+    # 영상은 선택: 답변 텍스트만 먼저 제출하고 영상은 /api/interview/video/upload 로 나눠 올릴 수 있음
     if 'video' in request.files:
         video_file = request.files['video']
         if video_file.filename != '':
             # 파일 이름을 안전하게 만들고, 저장 경로를 설정 (예: static/videos/)
             # "user_id_타임스탬프.webm" 와 같은 형식으로 고유한 파일명 생성 추천
             filename = secure_filename(f"{user_id}_{interview.id}_{video_file.filename}")
-            save_path = os.path.join('app/static/videos', filename) # 저장할 폴더 경로
+            save_path = os.path.join(current_app.config['VIDEO_DIR'], filename) # 저장할 폴더 경로
             
             # 폴더가 없으면 생성
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
@@ -112,8 +216,23 @@ def next_question():
             
     interview.useranswer = user_answer_text
     interview.type = interview_type
+    # 이전 답변의 분석은 더 이상 맞지 않음 (백그라운드에서 다시 분석)
+    interview.analysis = "응답 없음"
+    interview.score = None
+    requested_at = analysis_jobs.mark_answer_pending(interview)
+
+    # 답변이 바뀌었으므로 이전 분석 캐시는 무효
+    invalidate_analysis_cache(user_id, session_id)
+    db.session.flush()
+    session = interview_sessions.refresh(session_id, analysis_stale=True)
     
     db.session.commit()
+
+    # 이 답변을 바로 백그라운드에서 분석하고, 세션의 마지막 답변이면 세션 분석 작업도 큐에 넣음
+    analysis_jobs.enqueue_answer_analysis(session_id, interview.id, requested_at)
+    if session is not None and session.status == 'answered':
+        analysis_jobs.enqueue_analysis(user_id, session_id)
+
     return jsonify({'result': 'ok', 'data': {'message': 'ok'}})
 
 @bp.route('/api/analysis/info', methods=['GET'])
@@ -121,28 +240,34 @@ def next_question():
 def get_analysis():
     user_id = get_jwt_identity()
     
-    # URL 파라미터에서 session_id 가져오기
+    # URL 파라미터에서 session_id 가져오기 (없으면 가장 최근 세션)
     session_id = request.args.get('session_id')
+    session = interview_sessions.get(user_id, session_id) if session_id else interview_sessions.latest(user_id)
+    if session is None:
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'No interviews found for this session'}), 404
+    session_id = session.id
+    logger.debug("Analysis info requested", session_id=session_id, status=session.status)
     
-    if session_id:
-        # 특정 세션의 인터뷰만 조회
-        interviews = Interview.query.filter_by(user_id=user_id, session_id=session_id).order_by(Interview.question_order).all()
-        print(f"[Analysis] Analyzing specific session: {session_id}")
-    else:
-        # session_id가 없으면 가장 최근 세션 분석
-        latest_session = db.session.query(Interview.session_id).filter_by(user_id=user_id).order_by(Interview.id.desc()).first()
-        if latest_session:
-            session_id = latest_session.session_id
-            interviews = Interview.query.filter_by(user_id=user_id, session_id=session_id).order_by(Interview.question_order).all()
-            print(f"[Analysis] Analyzing latest session: {session_id}")
-        else:
-            interviews = []
-    
+    interviews = Interview.query.filter_by(user_id=user_id, session_id=session_id).order_by(Interview.question_order).all()
     if not interviews:
         return jsonify({'result': 'fail', 'code': '404', 'message': 'No interviews found for this session'}), 404
     
-    # 해당 세션의 인터뷰 분석
-    summary = analysisByLLM(user_id, session_id)
+    if session.status == 'analyzed':
+        # 마지막 답변 이후의 세션 분석이 세션 행에 저장되어 있음 (작업 결과 JSON 을 읽지 않음)
+        summary = interview_sessions.analysis_result(session, interviews)
+    else:
+        # 지금 답변으로 완료된 분석 작업이 있으면 DB에 저장된 결과를 그대로 사용
+        # (없거나 그 뒤 답변이 바뀌었으면 새로 큐에 넣음)
+        job = analysis_jobs.current_job(user_id, session_id)
+        if job.status == 'failed':
+            # 방금 실패했으면 다시 시도할 수 있을 때까지 실패 상태를 그대로 알려 줌
+            retry = analysis_jobs.retry_after(job)
+            return jsonify({'result': 'fail', 'code': '503', 'message': 'Analysis failed',
+                            'data': {**analysis_jobs.job_to_dict(job), 'retry_after': retry}}), 503, {'Retry-After': str(retry)}
+        if job.status != 'done':
+            # 대기/실행 중이면 그 작업 상태를 반환
+            return jsonify({'result': 'ok', 'data': analysis_jobs.job_to_dict(job)}), 202
+        summary = json.loads(job.result)
     
     interview_list = []
     for itv in interviews:
@@ -159,12 +284,86 @@ def get_analysis():
         "InterviewList": interview_list,
         "summary": summary,
         "session_id": session_id,
+        "session": interview_sessions.to_dict(session),
         "video": interviews[0].video if interviews and interviews[0].video else None
     }   
     
-    print(f"[Analysis Info] Session {session_id}:", data)
+    logger.debug("Analysis info", session_id=session_id, data=payload(data))
     return jsonify({'result': 'ok', 'data': data})
 
+# 분석 결과 (llm_analysis 형식: {"success": ..., "data": {InterviewList, summary, scores}}), session_id 없으면 전체 이력
+# 요청 스레드에서 LLM 을 기다리지 않고 /api/analysis/info 처럼 분석 작업을 큐에 넣고 작업 상태(202)를 반환.
+# ASGI 모드에서는 이벤트 루프에서 작업이 끝나기를 기다린 뒤 들어오므로 바로 결과를 반환 (app/asgi.py)
+@bp.route('/api/interview/analysis', methods=['GET'])
+@jwt_required()
+def get_interview_analysis():
+    user_id = get_jwt_identity()
+    session_id = request.args.get('session_id') or request.args.get('sessionId')
+
+    try:
+        # ASGI 모드에서 작업을 기다리다 난 오류는 여기서 다시 올라옴
+        prefetched()
+        job = analysis_jobs.current_job(user_id, session_id)
+    except Exception as e:
+        logger.exception("Analysis failed", session_id=session_id)
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+    if job.status == 'failed':
+        retry = analysis_jobs.retry_after(job)
+        return jsonify({'success': False, 'message': job.error or 'Analysis failed',
+                        'data': {**analysis_jobs.job_to_dict(job), 'retry_after': retry}}), 503, {'Retry-After': str(retry)}
+    if job.status != 'done':
+        return jsonify({'success': True, 'data': analysis_jobs.job_to_dict(job)}), 202
+    return jsonify({'success': True, 'data': json.loads(job.result)})
+
+# 세션 분석 (SSE 스트리밍)
+# 항목별 analysis/score 가 완성될 때마다 'item' 이벤트, 마지막에 'summary'(총평 + overall scores), 'done' 이벤트
+@bp.route('/api/analysis/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def get_analysis_stream():
+    user_id = get_jwt_identity()
+    session_id = request.args.get('session_id')
+    # session_id가 없으면 가장 최근 세션 분석
+    session = interview_sessions.get(user_id, session_id) if session_id else interview_sessions.latest(user_id)
+    if session is None or session.question_count == 0:
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'No interviews found for this session'}), 404
+    session_id = session.id
+    # 분석 중에 답변이 다시 제출되면 이 결과는 세션에 저장되지 않음
+    answers_version = session.answers_version
+    logger.info("Analysis stream started", session_id=session_id)
+
+    def generate():
+        yield _sse('session', {'session_id': session_id})
+        try:
+            for event, data in stream_analysis(user_id, session_id):
+                if event == 'summary':
+                    # 완료된 결과는 /api/analysis/info 에서 바로 쓸 수 있도록 저장
+                    analysis_jobs.record_result(user_id, session_id, data, answers_version)
+                    yield _sse('summary', {'summary': data['summary'], 'scores': data['scores']})
+                else:
+                    yield _sse(event, data)
+        except Exception:
+            logger.exception("Analysis stream failed", session_id=session_id)
+            yield _sse('error', {'code': '500', 'message': 'Analysis failed'})
+            return
+        yield _sse('done', {'session_id': session_id})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+# 분석 작업 상태 조회 (queued / running / done / failed)
+@bp.route('/api/analysis/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_analysis_job(job_id):
+    user_id = get_jwt_identity()
+    job = analysis_jobs.get_job(user_id, job_id)
+    if not job:
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Analysis job not found'}), 404
+    return jsonify({'result': 'ok', 'data': analysis_jobs.job_to_dict(job)})
+
 @bp.route('/api/interview/info', methods=['GET'])
 @jwt_required()
 def get_history():
@@ -173,14 +372,22 @@ def get_history():
     # URL 파라미터에서 session_id 가져오기
     session_id = request.args.get('session_id')
     
+    next_cursor = None
+    session = None
     if session_id:
-        # 특정 세션의 인터뷰만 조회
-        print(f"[Interview Info] Fetching interviews for session: {session_id}")
+        # 특정 세션의 인터뷰만 조회 (총평 등 세션 정보는 세션 행에서)
+        session = interview_sessions.get(user_id, session_id)
         interviews = Interview.query.filter_by(user_id=user_id, session_id=session_id).order_by(Interview.question_order).all()
     else:
-        # 모든 인터뷰 조회 (기존 동작 유지)
-        print("[Interview Info] No session_id provided, fetching all interviews for user.")
-        interviews = Interview.query.filter_by(user_id=user_id).all()
+        # 모든 인터뷰 조회 (커서 페이지네이션)
+        try:
+            limit, cursor = get_page_args()
+        except InvalidCursor:
+            return jsonify({'result': 'fail', 'code': '400', 'message': 'Invalid cursor'}), 400
+        interviews, next_cursor = paginate(
+            Interview.query.filter_by(user_id=user_id),
+            Interview.timestamp, Interview.id, limit, cursor
+        )
     
     if not interviews:
         return jsonify({'result': 'fail', 'code': '404', 'message': 'No interviews found'}), 404
@@ -201,12 +408,14 @@ def get_history():
     # summary = "면접결과 summary"
     data = {
         "InterviewList": interview_list,
-        "summary": itv.summary,
+        "summary": session.summary if session is not None and session.summary else itv.summary,
         "session_id": session_id,
-        "video": interviews[0].video if interviews and interviews[0].video else "interview_20250728_user1234.mp4"
+        "session": interview_sessions.to_dict(session) if session is not None else None,
+        "video": interviews[0].video if interviews and interviews[0].video else "interview_20250728_user1234.mp4",
+        "next_cursor": next_cursor
     }   
     
-    print("[Interview Info]", data)
+    logger.debug("Interview info", session_id=session_id, count=len(interview_list), data=payload(data))
     return jsonify({'result': 'ok', 'data': data})
 
 # 사용자의 모든 인터뷰 세션 목록 조회
@@ -215,47 +424,46 @@ def get_history():
 def get_sessions():
     user_id = get_jwt_identity()
     
-    # 세션별로 그룹화하여 조회
-    sessions = db.session.query(
-        Interview.session_id,
-        db.func.min(Interview.id).label('first_interview_id'),
-        db.func.count(Interview.id).label('question_count'),
-        db.func.max(Interview.id).label('last_interview_id')
-    ).filter_by(user_id=user_id).group_by(Interview.session_id).all()
-    
-    session_list = []
-    for session in sessions:
-        # 해당 세션의 모든 인터뷰 데이터 가져오기
-        interviews = Interview.query.filter_by(
-            user_id=user_id, 
-            session_id=session.session_id
-        ).order_by(Interview.question_order).all()
-        
+    try:
+        limit, cursor = get_page_args()
+    except InvalidCursor:
+        return jsonify({'result': 'fail', 'code': '400', 'message': 'Invalid cursor'}), 400
+
+    # 1) 세션 행을 최신순 (created_at DESC, id DESC) 으로 한 페이지만 조회 (ix_interview_session_user_created 역방향)
+    heads, next_cursor = paginate(
+        InterviewSession.query.filter_by(user_id=user_id),
+        InterviewSession.created_at, InterviewSession.id, limit, cursor, descending=True
+    )
+
+    # 2) 그 세션들의 인터뷰를 한 번에 조회해서 세션별로 묶음 (세션마다 추가 쿼리 없음)
+    interviews = Interview.query.filter(
+        Interview.user_id == user_id, Interview.session_id.in_([head.id for head in heads])
+    ).order_by(
+        Interview.session_id, Interview.question_order, Interview.id
+    ).all() if heads else []
+
+    # 생성 시각/타입/총평/점수/카운터는 세션 행 기준
+    sessions = {head.id: {'head': head, 'interviews': []} for head in heads}
+    for itv in interviews:
         # 각 세션의 인터뷰 리스트 구성
-        interview_list = []
-        for itv in interviews:
-            interview_list.append({
-                'question': itv.question,
-                'useranswer': itv.useranswer,
-                'LLM_gen_answer': itv.LLM_gen_answer,
-                'analysis': itv.analysis,
-                'score': itv.score,
-                'question_order': itv.question_order,
-                'summary': itv.summary
-            })
-        
-        # 첫 번째 인터뷰 정보 가져오기
-        first_interview = Interview.query.get(session.first_interview_id)
-        
+        sessions[itv.session_id]['interviews'].append({
+            'question': itv.question,
+            'useranswer': itv.useranswer,
+            'LLM_gen_answer': itv.LLM_gen_answer,
+            'analysis': itv.analysis,
+            'score': itv.score,
+            'question_order': itv.question_order,
+            'summary': itv.summary
+        })
+
+    session_list = []
+    for session in sessions.values():
         session_list.append({
-            'session_id': session.session_id,
-            'question_count': session.question_count,
-            'created_at': first_interview.timestamp if first_interview else None,
-            'type': first_interview.type if first_interview else 'Unknown',
-            'interviews': interview_list  # 모든 질문, 답변, 분석 정보 포함
+            **interview_sessions.to_dict(session['head']),
+            'interviews': session['interviews']  # 모든 질문, 답변, 분석 정보 포함
         })
     
-    return jsonify({'result': 'ok', 'data': {'sessions': session_list}})
+    return jsonify({'result': 'ok', 'data': {'sessions': session_list, 'next_cursor': next_cursor}})
 
 
 
@@ -309,9 +517,16 @@ def save_answer():
 @jwt_required()
 def get_scores():
     user_id = get_jwt_identity()
-    interviews = Interview.query.filter_by(user_id=user_id).all()
+    try:
+        limit, cursor = get_page_args()
+    except InvalidCursor:
+        return jsonify({'result': 'fail', 'code': '400', 'message': 'Invalid cursor'}), 400
+    interviews, next_cursor = paginate(
+        Interview.query.filter_by(user_id=user_id),
+        Interview.timestamp, Interview.id, limit, cursor
+    )
     data = [{'question': i.question, 'useranswer': i.useranswer, 'score': i.score} for i in interviews]
-    return jsonify({'result': 'ok', 'data': {'interviews': data}})
+    return jsonify({'result': 'ok', 'data': {'interviews': data, 'next_cursor': next_cursor}})
 
 # @bp.route('/api/analysis/info', methods=['GET'])
 # @jwt_required()
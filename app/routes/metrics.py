@@ -0,0 +1,23 @@
+import hmac
+
+from flask import Blueprint, Response, request, current_app, jsonify
+from app import metrics
+
+bp = Blueprint('metrics', __name__)
+
+
+def _authorized(token):
+    # 상수 시간 비교 (응답 시간으로 토큰을 한 글자씩 맞춰 볼 수 없도록)
+    return hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode())
+
+
+# Prometheus 수집 엔드포인트 (Authorization: Bearer <METRICS_TOKEN> 필요, METRICS_PUBLIC=true 면 인증 없음)
+@bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    token = current_app.config['METRICS_TOKEN']
+    public = current_app.config['METRICS_PUBLIC']
+    if not current_app.config['METRICS_ENABLED'] or not (token or public):
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Metrics disabled'}), 404
+    if token and not _authorized(token):
+        return jsonify({'result': 'fail', 'code': '401', 'message': 'Unauthorized'}), 401
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,321 @@
+from flask import Blueprint, jsonify, request, current_app, send_file
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import db
+from app.models import Interview, VideoUpload
+from app.log import get_logger
+from app.interview_lookup import find_interview, has_lookup_args, InvalidLookup
+import uuid
+import os
+import time
+import datetime
+import threading
+from werkzeug.utils import secure_filename
+
+bp = Blueprint('video', __name__)
+logger = get_logger(__name__)
+
+# 만료된 업로드 정리는 업로드 시작 요청에서 프로세스마다 이 간격(초)으로 한 번만
+SWEEP_INTERVAL = 600
+_sweep_lock = threading.Lock()
+_last_sweep = 0.0
+
+ACTIVE_STATUSES = ('uploading', 'writing')
+
+
+def _uploads_dir():
+    return os.path.join(current_app.config['VIDEO_DIR'], '.uploads')
+
+
+def _part_path(upload):
+    # 업로드 중인 파일은 VIDEO_DIR/.uploads/<upload_id>.part 에 이어서 기록
+    return os.path.join(_uploads_dir(), f"{upload.id}.part")
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def sweep_expired_uploads():
+    """
+    VIDEO_UPLOAD_EXPIRY 초 동안 청크가 오지 않은 업로드 행과 .part 파일을 지운다.
+    행은 읽은 updated_at 그대로일 때만 지우므로 그 사이 이어 받은 업로드는 남는다. 지운 업로드 수를 반환.
+    """
+    expiry = current_app.config['VIDEO_UPLOAD_EXPIRY']
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(seconds=expiry)
+    expired = VideoUpload.query.filter(
+        VideoUpload.status.in_(ACTIVE_STATUSES), VideoUpload.updated_at < cutoff
+    ).all()
+    removed = 0
+    for upload in expired:
+        path = _part_path(upload)
+        deleted = VideoUpload.query.filter_by(
+            id=upload.id, updated_at=upload.updated_at
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        if deleted:
+            _remove_file(path)
+            removed += 1
+
+    # 행은 없는데 남은 .part 파일 (파일 삭제 전에 프로세스가 죽은 경우 등)
+    uploads_dir = _uploads_dir()
+    names = [n for n in os.listdir(uploads_dir) if n.endswith('.part')] if os.path.isdir(uploads_dir) else []
+    ids = [n[:-len('.part')] for n in names]
+    active = {row.id for row in VideoUpload.query.filter(
+        VideoUpload.id.in_(ids), VideoUpload.status.in_(ACTIVE_STATUSES)
+    ).with_entities(VideoUpload.id)} if ids else set()
+    for name, upload_id in zip(names, ids):
+        path = os.path.join(uploads_dir, name)
+        if upload_id not in active and os.path.getmtime(path) < time.time() - expiry:
+            _remove_file(path)
+
+    if removed:
+        logger.info("Expired video uploads removed", count=removed)
+    return removed
+
+
+def _maybe_sweep():
+    global _last_sweep
+    with _sweep_lock:
+        if time.monotonic() - _last_sweep < SWEEP_INTERVAL:
+            return
+        _last_sweep = time.monotonic()
+    try:
+        sweep_expired_uploads()
+    except Exception:
+        db.session.rollback()
+        logger.exception("Video upload sweep failed")
+
+
+def _claim(upload, offset):
+    """
+    받은 오프셋이 offset 인 업로드를 'writing' 으로 바꿔 이 요청이 쓰기를 맡는다.
+    같은 오프셋의 PATCH 가 동시에 와도 조건부 UPDATE 라 한 요청만 성공한다.
+    쓰는 요청이 죽어 VIDEO_UPLOAD_WRITE_TIMEOUT 동안 'writing' 으로 남은 업로드는 다시 가져올 수 있다.
+    성공하면 반납할 때 쓸 토큰(updated_at)을, 실패하면 None 을 반환.
+    """
+    now = datetime.datetime.utcnow()
+    stale = now - datetime.timedelta(seconds=current_app.config['VIDEO_UPLOAD_WRITE_TIMEOUT'])
+    claimed = VideoUpload.query.filter(
+        VideoUpload.id == upload.id,
+        VideoUpload.received == offset,
+        db.or_(
+            VideoUpload.status == 'uploading',
+            db.and_(VideoUpload.status == 'writing', VideoUpload.updated_at < stale),
+        ),
+    ).update({'status': 'writing', 'updated_at': now}, synchronize_session=False)
+    db.session.commit()
+    return now if claimed else None
+
+
+def _release(upload, token, received):
+    """쓰기를 마치고 (중간에 끊겨도) 디스크에 기록이 확인된 오프셋을 남긴 뒤 다시 'uploading' 으로"""
+    released = VideoUpload.query.filter_by(id=upload.id, status='writing', updated_at=token).update(
+        {'status': 'uploading', 'received': received, 'updated_at': datetime.datetime.utcnow()},
+        synchronize_session=False
+    )
+    db.session.commit()
+    if not released:
+        # 제한 시간이 지나 다른 요청이 쓰기를 가져간 경우 그쪽 오프셋을 덮어쓰지 않음
+        logger.warning("Video upload claim lost", upload_id=upload.id, received=received)
+
+
+def _upload_status(upload):
+    return {
+        'upload_id': upload.id,
+        'offset': upload.received,
+        'size': upload.size,
+        'status': upload.status
+    }
+
+
+# 1) 업로드 시작: 전체 크기를 먼저 받아서 용량 제한을 확인
+@bp.route('/api/interview/video/upload', methods=['POST'])
+@jwt_required()
+def init_upload():
+    data = request.get_json(silent=True) or {}
+    # 대상 행은 답변 제출과 같은 방식으로 지정 (interview_id 또는 session_id + question_order)
+    if not has_lookup_args(data) or 'filename' not in data or 'size' not in data:
+        return jsonify({'result': 'fail', 'code': '400', 'message': 'Invalid input'}), 400
+
+    user_id = get_jwt_identity()
+    try:
+        size = int(data['size'])
+    except (TypeError, ValueError):
+        return jsonify({'result': 'fail', 'code': '400', 'message': 'Invalid size'}), 400
+    if size <= 0 or size > current_app.config['VIDEO_MAX_BYTES']:
+        return jsonify({'result': 'fail', 'code': '413', 'message': 'Video too large'}), 413
+
+    try:
+        interview = find_interview(user_id, data)
+    except InvalidLookup as e:
+        return jsonify({'result': 'fail', 'code': '400', 'message': str(e)}), 400
+    if not interview:
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Interview not found'}), 404
+
+    _maybe_sweep()
+
+    upload = VideoUpload(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        interview_id=interview.id,
+        filename=secure_filename(data['filename']) or 'video.webm',
+        size=size,
+        received=0
+    )
+    part_path = _part_path(upload)
+    os.makedirs(os.path.dirname(part_path), exist_ok=True)
+    open(part_path, 'wb').close()
+
+    db.session.add(upload)
+    db.session.commit()
+    logger.info("Video upload started", upload_id=upload.id, interview_id=interview.id, size=size)
+    return jsonify({'result': 'ok', 'data': _upload_status(upload)})
+
+
+# 업로드 상태 조회: 연결이 끊긴 뒤 어디서부터 이어 보낼지 확인
+@bp.route('/api/interview/video/upload/<upload_id>', methods=['GET'])
+@jwt_required()
+def get_upload(upload_id):
+    upload = VideoUpload.query.filter_by(id=upload_id, user_id=get_jwt_identity()).first()
+    if not upload:
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Upload not found'}), 404
+    return jsonify({'result': 'ok', 'data': _upload_status(upload)})
+
+
+# 2) 청크 추가: Upload-Offset 헤더 위치부터 요청 본문을 그대로 디스크에 이어 씀
+@bp.route('/api/interview/video/upload/<upload_id>', methods=['PATCH'])
+@jwt_required()
+def append_chunk(upload_id):
+    upload = VideoUpload.query.filter_by(id=upload_id, user_id=get_jwt_identity()).first()
+    if not upload:
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Upload not found'}), 404
+    if upload.status == 'complete':
+        return jsonify({'result': 'fail', 'code': '409', 'message': 'Upload already finalized'}), 409
+
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+    except ValueError:
+        return jsonify({'result': 'fail', 'code': '400', 'message': 'Upload-Offset header required'}), 400
+    if offset != upload.received:
+        # 클라이언트는 응답의 offset 부터 다시 보내면 됨
+        return jsonify({'result': 'fail', 'code': '409', 'message': 'Offset mismatch', 'data': _upload_status(upload)}), 409
+
+    # 본문을 읽기 전에 용량 제한 확인
+    length = request.content_length
+    if length is None:
+        return jsonify({'result': 'fail', 'code': '411', 'message': 'Content-Length required'}), 411
+    if offset + length > upload.size:
+        return jsonify({'result': 'fail', 'code': '413', 'message': 'Chunk exceeds declared size'}), 413
+
+    token = _claim(upload, offset)
+    if token is None:
+        # 다른 요청이 같은 오프셋을 쓰는 중이거나 그 사이 오프셋이 바뀜
+        db.session.refresh(upload)
+        message = 'Upload in progress' if upload.status == 'writing' else 'Offset mismatch'
+        return jsonify({'result': 'fail', 'code': '409', 'message': message, 'data': _upload_status(upload)}), 409
+
+    buffer_size = current_app.config['VIDEO_CHUNK_BUFFER']
+    written = 0
+    synced = 0
+    try:
+        with open(_part_path(upload), 'r+b') as f:
+            f.seek(offset)
+            try:
+                # 요청 본문 전체를 메모리에 올리지 않고 버퍼 크기만큼씩 흘려 씀
+                while written < length:
+                    chunk = request.stream.read(min(buffer_size, length - written))
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    written += len(chunk)
+            finally:
+                # 중간에 연결이 끊겨도 이미 쓴 만큼은 디스크에 반영한 뒤에만 확인된 오프셋으로 인정
+                f.flush()
+                os.fsync(f.fileno())
+                synced = written
+    finally:
+        _release(upload, token, offset + synced)
+
+    return jsonify({'result': 'ok', 'data': _upload_status(upload)})
+
+
+# 3) 업로드 완료: 모든 바이트가 도착했으면 최종 경로로 옮기고 Interview.video 에 기록
+@bp.route('/api/interview/video/upload/<upload_id>/finalize', methods=['POST'])
+@jwt_required()
+def finalize_upload(upload_id):
+    user_id = get_jwt_identity()
+    upload = VideoUpload.query.filter_by(id=upload_id, user_id=user_id).first()
+    if not upload:
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Upload not found'}), 404
+    if upload.status == 'complete':
+        return jsonify({'result': 'ok', 'data': _upload_status(upload)})
+    if upload.status != 'uploading' or upload.received != upload.size:
+        return jsonify({'result': 'fail', 'code': '409', 'message': 'Upload incomplete', 'data': _upload_status(upload)}), 409
+
+    interview = db.session.get(Interview, upload.interview_id)
+    if interview is None:
+        # 업로드 중에 인터뷰 행이 삭제됨 (남은 .part 파일은 만료 정리에서 지움)
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Interview not found'}), 404
+
+    # 조건부 UPDATE 로 완료 처리를 먼저 가져옴 (커밋까지 행이 잠기므로 동시에 온 finalize 는 한 번만 파일을 옮김)
+    claimed = VideoUpload.query.filter_by(
+        id=upload.id, status='uploading', received=upload.size
+    ).update({'status': 'complete'}, synchronize_session=False)
+    if not claimed:
+        db.session.rollback()
+        db.session.refresh(upload)
+        if upload.status == 'complete':
+            return jsonify({'result': 'ok', 'data': _upload_status(upload)})
+        return jsonify({'result': 'fail', 'code': '409', 'message': 'Upload incomplete', 'data': _upload_status(upload)}), 409
+
+    filename = secure_filename(f"{user_id}_{interview.id}_{upload.filename}")
+    save_path = os.path.join(current_app.config['VIDEO_DIR'], filename)
+    try:
+        os.replace(_part_path(upload), save_path)
+    except OSError:
+        db.session.rollback()
+        raise
+
+    interview.video = save_path
+    db.session.commit()
+    logger.info("Video upload finalized", upload_id=upload.id, path=save_path)
+    return jsonify({'result': 'ok', 'data': _upload_status(upload)})
+
+
+# 면접 영상 재생: Range 요청(206), ETag/Last-Modified 조건부 요청 지원
+# <video src> 는 헤더를 못 붙이므로 ?jwt=<token> 쿼리로도 인증 가능
+@bp.route('/api/interview/video/<session_id>', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_video(session_id):
+    user_id = get_jwt_identity()
+    query = Interview.query.filter(
+        Interview.user_id == user_id,
+        Interview.session_id == session_id,
+        Interview.video.isnot(None)
+    )
+    question_order = request.args.get('question_order', type=int)
+    if question_order is not None:
+        query = query.filter(Interview.question_order == question_order)
+    interview = query.order_by(Interview.question_order).first()
+
+    # DB 에는 서버 실행 위치 기준 상대 경로가 저장되어 있음
+    path = os.path.abspath(interview.video) if interview else None
+    if not path or not os.path.isfile(path):
+        return jsonify({'result': 'fail', 'code': '404', 'message': 'Video not found'}), 404
+
+    # conditional=True: Range/If-Range/If-None-Match/If-Modified-Since 처리
+    # 파일 객체 대신 경로를 넘겨야 WSGI 서버의 file_wrapper(sendfile) 나 X-Sendfile 을 쓸 수 있음
+    response = send_file(
+        path,
+        conditional=True,
+        etag=True,
+        last_modified=os.path.getmtime(path),
+        max_age=current_app.config['VIDEO_CACHE_MAX_AGE']
+    )
+    # 사용자 본인 영상이므로 공유 캐시(CDN/프록시)에는 저장하지 않음
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
@@ -0,0 +1,275 @@
+"""
+면접 분석 작업 큐
+- 답변이 제출될 때마다 그 답변 하나를 분석하는 작업을 큐에 넣는다 (analyze_answer)
+  요청 시각을 interview.analysis_requested_at 에 남기고 끝나면 지우므로, 세션 분석은 어느 워커에서 실행되든
+  DB 만 보고 같은 세션의 답변 분석이 끝나기를 기다릴 수 있다
+- 세션의 마지막 답변이 들어오거나 결과를 처음 요청할 때 분석 작업(AnalysisJob)을 큐에 넣는다
+- 작업은 ANALYSIS_WORKERS 크기의 스레드 풀에서 analysisByLLM 을 실행하고 결과를 DB에 저장한다
+  (항목별 분석이 끝나 있으면 analysisByLLM 은 총평/overall_scores 만 요청한다)
+- 답변/세션 분석이 저장되면 InterviewSession 의 카운터, 상태, 총평/overall_scores 를 함께 갱신한다
+- 작업은 시작할 때 세션의 answers_version 을 남기고, 그 뒤 답변이 바뀌었으면 결과를 세션에 저장하지 않는다
+  (실행 중인 작업이 이전 답변을 보고 있으면 enqueue_analysis 가 후속 작업을 만든다)
+- /api/analysis/info, /api/interview/analysis 는 완료된 작업 결과를 DB에서 바로 읽어 응답한다
+- 실패한 작업은 ANALYSIS_RETRY_AFTER 가 지나거나 답변이 바뀔 때까지 다시 큐에 넣지 않는다
+  (LLM 장애 중에 폴링할 때마다 새 분석이 시작되지 않도록)
+"""
+
+import os
+import json
+import time
+import uuid
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Dict, Optional
+
+from flask import current_app
+
+from app import db
+from app.log import get_logger
+from app.models import AnalysisJob, Interview
+from app.services import interview_sessions
+from app.services.llm_analysis import analysisByLLM, analyze_answer
+
+logger = get_logger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+ANSWER_POLL_INTERVAL = 0.5  # 세션 분석이 답변 분석 완료를 확인하는 간격 (초)
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+# job_id → 이 프로세스에서 실행 중인 세션 분석 작업 (ASGI 모드에서 요청이 완료를 await 할 때 사용)
+_job_futures: Dict[str, Future] = {}
+
+
+def _get_executor(app) -> ThreadPoolExecutor:
+    """프로세스마다 하나의 분석 스레드 풀 (fork 이후에는 새로 만든다)"""
+    global _executor, _executor_pid
+    with _lock:
+        pid = os.getpid()
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, app.config["ANALYSIS_WORKERS"]),
+                thread_name_prefix="analysis-job",
+            )
+            _executor_pid = pid
+        return _executor
+
+
+def _run_answer_job(app, session_id: str, interview_id: int, requested_at: datetime.datetime) -> None:
+    with app.app_context():
+        try:
+            if analyze_answer(interview_id):
+                interview_sessions.refresh(session_id)
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Answer analysis failed", interview_id=interview_id)
+        finally:
+            # 실패해도 표시는 지움 (세션 분석이 남은 항목을 함께 분석함).
+            # 그 사이 답변이 다시 제출됐으면 새 요청의 표시이므로 남겨 둠
+            Interview.query.filter_by(id=interview_id, analysis_requested_at=requested_at).update(
+                {"analysis_requested_at": None}, synchronize_session=False
+            )
+            db.session.commit()
+
+
+def mark_answer_pending(interview: Interview) -> Optional[datetime.datetime]:
+    """
+    답변 저장과 같은 커밋에서 부른다. 답변 단위 분석을 쓰면 요청 시각을 행에 남기고 그 값을 반환
+    (enqueue_answer_analysis 에 넘김). 쓰지 않으면 None.
+    """
+    if not current_app.config["ANALYSIS_PER_ANSWER"]:
+        interview.analysis_requested_at = None
+        return None
+    interview.analysis_requested_at = datetime.datetime.utcnow()
+    return interview.analysis_requested_at
+
+
+def enqueue_answer_analysis(session_id: str, interview_id: int, requested_at: Optional[datetime.datetime]) -> None:
+    """제출된 답변 하나를 백그라운드에서 분석 (사용자가 다음 질문에 답하는 동안 실행)"""
+    if requested_at is None:
+        return
+    app = current_app._get_current_object()
+    _get_executor(app).submit(_run_answer_job, app, session_id, interview_id, requested_at)
+
+
+def pending_answer_count(user_id, session_id: str) -> int:
+    """
+    분석을 요청했지만 아직 끝나지 않은 답변 수 (ix_interview_user_session_order).
+    ANALYSIS_JOB_TIMEOUT 보다 오래된 표시는 작업을 맡은 프로세스가 죽은 것으로 보고 세지 않는다
+    """
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(seconds=current_app.config["ANALYSIS_JOB_TIMEOUT"])
+    return Interview.query.filter(
+        Interview.user_id == user_id,
+        Interview.session_id == session_id,
+        Interview.analysis_requested_at > cutoff,
+    ).count()
+
+
+def _wait_pending_answers(user_id, session_id: str, timeout: float) -> None:
+    """세션 분석 전에 같은 세션의 답변 분석이 (다른 워커 프로세스에서 실행 중이어도) 끝나기를 기다림"""
+    deadline = time.monotonic() + timeout
+    while pending_answer_count(user_id, session_id):
+        # 다음 조회가 새 스냅샷을 보도록 읽기 트랜잭션을 끝냄
+        db.session.rollback()
+        if time.monotonic() >= deadline:
+            logger.warning("Answer analyses still pending, analyzing session anyway", session_id=session_id)
+            return
+        time.sleep(ANSWER_POLL_INTERVAL)
+    db.session.rollback()
+
+
+def _run_job(app, job_id: str) -> None:
+    with app.app_context():
+        # 어느 단계에서 실패해도 (DB 잠금 등) running 으로 남지 않고 failed 로 기록
+        try:
+            job = db.session.get(AnalysisJob, job_id)
+            if job is None:
+                return
+            job.status = "running"
+            # 이 값 이후의 답변만 분석에 들어가므로, 끝났을 때 값이 다르면 결과가 최신 답변과 맞지 않음
+            job.answers_version = _answers_version(job.user_id, job.session_id)
+            db.session.commit()
+            logger.info("Analysis job running", job_id=job_id, session_id=job.session_id)
+
+            # 답변 분석 작업은 이 작업보다 먼저 큐에 들어갔으므로 이미 실행 중이거나 끝났음
+            _wait_pending_answers(job.user_id, job.session_id, app.config["ANALYSIS_JOB_TIMEOUT"])
+
+            result = analysisByLLM(job.user_id, job.session_id)
+            job.result = json.dumps(result, ensure_ascii=False)
+            job.status = "done"
+            job.error = None
+            interview_sessions.record_analysis(job.session_id, result, job.answers_version)
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Analysis job failed", job_id=job_id)
+            job = db.session.get(AnalysisJob, job_id)
+            if job is None:
+                return
+            job.status = "failed"
+            job.error = str(e)
+        db.session.commit()
+
+
+def _is_stale(job: AnalysisJob) -> bool:
+    """서버 재시작 등으로 멈춘 작업인지 (ANALYSIS_JOB_TIMEOUT 동안 갱신 없음)"""
+    timeout = datetime.timedelta(seconds=current_app.config["ANALYSIS_JOB_TIMEOUT"])
+    updated = job.updated_at or job.created_at
+    return updated is not None and datetime.datetime.utcnow() - updated > timeout
+
+
+def latest_job(user_id, session_id: str) -> Optional[AnalysisJob]:
+    return (
+        AnalysisJob.query
+        .filter_by(user_id=user_id, session_id=session_id)
+        .order_by(AnalysisJob.created_at.desc())
+        .first()
+    )
+
+
+def get_job(user_id, job_id: str) -> Optional[AnalysisJob]:
+    return AnalysisJob.query.filter_by(id=job_id, user_id=user_id).first()
+
+
+def _answers_version(user_id, session_id: Optional[str]) -> int:
+    """작업이 비교할 답변 버전: 세션 분석이면 그 세션, 전체 이력 분석(session_id 없음)이면 사용자의 모든 세션"""
+    if session_id:
+        return interview_sessions.answers_version(session_id)
+    return interview_sessions.total_answers_version(user_id)
+
+
+def is_current(job: AnalysisJob) -> bool:
+    """완료/실패한 작업이 지금 답변으로 실행된 것인지"""
+    return job.answers_version == _answers_version(job.user_id, job.session_id)
+
+
+def retry_after(job: AnalysisJob) -> int:
+    """실패한 작업을 다시 큐에 넣기까지 남은 초 (0 이면 바로 다시 시도)"""
+    updated = job.updated_at or job.created_at
+    elapsed = (datetime.datetime.utcnow() - updated).total_seconds() if updated else 0
+    return max(0, int(current_app.config["ANALYSIS_RETRY_AFTER"] - elapsed))
+
+
+def current_job(user_id, session_id: Optional[str]) -> AnalysisJob:
+    """
+    결과 조회용 작업: 지금 답변으로 완료된 작업, 또는 실패한 지 ANALYSIS_RETRY_AFTER 가 지나지 않은 작업은 그대로 반환.
+    그 밖에는 enqueue_analysis (대기/실행 중인 작업이 있으면 그 작업)
+    """
+    job = latest_job(user_id, session_id)
+    if job is not None and job.status in ("done", "failed") and is_current(job):
+        if job.status == "done" or retry_after(job) > 0:
+            return job
+    return enqueue_analysis(user_id, session_id)
+
+
+def enqueue_analysis(user_id, session_id: str) -> AnalysisJob:
+    """
+    세션 분석 작업을 큐에 넣는다.
+    같은 세션에 대기 중인 작업이나 최신 답변으로 실행 중인 작업이 있으면 새로 만들지 않고 그 작업을 반환.
+    실행 중인 작업이 시작한 뒤 답변이 바뀌었으면 후속 작업을 새로 만든다.
+    """
+    job = latest_job(user_id, session_id)
+    if job is not None and job.status in ACTIVE_STATUSES:
+        if _is_stale(job):
+            job.status = "failed"
+            job.error = "timed out"
+        elif job.status == "running" and job.answers_version != _answers_version(user_id, session_id):
+            logger.info("Analysis job outdated, queueing follow-up", job_id=job.id, session_id=session_id)
+        else:
+            return job
+
+    job = AnalysisJob(id=str(uuid.uuid4()), user_id=user_id, session_id=session_id, status="queued")
+    db.session.add(job)
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    future = _get_executor(app).submit(_run_job, app, job.id)
+    job_id = job.id
+    with _lock:
+        _job_futures[job_id] = future
+    future.add_done_callback(lambda _: _forget_future(job_id))
+    logger.info("Analysis job queued", job_id=job.id, session_id=session_id)
+    return job
+
+
+def _forget_future(job_id: str) -> None:
+    with _lock:
+        _job_futures.pop(job_id, None)
+
+
+def job_future(job_id: str) -> Optional[Future]:
+    """이 프로세스에서 대기/실행 중인 작업의 Future (다른 워커가 넣었거나 이미 끝났으면 None)"""
+    with _lock:
+        return _job_futures.get(job_id)
+
+
+def record_result(user_id, session_id: str, result: Dict[str, Any], answers_version: int) -> AnalysisJob:
+    """
+    작업 큐를 거치지 않고 얻은 분석 결과(스트리밍 분석 등)를 완료된 작업으로 저장.
+    answers_version: 분석을 시작하기 전에 읽은 세션의 answers_version
+    """
+    job = AnalysisJob(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        session_id=session_id,
+        status="done",
+        result=json.dumps(result, ensure_ascii=False),
+        answers_version=answers_version
+    )
+    db.session.add(job)
+    interview_sessions.record_analysis(session_id, result, answers_version)
+    db.session.commit()
+    return job
+
+
+def job_to_dict(job: AnalysisJob) -> Dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "session_id": job.session_id,
+        "status": job.status,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
@@ -0,0 +1,145 @@
+"""
+면접 세션 (InterviewSession)
+- /api/interview/start 에서 세션 행을 만들고, 답변/분석이 저장될 때마다 카운터와 상태를 갱신한다
+  in_progress : 아직 답하지 않은 질문이 있음
+  answered    : 모든 질문에 답했고 세션 분석 대기 중 (분석 후 답변이 바뀐 경우 포함)
+  analyzed    : 마지막 답변 이후의 세션 분석 총평/overall_scores 가 저장되어 있음
+- 카운터는 증감하지 않고 그 세션의 interview 행을 한 번 집계해서 다시 계산한다 (재제출/동시 분석에도 정확)
+- answers_version 은 답변이 제출될 때마다 올라가고, 분석 작업은 시작할 때 본 값과 같을 때만 결과를 세션에 저장한다
+  (분석 중에 답변이 바뀌었으면 이전 답변으로 만든 총평으로 'analyzed' 가 되지 않음)
+- commit 은 호출자가 한다
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from app import db
+from app.log import get_logger
+from app.models import Interview, InterviewSession
+from app.services.llm_analysis import EMPTY_ANALYSIS, SCORE_KEYS, build_front_payload
+
+logger = get_logger(__name__)
+
+UNANSWERED = "응답 없음"
+
+
+def create(user_id, session_id: str, questionList: List[Dict[str, Any]]) -> InterviewSession:
+    session = InterviewSession(
+        id=session_id,
+        user_id=user_id,
+        type=questionList[0].get('type') if questionList else UNANSWERED,
+        question_count=len(questionList),
+    )
+    db.session.add(session)
+    return session
+
+
+def get(user_id, session_id: str) -> Optional[InterviewSession]:
+    session = db.session.get(InterviewSession, session_id)
+    if session is None or str(session.user_id) != str(user_id):
+        return None
+    return session
+
+
+def latest(user_id) -> Optional[InterviewSession]:
+    """가장 최근에 시작한 세션 (ix_interview_session_user_created)"""
+    return (
+        InterviewSession.query
+        .filter_by(user_id=user_id)
+        .order_by(InterviewSession.created_at.desc(), InterviewSession.id.desc())
+        .first()
+    )
+
+
+def _counts_query(session: InterviewSession):
+    analyzed = db.and_(Interview.score.isnot(None), Interview.analysis.not_in(EMPTY_ANALYSIS))
+    return db.session.query(
+        db.func.count(Interview.id),
+        db.func.sum(db.case((Interview.useranswer != UNANSWERED, 1), else_=0)),
+        db.func.sum(db.case((analyzed, 1), else_=0)),
+    ).filter(Interview.user_id == session.user_id, Interview.session_id == session.id)
+
+
+def refresh(session_id: Optional[str], analysis_stale: bool = False) -> Optional[InterviewSession]:
+    """
+    interview 행을 집계해서 카운터/상태를 갱신. 세션 행이 없으면 None.
+    analysis_stale: 답변이 바뀌어 저장된 세션 분석이 더 이상 맞지 않음 (answers_version 도 올림)
+    """
+    if not session_id:
+        return None
+    session = db.session.get(InterviewSession, session_id)
+    if session is None:
+        return None
+    if analysis_stale:
+        # 동시에 제출돼도 하나씩 올라가도록 DB 에서 더함
+        session.answers_version = InterviewSession.answers_version + 1
+    total, answered, analyzed = _counts_query(session).one()
+    session.question_count = total or 0
+    session.answered_count = answered or 0
+    session.analyzed_count = analyzed or 0
+    if session.answered_count < session.question_count:
+        session.status = "in_progress"
+    elif analysis_stale or session.status != "analyzed":
+        session.status = "answered"
+    return session
+
+
+def answers_version(session_id: Optional[str]) -> int:
+    """세션의 현재 answers_version (세션 행이 없으면 0)"""
+    session = db.session.get(InterviewSession, session_id) if session_id else None
+    return session.answers_version if session is not None else 0
+
+
+def total_answers_version(user_id) -> int:
+    """사용자의 모든 세션 answers_version 합 (전체 이력 분석용: 어느 세션에 답변이 제출돼도 커짐)"""
+    total = db.session.query(db.func.sum(InterviewSession.answers_version)).filter_by(user_id=user_id).scalar()
+    return int(total or 0)
+
+
+def record_analysis(session_id: Optional[str], result: Dict[str, Any],
+                    version: Optional[int] = None) -> Optional[InterviewSession]:
+    """
+    세션 분석 결과(analysisByLLM / stream_analysis 의 summary)의 총평과 overall_scores 를 저장.
+    version: 분석을 시작할 때의 answers_version. 그 뒤 답변이 다시 제출됐으면 카운터만 갱신하고 None 반환
+    """
+    session = refresh(session_id)
+    if session is None:
+        return None
+    if version is not None and session.answers_version != version:
+        logger.info("Outdated session analysis not recorded", session_id=session_id,
+                    analyzed_version=version, answers_version=session.answers_version)
+        return None
+    session.summary = result.get("summary", "")
+    session.overall_scores = json.dumps(result.get("scores", {}), ensure_ascii=False)
+    if session.answered_count == session.question_count:
+        session.status = "analyzed"
+    logger.debug("Session analysis recorded", session_id=session_id, status=session.status)
+    return session
+
+
+def scores(session: InterviewSession) -> Dict[str, float]:
+    stored = json.loads(session.overall_scores) if session.overall_scores else {}
+    return {key: stored.get(key, 0) for key in SCORE_KEYS}
+
+
+def analysis_result(session: InterviewSession, interviews: List[Interview]) -> Dict[str, Any]:
+    """저장된 세션 분석을 analysisByLLM 결과와 같은 형태로 ({InterviewList, summary, scores})"""
+    return {
+        "InterviewList": build_front_payload(interviews),
+        "summary": session.summary or "",
+        "scores": scores(session),
+    }
+
+
+def to_dict(session: InterviewSession) -> Dict[str, Any]:
+    return {
+        "session_id": session.id,
+        "type": session.type,
+        "status": session.status,
+        "created_at": session.created_at,
+        "question_count": session.question_count,
+        "answered_count": session.answered_count,
+        "analyzed_count": session.analyzed_count,
+        "summary": session.summary,
+        "scores": scores(session) if session.overall_scores else None,
+    }
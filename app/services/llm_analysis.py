@@ -5,37 +5,138 @@
 - LLM 분석(항목별 analysis/score + 전체 summary + overall scores)
 - DB 저장
 - 프론트엔드가 바로 쓰는 응답 포맷(InterviewList, summary, scores)
-- GET /api/interview/analysis?session_id=...  (JWT 필요)
+- GET /api/interview/analysis 는 app/routes/interview.py 에서 분석 작업(analysis_jobs)으로 처리
 """
 
 import os
-import re
 import json
-from typing import Dict, Any, List, Optional
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple
 
 from dotenv import load_dotenv
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-
-from openai import OpenAI
+from flask import current_app
 
 from app import db
-from app.models import Interview
+from app.log import get_logger
+from app.models import Interview, AnalysisCache
+from app.services.structured_output import structured_completion, check_output, stream_structured
 
 load_dotenv()
 
-bp = Blueprint("analysis", __name__)
+logger = get_logger(__name__)
+
+ANALYSIS_MODEL = "gemini-2.0-flash"
+# 프롬프트/스키마를 바꾸면 올려서 이전 캐시가 다시 쓰이지 않도록 함
+PROMPT_VERSION = "3"
+
+# compact: 입력 JSON 최소화 + 출력 항목은 index/analysis/score 만 + 긴 필드 자르기
+# full: 기존 프롬프트 (들여쓰기된 입력, 출력에 question/useranswer/llm_gen_answer 반복)
+ANALYSIS_PROMPT_MODE = os.getenv("ANALYSIS_PROMPT_MODE", "compact")
+# compact 모드에서 입력 필드 하나에 허용하는 대략적인 토큰 수 (0 이면 자르지 않음)
+ANALYSIS_FIELD_TOKEN_BUDGET = int(os.getenv("ANALYSIS_FIELD_TOKEN_BUDGET", "800"))
+
+SYSTEM_PROMPT = (
+    "너는 면접 분석가야. 아래의 질문/사용자답변/이전 LLM답변을 바탕으로 각 항목의 분석과 점수를 작성해."
+    " 반드시 **유효한 JSON만** 출력해. JSON 외 텍스트 절대 금지."
+)
+
+FORMAT_INSTRUCTIONS = {
+    "type": "object",
+    "required": ["items", "summary", "overall_scores"],
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": [
+                    "index", "question", "useranswer", "llm_gen_answer", "analysis", "score"
+                ],
+                "properties": {
+                    "index": {"type": "integer"},
+                    "question": {"type": "string"},
+                    "useranswer": {"type": "string"},
+                    "llm_gen_answer": {"type": "string"},
+                    "analysis": {"type": "string"},
+                    "score": {"type": "number", "minimum": 0, "maximum": 100}
+                }
+            }
+        },
+        "summary": {"type": "string"},
+        "overall_scores": {
+            "type": "object",
+            "required": ["구체성", "논리성", "적합성", "표현력", "전문성"],
+            "properties": {
+                "구체성": {"type": "number", "minimum": 0, "maximum": 100},
+                "논리성": {"type": "number", "minimum": 0, "maximum": 100},
+                "적합성": {"type": "number", "minimum": 0, "maximum": 100},
+                "표현력": {"type": "number", "minimum": 0, "maximum": 100},
+                "전문성": {"type": "number", "minimum": 0, "maximum": 100}
+            }
+        }
+    }
+}
+
+# compact 모드 출력: 입력을 다시 돌려주지 않고 index 로만 매칭
+COMPACT_FORMAT_INSTRUCTIONS = {
+    "type": "object",
+    "required": ["items", "summary", "overall_scores"],
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["index", "analysis", "score"],
+                "properties": {
+                    "index": {"type": "integer"},
+                    "analysis": {"type": "string"},
+                    "score": {"type": "number", "minimum": 0, "maximum": 100}
+                }
+            }
+        },
+        "summary": FORMAT_INSTRUCTIONS["properties"]["summary"],
+        "overall_scores": FORMAT_INSTRUCTIONS["properties"]["overall_scores"]
+    }
+}
+
+# 답변 하나만 분석할 때 (답변 제출 직후 백그라운드)
+ITEM_FORMAT_INSTRUCTIONS = {
+    "type": "object",
+    "required": ["analysis", "score"],
+    "properties": {
+        "analysis": {"type": "string"},
+        "score": {"type": "number", "minimum": 0, "maximum": 100}
+    }
+}
+
+# 항목별 분석이 끝난 세션의 총평만 만들 때
+SUMMARY_FORMAT_INSTRUCTIONS = {
+    "type": "object",
+    "required": ["summary", "overall_scores"],
+    "properties": {
+        "summary": FORMAT_INSTRUCTIONS["properties"]["summary"],
+        "overall_scores": FORMAT_INSTRUCTIONS["properties"]["overall_scores"]
+    }
+}
+
+# 여러 구간의 총평을 하나로 합칠 때 (전체 이력 map-reduce)
+REDUCE_FORMAT_INSTRUCTIONS = {
+    "type": "object",
+    "required": ["summary"],
+    "properties": {
+        "summary": {"type": "string"}
+    }
+}
+
+SCORE_KEYS = ["구체성", "논리성", "적합성", "표현력", "전문성"]
+
+# 분석 전/실패 시 기본값 (이 값이면 아직 분석되지 않은 항목)
+EMPTY_ANALYSIS = ("응답 없음", "분석 결과 없음 (기본값)", "")
+
 
 # -----------------------------
 # 내부 유틸
 # -----------------------------
-def _strip_think(text: str) -> str:
-    """일부 모델이 실수로 넣는 </think> 이전 텍스트를 제거"""
-    if "</think>" in text:
-        return text.split("</think>", 1)[-1]
-    return text
-
-
 def _safe_float(val, default: float = 0.0) -> float:
     try:
         return float(val)
@@ -43,7 +144,7 @@ def _safe_float(val, default: float = 0.0) -> float:
         return default
 
 
-def _build_front_payload(interviews: List[Interview]) -> List[Dict[str, Any]]:
+def build_front_payload(interviews: List[Interview]) -> List[Dict[str, Any]]:
     """
     프론트가 바로 쓰는 InterviewList 아이템으로 변환
     - question
@@ -67,18 +168,10 @@ def _build_front_payload(interviews: List[Interview]) -> List[Dict[str, Any]]:
 
 
 # -----------------------------
-# 핵심 로직
+# 프롬프트 구성 / 응답 파싱
 # -----------------------------
-def analysisByLLM(user_id: int, session_id: Optional[str] = None) -> Dict[str, Any]:
-    """
-    1) 특정 세션 또는 전체 인터뷰 로드
-    2) LLM 호출 (JSON 스키마 강제)
-    3) 항목별 analysis/score 저장, summary/overall_scores 반환
-    4) 프론트 포맷으로 딕셔너리 반환: { InterviewList, summary, scores }
-    """
-    print(f"[Analysis Start] analyzing user_id={user_id}, session_id={session_id}")
-
-    # 1) 인터뷰 로드
+def _load_interviews(user_id, session_id: Optional[str]) -> List[Interview]:
+    """특정 세션 또는 전체 인터뷰 로드"""
     if session_id:
         interviews = (
             Interview.query
@@ -86,26 +179,22 @@ def analysisByLLM(user_id: int, session_id: Optional[str] = None) -> Dict[str, A
             .order_by(Interview.question_order)
             .all()
         )
-        print(f"[Analysis] Found {len(interviews)} interviews for session {session_id}")
+        logger.debug("Interviews loaded", session_id=session_id, count=len(interviews))
     else:
+        # 전체 이력은 최근 ANALYSIS_HISTORY_LIMIT 개까지만 (시간순)
         interviews = (
             Interview.query
             .filter_by(user_id=user_id)
-            .order_by(Interview.timestamp)
+            .order_by(Interview.timestamp.desc(), Interview.id.desc())
+            .limit(current_app.config["ANALYSIS_HISTORY_LIMIT"])
             .all()
         )
-        print(f"[Analysis] Found {len(interviews)} total interviews")
+        interviews.reverse()
+        logger.debug("Interview history loaded", count=len(interviews))
+    return interviews
 
-    if not interviews:
-        return {
-            "InterviewList": [],
-            "summary": "분석할 인터뷰 데이터가 없습니다.",
-            "scores": {
-                "구체성": 0, "논리성": 0, "적합성": 0, "표현력": 0, "전문성": 0
-            }
-        }
 
-    # 2) LLM 프롬프트 구성 (JSON 스키마 강제)
+def _build_payload_items(interviews: List[Interview]) -> List[Dict[str, Any]]:
     payload_items = []
     for idx, itv in enumerate(interviews, start=1):
         payload_items.append({
@@ -114,172 +203,242 @@ def analysisByLLM(user_id: int, session_id: Optional[str] = None) -> Dict[str, A
             "useranswer": getattr(itv, "useranswer", "") or "",
             "llm_gen_answer": getattr(itv, "LLM_gen_answer", "") or ""
         })
+    return payload_items
 
-    system_prompt = (
-        "너는 면접 분석가야. 아래의 질문/사용자답변/이전 LLM답변을 바탕으로 각 항목의 분석과 점수를 작성해."
-        " 반드시 **유효한 JSON만** 출력해. JSON 외 텍스트 절대 금지."
-    )
 
-    format_instructions = {
-        "type": "object",
-        "required": ["items", "summary", "overall_scores"],
-        "properties": {
-            "items": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "required": [
-                        "index", "question", "useranswer", "llm_gen_answer", "analysis", "score"
-                    ],
-                    "properties": {
-                        "index": {"type": "integer"},
-                        "question": {"type": "string"},
-                        "useranswer": {"type": "string"},
-                        "llm_gen_answer": {"type": "string"},
-                        "analysis": {"type": "string"},
-                        "score": {"type": "number", "minimum": 0, "maximum": 100}
-                    }
-                }
-            },
-            "summary": {"type": "string"},
-            "overall_scores": {
-                "type": "object",
-                "required": ["구체성", "논리성", "적합성", "표현력", "전문성"],
-                "properties": {
-                    "구체성": {"type": "number", "minimum": 0, "maximum": 100},
-                    "논리성": {"type": "number", "minimum": 0, "maximum": 100},
-                    "적합성": {"type": "number", "minimum": 0, "maximum": 100},
-                    "표현력": {"type": "number", "minimum": 0, "maximum": 100},
-                    "전문성": {"type": "number", "minimum": 0, "maximum": 100}
-                }
-            }
+def _is_compact(compact: Optional[bool]) -> bool:
+    return ANALYSIS_PROMPT_MODE == "compact" if compact is None else compact
+
+
+def _dumps(obj: Any, compact: bool) -> str:
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def _dumps_schema(schema: Dict[str, Any], compact: bool) -> str:
+    if compact:
+        return json.dumps(schema, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(schema, ensure_ascii=False)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 쓰는 대략적인 토큰 수.
+    ASCII 는 4글자당 1토큰, 한글 등 그 외 문자는 글자당 1토큰으로 계산 (보수적으로 많게 잡음)
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def _truncate_tokens(text: str, budget: int) -> str:
+    """대략 budget 토큰을 넘는 필드는 앞부분만 남기고 자름"""
+    if budget <= 0 or estimate_tokens(text) <= budget:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + " …(이하 생략)"
+
+
+def _compact_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            key: _truncate_tokens(value, ANALYSIS_FIELD_TOKEN_BUDGET) if isinstance(value, str) else value
+            for key, value in item.items()
         }
-    }
+        for item in items
+    ]
+
 
+def _build_messages(payload_items: List[Dict[str, Any]], compact: Optional[bool] = None) -> List[Dict[str, str]]:
+    compact = _is_compact(compact)
+    if compact:
+        payload_items = _compact_items(payload_items)
     user_prompt = (
         "입력 데이터:\n"
-        + json.dumps({"items": payload_items}, ensure_ascii=False, indent=2)
+        + _dumps({"items": payload_items}, compact)
         + "\n\n"
         "요구사항:\n"
         "- 각 항목에 대해 'analysis'(한국어)와 'score'(0~100)를 작성.\n"
         "- 전체 총평은 'summary'에 작성.\n"
         "- 전반 평가를 5개 지표(구체성/논리성/적합성/표현력/전문성)로 0~100 점수화하여 'overall_scores'에 넣을 것.\n"
-        "- 출력은 아래 JSON 스키마를 반드시 따를 것. 다른 텍스트 금지.\n"
-        + json.dumps(format_instructions, ensure_ascii=False)
+        + ("- 'items' 에는 입력을 다시 쓰지 말고 index/analysis/score 만 넣을 것.\n" if compact else "")
+        + "- 출력은 아래 JSON 스키마를 반드시 따를 것. 다른 텍스트 금지.\n"
+        + _dumps_schema(_analysis_schema(len(payload_items), compact), compact)
     )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user",   "content": user_prompt}
+    ]
 
-    client = OpenAI(
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-        api_key=os.getenv("GEMINI_API_KEY"),
+
+def _build_item_messages(item: Dict[str, Any], compact: Optional[bool] = None) -> List[Dict[str, str]]:
+    compact = _is_compact(compact)
+    if compact:
+        item = _compact_items([item])[0]
+    user_prompt = (
+        "입력 데이터:\n"
+        + _dumps(item, compact)
+        + "\n\n"
+        "요구사항:\n"
+        "- 이 항목에 대해 'analysis'(한국어)와 'score'(0~100)를 작성.\n"
+        "- 출력은 아래 JSON 스키마를 반드시 따를 것. 다른 텍스트 금지.\n"
+        + _dumps_schema(ITEM_FORMAT_INSTRUCTIONS, compact)
     )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user",   "content": user_prompt}
+    ]
 
-    response = client.chat.completions.create(
-        model="gemini-2.0-flash",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user",   "content": user_prompt}
-        ],
-        temperature=0.4,
-        top_p=0.95,
+
+def _build_summary_messages(interviews: List[Interview], compact: Optional[bool] = None) -> List[Dict[str, str]]:
+    """항목별 analysis/score 가 이미 있을 때 총평과 overall_scores 만 요청"""
+    scored_items = []
+    for idx, itv in enumerate(interviews, start=1):
+        scored_items.append({
+            "index": idx,
+            "question": itv.question or "",
+            "useranswer": itv.useranswer or "",
+            "analysis": itv.analysis or "",
+            "score": itv.score
+        })
+    compact = _is_compact(compact)
+    if compact:
+        scored_items = _compact_items(scored_items)
+    user_prompt = (
+        "입력 데이터 (항목별 분석 완료):\n"
+        + _dumps({"items": scored_items}, compact)
+        + "\n\n"
+        "요구사항:\n"
+        "- 항목별 분석과 점수를 종합해 전체 총평을 'summary'에 작성.\n"
+        "- 전반 평가를 5개 지표(구체성/논리성/적합성/표현력/전문성)로 0~100 점수화하여 'overall_scores'에 넣을 것.\n"
+        "- 출력은 아래 JSON 스키마를 반드시 따를 것. 다른 텍스트 금지.\n"
+        + _dumps_schema(SUMMARY_FORMAT_INSTRUCTIONS, compact)
     )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user",   "content": user_prompt}
+    ]
 
-    raw = response.choices[0].message.content or ""
-    cleaned = _strip_think(raw).strip()
 
-    # 3) JSON 파싱
-    parsed = None
-    try:
-        parsed = json.loads(cleaned)
-    except Exception:
-        # ```json ... ``` 형태일 경우
-        codeblock = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", cleaned, re.DOTALL | re.IGNORECASE)
-        if codeblock:
-            try:
-                parsed = json.loads(codeblock.group(1))
-            except Exception:
-                parsed = None
+def _is_analyzed(itv: Interview) -> bool:
+    return itv.score is not None and (itv.analysis or "") not in EMPTY_ANALYSIS
 
-    if parsed is None:
-        # ---------- 레거시 백업(정규식) ----------
-        print("[Warn] JSON 파싱 실패 → 레거시 정규식 파싱 시도")
-        analysis_pattern = re.compile(
-            r"(?:\{analysis\}|analysis)\s*:\s*(.+?)(?=(?:\{score\}|score)\s*:|$)",
-            re.IGNORECASE | re.DOTALL
-        )
-        score_pattern = re.compile(
-            r"(?:\{score\}|score)\s*:\s*([0-9]+(?:\.[0-9]+)?)",
-            re.IGNORECASE
-        )
-        summary_pattern = re.compile(
-            r"(?:\{summary\}|summary)\s*:\s*(.+?)(?=\n\n|\Z)",
-            re.IGNORECASE | re.DOTALL
-        )
 
-        analyses = [a.strip() for a in analysis_pattern.findall(cleaned)]
-        scores = [s.strip() for s in score_pattern.findall(cleaned)]
-        summary_matches = summary_pattern.findall(cleaned)
-        summary_text = summary_matches[-1].strip() if summary_matches else ""
+def _analysis_schema(count: int, compact: Optional[bool] = None) -> Dict[str, Any]:
+    """세션 분석 출력 스키마 (items 개수를 입력 항목 수로 고정)"""
+    schema = COMPACT_FORMAT_INSTRUCTIONS if _is_compact(compact) else FORMAT_INSTRUCTIONS
+    items = {**schema["properties"]["items"], "minItems": count, "maxItems": count}
+    return {**schema, "properties": {**schema["properties"], "items": items}}
 
-        use_n = min(len(interviews), len(analyses), len(scores))
-        print(f"[Legacy Parsing] analyses={len(analyses)}, scores={len(scores)}, use={use_n}")
 
-        for i in range(use_n):
-            itv = interviews[i]
-            itv.analysis = analyses[i]
-            itv.score = _safe_float(scores[i], 0.0)
+# -----------------------------
+# 분석 결과 캐시
+# -----------------------------
+def _cache_key(payload_items: List[Dict[str, Any]], model: str, prompt_version: str) -> str:
+    """입력 항목(질문/사용자답변/LLM답변) + 모델 + 프롬프트 버전의 안정적인 해시"""
+    material = json.dumps(
+        {"items": payload_items, "model": model, "prompt_version": prompt_version},
+        ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
 
-        for i in range(use_n, len(interviews)):
-            interviews[i].analysis = "분석 결과 없음 (기본값)"
-            interviews[i].score = 0.0
 
-        db.session.commit()
+def _prompt_version() -> str:
+    """프롬프트 모드/예산이 바뀌면 캐시 키도 바뀌도록 버전에 포함"""
+    if ANALYSIS_PROMPT_MODE == "compact":
+        return f"{PROMPT_VERSION}:compact:{ANALYSIS_FIELD_TOKEN_BUDGET}"
+    return f"{PROMPT_VERSION}:full"
 
-        # overall_scores 대체값(평균점수로 채움)
-        avg = 0.0
-        if interviews:
-            vals = [_safe_float(getattr(itv, "score", 0), 0.0) for itv in interviews]
-            avg = sum(vals) / max(1, len(vals))
-
-        fallback_scores = {
-            "구체성": round(avg, 1),
-            "논리성": round(avg, 1),
-            "적합성": round(avg, 1),
-            "표현력": round(avg, 1),
-            "전문성": round(avg, 1)
-        }
 
-        return {
-            "InterviewList": _build_front_payload(interviews),
-            "summary": summary_text,
-            "scores": fallback_scores
-        }
+def _load_cached(user_id, session_id: Optional[str], key: str) -> Optional[Dict[str, Any]]:
+    row = AnalysisCache.query.filter_by(
+        user_id=user_id, session_id=session_id, content_hash=key
+    ).first()
+    return json.loads(row.result) if row else None
 
-    # ---------- JSON 파싱 성공 ----------
+
+def _store_cached(user_id, session_id: Optional[str], key: str, parsed: Dict[str, Any]) -> None:
+    # 세션당 하나만 유지 (입력이 바뀌면 이전 결과는 더 이상 맞지 않음)
+    AnalysisCache.query.filter_by(user_id=user_id, session_id=session_id).delete(synchronize_session=False)
+    db.session.add(AnalysisCache(
+        user_id=user_id,
+        session_id=session_id,
+        content_hash=key,
+        result=json.dumps(parsed, ensure_ascii=False)
+    ))
+
+
+def invalidate_analysis_cache(user_id, session_id: Optional[str]) -> None:
+    """답변이 다시 제출되면 해당 세션과 전체 이력 분석 캐시를 지움"""
+    AnalysisCache.query.filter(
+        AnalysisCache.user_id == user_id,
+        db.or_(AnalysisCache.session_id == session_id, AnalysisCache.session_id.is_(None))
+    ).delete(synchronize_session=False)
+
+
+def _item_position(item: Any, count: int, seen: Set[int]) -> Optional[int]:
+    """
+    LLM 출력 항목의 index (_build_payload_items 와 같이 1부터)를 interviews 위치로 바꾼다.
+    정수가 아니거나 범위를 벗어났거나 앞에서 이미 나온 index 면 None (그 항목은 버림).
+    스키마 검사(structured_output._type_ok)와 같이 1.0 처럼 정수인 float 는 정수로 본다.
+    """
+    index = item.get("index") if isinstance(item, dict) else None
+    if isinstance(index, float) and index.is_integer():
+        index = int(index)
+    if not isinstance(index, int) or isinstance(index, bool):
+        return None
+    position = index - 1
+    if not 0 <= position < count or position in seen:
+        return None
+    seen.add(position)
+    return position
+
+
+def _match_items(items: List[Any], count: int) -> List[Tuple[int, Dict[str, Any]]]:
+    """출력 items 를 index 로 매칭한 (위치, 항목) 목록 (출력 순서 유지, 같은 index 는 처음 것만)"""
+    seen: Set[int] = set()
+    matched = []
+    for item in items:
+        position = _item_position(item, count, seen)
+        if position is not None:
+            matched.append((position, item))
+    if len(matched) < len(items):
+        logger.warning("Analysis items rejected", items=len(items), matched=len(matched), interviews=count)
+    return matched
+
+
+def _apply_item(itv: Interview, item: Dict[str, Any]) -> None:
+    itv.analysis = (item.get("analysis") or "").strip()
+    itv.score = _safe_float(item.get("score", 0), 0.0)
+
+
+def _apply_parsed(interviews: List[Interview], parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    LLM JSON 결과를 인터뷰에 반영하고 프론트 포맷으로 반환 (commit 은 호출자).
+    항목은 목록 순서가 아니라 index 로 매칭하고, 매칭되는 항목이 없는 인터뷰는 그대로 둔다.
+    """
     items = parsed.get("items", [])
     summary_text = parsed.get("summary", "")
     overall_scores = parsed.get("overall_scores", {})
 
-    save_n = min(len(interviews), len(items))
-    print(f"[JSON Parsed] items={len(items)}, interviews={len(interviews)}, save_count={save_n}")
+    matched = _match_items(items, len(interviews))
+    logger.debug("Analysis parsed", items=len(items), interviews=len(interviews), saved=len(matched))
 
-    for i in range(save_n):
-        itv = interviews[i]
-        item = items[i]
-        itv.analysis = (item.get("analysis") or "").strip()
-        itv.score = _safe_float(item.get("score", 0), 0.0)
-
-    for i in range(save_n, len(interviews)):
-        interviews[i].analysis = "분석 결과 없음 (기본값)"
-        interviews[i].score = 0.0
+    for position, item in matched:
+        _apply_item(interviews[position], item)
 
     # summary를 DB 칼럼에 저장하고 싶다면 여기서 처리 (모델에 summary 필드가 있을 때만)
     # if hasattr(interviews[0], "summary"):
     #     interviews[0].summary = summary_text
 
-    db.session.commit()
-
     return {
-        "InterviewList": _build_front_payload(interviews[:len(items)]),
+        "InterviewList": build_front_payload(interviews),
         "summary": summary_text,
         "scores": {
             # 키가 없거나 숫자가 아니어도 안전하게 0 처리
@@ -293,31 +452,371 @@ def analysisByLLM(user_id: int, session_id: Optional[str] = None) -> Dict[str, A
 
 
 # -----------------------------
-# API 엔드포인트
+# 핵심 로직
 # -----------------------------
-@bp.route("/api/interview/analysis", methods=["GET"])
-@jwt_required()
-def api_interview_analysis():
+def analysisByLLM(user_id: int, session_id: Optional[str] = None) -> Dict[str, Any]:
     """
-    프런트 호출 포인트
-    - Query: session_id (옵션)
-    - Response:
-      {
-        "success": true,
-        "data": {
-          "InterviewList": [...],
-          "summary": "...",
-          "scores": {
-              "구체성": 80, "논리성": 65, "적합성": 75}
-        }
-      }
+    1) 특정 세션 또는 전체 인터뷰 로드
+    2) LLM 호출 (JSON 스키마 강제)
+    3) 항목별 analysis/score 저장, summary/overall_scores 반환
+    4) 프론트 포맷으로 딕셔너리 반환: { InterviewList, summary, scores }
     """
-    user_id = get_jwt_identity()
-    session_id = request.args.get("session_id") or request.args.get("sessionId")
+    logger.info("Analysis started", user_id=user_id, session_id=session_id)
+
+    # 1) 인터뷰 로드
+    interviews = _load_interviews(user_id, session_id)
+
+    if not interviews:
+        return {
+            "InterviewList": [],
+            "summary": "분석할 인터뷰 데이터가 없습니다.",
+            "scores": {
+                "구체성": 0, "논리성": 0, "적합성": 0, "표현력": 0, "전문성": 0
+            }
+        }
+
+    # 2) LLM 프롬프트 구성 (JSON 스키마 강제)
+    payload_items = _build_payload_items(interviews)
+
+    # 입력이 같으면 저장된 결과를 그대로 사용 (LLM 호출 생략)
+    cache_key = _cache_key(payload_items, ANALYSIS_MODEL, _prompt_version())
+    cached = _load_cached(user_id, session_id, cache_key)
+    if cached is not None:
+        logger.info("Analysis cache hit", session_id=session_id, cache_key=cache_key[:12])
+        result = _apply_parsed(interviews, cached)
+        db.session.commit()
+        return result
+
+    # 답변 제출 때 항목별 분석이 이미 끝났으면 총평/overall_scores 만 요청 (작은 프롬프트)
+    if session_id and all(_is_analyzed(itv) for itv in interviews):
+        summary = _summarize_scored(interviews)
+        if summary is not None:
+            parsed = {
+                "items": [
+                    {"index": idx, "analysis": itv.analysis, "score": itv.score}
+                    for idx, itv in enumerate(interviews, start=1)
+                ],
+                "summary": summary.get("summary", ""),
+                "overall_scores": summary.get("overall_scores", {})
+            }
+            result = _apply_parsed(interviews, parsed)
+            _store_cached(user_id, session_id, cache_key, parsed)
+            db.session.commit()
+            return result
+        logger.warning("Summary-only analysis failed, running full analysis", session_id=session_id)
+
+    # 전체 이력은 구간별로 나눠 동시에 분석한 뒤 합침 (프롬프트 크기와 지연 시간이 이력 길이에 비례하지 않도록)
+    if not session_id and len(payload_items) > current_app.config["ANALYSIS_CHUNK_SIZE"]:
+        parsed = _map_reduce_history(
+            payload_items,
+            current_app.config["ANALYSIS_CHUNK_SIZE"],
+            current_app.config["ANALYSIS_MAP_WORKERS"]
+        )
+        if parsed is None:
+            raise RuntimeError("history analysis failed for every chunk")
+        result = _apply_parsed(interviews, parsed)
+        _store_cached(user_id, session_id, cache_key, parsed)
+        db.session.commit()
+        return result
+
+    # 3) 스키마를 강제한 JSON 출력 요청 (검사 실패 시 한 번만 다시 요청)
+    parsed = structured_completion(
+        model=ANALYSIS_MODEL,
+        messages=_build_messages(payload_items),
+        schema=_analysis_schema(len(payload_items)),
+        name="session_analysis",
+        temperature=0.4,
+        top_p=0.95,
+    )
+    if parsed is None:
+        # 예전처럼 정규식으로 건지면 점수가 0으로 저장되므로, 저장하지 않고 작업을 실패로 남김
+        raise RuntimeError("analysis output failed schema validation")
 
+    # ---------- JSON 파싱 성공 ----------
+    result = _apply_parsed(interviews, parsed)
+    _store_cached(user_id, session_id, cache_key, parsed)
+    db.session.commit()
+
+    return result
+
+
+# -----------------------------
+# 전체 이력 map-reduce
+# -----------------------------
+def _analyze_chunk(payload_items: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """구간 하나를 세션 분석과 같은 프롬프트로 분석 (워커 스레드에서 실행, DB 접근 없음)"""
     try:
-        data = analysisByLLM(user_id=user_id, session_id=session_id)
-        return jsonify({"success": True, "data": data})
+        return structured_completion(
+            model=ANALYSIS_MODEL,
+            messages=_build_messages(payload_items),
+            schema=_analysis_schema(len(payload_items)),
+            name="session_analysis",
+            temperature=0.4,
+            top_p=0.95,
+        )
+    except Exception as e:
+        logger.warning("History chunk analysis failed", items=len(payload_items), error=str(e))
+        return None
+
+
+def _merge_summaries(summaries: List[str]) -> str:
+    """여러 구간 총평을 하나로 합침 (워커 스레드에서 실행)"""
+    if len(summaries) == 1:
+        return summaries[0]
+    compact = _is_compact(None)
+    user_prompt = (
+        "입력 데이터 (구간별 총평):\n"
+        + _dumps({"summaries": summaries}, compact)
+        + "\n\n"
+        "요구사항:\n"
+        "- 구간별 총평을 종합해 지원자의 전체 면접 이력에 대한 하나의 총평을 'summary'에 작성.\n"
+        "- 출력은 아래 JSON 스키마를 반드시 따를 것. 다른 텍스트 금지.\n"
+        + _dumps_schema(REDUCE_FORMAT_INSTRUCTIONS, compact)
+    )
+    try:
+        parsed = structured_completion(
+            model=ANALYSIS_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user",   "content": user_prompt}
+            ],
+            schema=REDUCE_FORMAT_INSTRUCTIONS,
+            name="history_summary",
+            temperature=0.4,
+            top_p=0.95,
+        )
     except Exception as e:
-        print("[ERROR] analysis failed:", e)
-        return jsonify({"success": False, "message": str(e)}), 500
+        logger.warning("History summary merge failed", summaries=len(summaries), error=str(e))
+        parsed = None
+    if parsed and parsed.get("summary"):
+        return parsed["summary"]
+    return "\n".join(summaries)
+
+
+def _map_reduce_history(payload_items: List[Dict[str, Any]], chunk_size: int, workers: int) -> Optional[Dict[str, Any]]:
+    """
+    1) map: payload 를 chunk_size 개씩 나눠 최대 workers 개를 동시에 분석
+    2) reduce: overall_scores 는 구간 크기 가중 평균, summary 는 chunk_size 개씩 묶어 LLM 으로 합치기를 반복
+    analysisByLLM 과 같은 {items, summary, overall_scores} 형태를 반환. 모든 구간이 실패하면 None
+    """
+    chunk_size = max(2, chunk_size)
+    offsets = list(range(0, len(payload_items), chunk_size))
+    # 구간마다 index 를 1부터 다시 매김
+    chunks = [
+        [{**item, "index": k} for k, item in enumerate(payload_items[i:i + chunk_size], start=1)]
+        for i in offsets
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks))), thread_name_prefix="analysis-map") as pool:
+        results = list(pool.map(_analyze_chunk, chunks))
+
+    items: List[Dict[str, Any]] = []
+    summaries: List[str] = []
+    score_sums = {key: 0.0 for key in SCORE_KEYS}
+    weight = 0
+    for offset, chunk, parsed in zip(offsets, chunks, results):
+        if parsed is None:
+            continue
+        # 구간 안의 index 를 전체 index 로 바꿈 (실패했거나 빠진 항목은 없는 채로 두어 그 인터뷰는 그대로 남음)
+        items.extend(
+            {**item, "index": offset + position + 1}
+            for position, item in _match_items(parsed.get("items", []), len(chunk))
+        )
+        summaries.append(parsed.get("summary", ""))
+        overall_scores = parsed.get("overall_scores", {})
+        for key in SCORE_KEYS:
+            score_sums[key] += _safe_float(overall_scores.get(key, 0), 0.0) * len(chunk)
+        weight += len(chunk)
+
+    logger.info("History chunks analyzed", chunks=len(chunks), succeeded=len(summaries))
+    if weight == 0:
+        return None
+
+    while len(summaries) > 1:
+        groups = [summaries[i:i + chunk_size] for i in range(0, len(summaries), chunk_size)]
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(groups))), thread_name_prefix="analysis-reduce") as pool:
+            summaries = list(pool.map(_merge_summaries, groups))
+
+    return {
+        "items": items,
+        "summary": summaries[0],
+        "overall_scores": {key: round(score_sums[key] / weight, 1) for key in SCORE_KEYS}
+    }
+
+
+# -----------------------------
+# 답변 단위 분석
+# -----------------------------
+def _summarize_scored(interviews: List[Interview]) -> Optional[Dict[str, Any]]:
+    return structured_completion(
+        model=ANALYSIS_MODEL,
+        messages=_build_summary_messages(interviews),
+        schema=SUMMARY_FORMAT_INSTRUCTIONS,
+        name="session_summary",
+        temperature=0.4,
+        top_p=0.95,
+    )
+
+
+def analyze_answer(interview_id: int) -> bool:
+    """
+    답변 하나의 analysis/score 를 작성해서 저장 (답변 제출 직후 백그라운드에서 실행).
+    세션 마지막에는 analysisByLLM 이 이 결과를 모아 총평만 만든다.
+    분석 도중 답변이 다시 제출됐으면 저장하지 않는다. 저장했으면 True.
+    """
+    itv = db.session.get(Interview, interview_id)
+    if itv is None:
+        return False
+    answer = itv.useranswer
+    item = {
+        "question": itv.question or "",
+        "useranswer": answer or "",
+        "llm_gen_answer": itv.LLM_gen_answer or ""
+    }
+
+    parsed = structured_completion(
+        model=ANALYSIS_MODEL,
+        messages=_build_item_messages(item),
+        schema=ITEM_FORMAT_INSTRUCTIONS,
+        name="answer_analysis",
+        temperature=0.4,
+        top_p=0.95,
+    )
+    if parsed is None:
+        logger.warning("Answer analysis returned no valid JSON", interview_id=interview_id)
+        return False
+
+    db.session.refresh(itv)
+    if itv.useranswer != answer:
+        logger.info("Answer changed during analysis, result dropped", interview_id=interview_id)
+        return False
+
+    itv.analysis = (parsed.get("analysis") or "").strip()
+    itv.score = _safe_float(parsed.get("score", 0), 0.0)
+    db.session.commit()
+    logger.info("Answer analyzed", interview_id=interview_id, score=itv.score)
+    return True
+
+
+# -----------------------------
+# 스트리밍 분석
+# -----------------------------
+class _ItemStreamParser:
+    """
+    스트리밍으로 들어오는 JSON 텍스트에서 items 배열의 원소가 완성되는 대로 꺼낸다.
+    최상위 객체 바로 아래 배열 안의 객체(= items 원소)만 대상으로 하며,
+    문자열 안의 괄호와 이스케이프는 무시한다. 첫 '{' 앞의 텍스트(```json 등)는 건너뛴다.
+    delta 는 한 번씩만 훑고, 받은 텍스트는 조각 목록으로 모아 두었다가 text 를 읽을 때 합친다
+    (누적 문자열에 += 하면 delta 마다 전체를 복사해서 긴 응답에서 느려짐).
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        # 완성 중인 items 원소의 이전 delta 조각들 (원소 밖이면 None)
+        self._item_parts: Optional[List[str]] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, delta: str) -> List[Dict[str, Any]]:
+        self._chunks.append(delta)
+        items = []
+        # 이 delta 안에서 현재 원소가 시작된 위치
+        item_start = 0 if self._item_parts is not None else None
+        for pos, ch in enumerate(delta):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"' and self._stack:
+                self._in_string = True
+            elif ch in "{[":
+                if ch == "{" and self._stack == ["{", "["]:
+                    self._item_parts = []
+                    item_start = pos
+                self._stack.append(ch)
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                if ch == "}" and self._item_parts is not None and self._stack == ["{", "["]:
+                    try:
+                        items.append(json.loads("".join(self._item_parts) + delta[item_start:pos + 1]))
+                    except ValueError:
+                        pass
+                    self._item_parts = None
+                    item_start = None
+        if self._item_parts is not None:
+            self._item_parts.append(delta[item_start:])
+        return items
+
+
+def _item_event(position: int, itv: Interview) -> Dict[str, Any]:
+    return {
+        "index": position + 1,
+        "question_order": itv.question_order,
+        "analysis": itv.analysis,
+        "score": itv.score,
+    }
+
+
+def stream_analysis(user_id, session_id: str):
+    """
+    analysisByLLM 의 스트리밍 버전 (세션 단위).
+    항목 하나의 analysis/score 가 완성될 때마다 바로 DB에 커밋하고 ("item", {...}) 를 yield,
+    마지막에 summary/overall_scores 가 포함된 전체 결과를 ("summary", {...}) 로 yield 한다.
+    스트림이 중간에 실패해도 이미 커밋된 항목은 남는다.
+    """
+    interviews = _load_interviews(user_id, session_id)
+    if not interviews:
+        raise ValueError("No interviews found for this session")
+
+    payload_items = _build_payload_items(interviews)
+    cache_key = _cache_key(payload_items, ANALYSIS_MODEL, _prompt_version())
+    cached = _load_cached(user_id, session_id, cache_key)
+    if cached is not None:
+        logger.info("Analysis cache hit", session_id=session_id, cache_key=cache_key[:12])
+        result = _apply_parsed(interviews, cached)
+        db.session.commit()
+        for position, _ in _match_items(cached.get("items", []), len(interviews)):
+            yield "item", _item_event(position, interviews[position])
+        yield "summary", result
+        return
+
+    schema = _analysis_schema(len(payload_items))
+    parser = _ItemStreamParser()
+    seen: Set[int] = set()
+    for delta in stream_structured(
+        model=ANALYSIS_MODEL,
+        messages=_build_messages(payload_items),
+        name="session_analysis",
+        schema=schema,
+        temperature=0.4,
+        top_p=0.95,
+    ):
+        for item in parser.feed(delta):
+            # _apply_parsed 와 같이 index 로 매칭 (범위 밖이거나 이미 받은 index 는 버림)
+            position = _item_position(item, len(interviews), seen)
+            if position is None:
+                logger.warning("Analysis stream item rejected", session_id=session_id, index=item.get("index"))
+                continue
+            itv = interviews[position]
+            _apply_item(itv, item)
+            db.session.commit()
+            yield "item", _item_event(position, itv)
+
+    # 이미 내보낸 항목은 되돌릴 수 없으므로 스트리밍은 다시 요청하지 않음
+    parsed = check_output(ANALYSIS_MODEL, parser.text, schema)
+    if parsed is None:
+        raise ValueError(f"analysis stream ended without valid JSON ({len(seen)} items saved)")
+
+    result = _apply_parsed(interviews, parsed)
+    _store_cached(user_id, session_id, cache_key, parsed)
+    db.session.commit()
+    yield "summary", result
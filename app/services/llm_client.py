@@ -0,0 +1,264 @@
+"""
+공용 LLM 클라이언트
+- 프로세스당 하나의 OpenAI 호환 클라이언트를 재사용 (커넥션 풀 / keep-alive / TLS 세션 재사용)
+- 호출마다 전체 제한 시간(deadline) 적용
+- 일시적 오류(타임아웃, 연결 오류, 429, 5xx)는 지터를 섞은 지수 백오프로 제한된 횟수만 재시도
+- 프로세스 전체 동시 호출 수 제한
+- 모델별 지연 시간/토큰/오류/재시도 수를 app.metrics 에 기록 (프로파일링 중인 요청이면 app.profiling 에도)
+- async_chat_completion: ASGI 모드(app/asgi.py)에서 이벤트 루프 위에서 기다리는 버전 (AsyncOpenAI, 스레드를 점유하지 않음)
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from openai import OpenAI, AsyncOpenAI, APITimeoutError, APIConnectionError, RateLimitError, InternalServerError
+
+from app import metrics, profiling
+from app.log import get_logger
+
+load_dotenv()
+
+logger = get_logger(__name__)
+
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))  # 호출 하나의 전체 제한 시간 (재시도 포함, 초)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+# async 호출은 기다리는 동안 스레드를 쓰지 않으므로 동시 호출 수를 따로 크게 둠 (제공자 rate limit 에 맞춰 조정)
+LLM_ASYNC_MAX_CONCURRENCY = int(os.getenv("LLM_ASYNC_MAX_CONCURRENCY", "256"))
+
+# 재시도해도 되는 오류 (요청 자체가 잘못된 4xx 는 제외)
+TRANSIENT_ERRORS = (APITimeoutError, APIConnectionError, RateLimitError, InternalServerError)
+
+_lock = threading.Lock()
+_client: Optional[OpenAI] = None
+_client_pid: Optional[int] = None
+_semaphore = threading.BoundedSemaphore(max(1, LLM_MAX_CONCURRENCY))
+# 이벤트 루프 → (AsyncOpenAI, asyncio.Semaphore). httpx 연결은 만든 루프에서만 쓸 수 있으므로 루프마다 따로 만든다
+_async_state: Dict[asyncio.AbstractEventLoop, Any] = {}
+
+
+class LLMBusyError(RuntimeError):
+    """동시 호출 제한 때문에 제한 시간 안에 호출을 시작하지 못함"""
+
+
+def get_client() -> OpenAI:
+    """프로세스 공용 클라이언트 (fork 된 워커에서는 커넥션을 공유하지 않도록 새로 만든다)"""
+    global _client, _client_pid
+    with _lock:
+        pid = os.getpid()
+        if _client is None or _client_pid != pid:
+            _client = OpenAI(
+                base_url=LLM_BASE_URL,
+                api_key=os.getenv("GEMINI_API_KEY"),
+                timeout=LLM_TIMEOUT,
+                max_retries=0,  # 재시도는 아래에서 직접 처리
+            )
+            _client_pid = pid
+        return _client
+
+
+def _get_async_state():
+    """현재 이벤트 루프의 공용 AsyncOpenAI 클라이언트와 동시 호출 제한"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        state = _async_state.get(loop)
+        if state is None:
+            for closed in [l for l in _async_state if l.is_closed()]:
+                del _async_state[closed]
+            state = _async_state[loop] = (
+                AsyncOpenAI(
+                    base_url=LLM_BASE_URL,
+                    api_key=os.getenv("GEMINI_API_KEY"),
+                    timeout=LLM_TIMEOUT,
+                    max_retries=0,
+                ),
+                asyncio.Semaphore(max(1, LLM_ASYNC_MAX_CONCURRENCY)),
+            )
+        return state
+
+
+def _backoff(attempt: int) -> float:
+    """full jitter: 0 ~ min(MAX, BASE * 2^attempt)"""
+    return random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+def chat_completion(model: str, messages: List[Dict[str, Any]], timeout: Optional[float] = None, **kwargs):
+    """
+    chat.completions.create 래퍼.
+    timeout 은 재시도와 대기 시간을 모두 포함한 전체 제한 시간 (기본 LLM_TIMEOUT).
+    """
+    deadline = time.monotonic() + (timeout or LLM_TIMEOUT)
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if not _semaphore.acquire(timeout=max(0, remaining)):
+            metrics.LLM_ERRORS.inc(model, "LLMBusyError")
+            metrics.LLM_REQUESTS.inc(model, "false", "error")
+            raise LLMBusyError(f"LLM concurrency limit ({LLM_MAX_CONCURRENCY}) wait timed out")
+        started = time.perf_counter()
+        error = None
+        try:
+            remaining = max(0.1, deadline - time.monotonic())
+            response = get_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=remaining,
+                **kwargs
+            )
+            metrics.LLM_REQUESTS.inc(model, "false", "ok")
+            metrics.record_llm_usage(model, getattr(response, "usage", None))
+            return response
+        except TRANSIENT_ERRORS as e:
+            error = type(e).__name__
+            metrics.LLM_ERRORS.inc(model, error)
+            delay = _backoff(attempt)
+            if attempt >= LLM_MAX_RETRIES or time.monotonic() + delay >= deadline:
+                metrics.LLM_REQUESTS.inc(model, "false", "error")
+                raise
+            metrics.LLM_RETRIES.inc(model)
+            logger.warning("LLM call retry", model=model, error=error, attempt=attempt + 1,
+                           max_retries=LLM_MAX_RETRIES, delay=round(delay, 2))
+        except Exception as e:
+            error = type(e).__name__
+            metrics.LLM_ERRORS.inc(model, error)
+            metrics.LLM_REQUESTS.inc(model, "false", "error")
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.LLM_LATENCY.observe(elapsed, model, "false")
+            profiling.record_llm_call(model, False, elapsed, error)
+            _semaphore.release()
+
+        time.sleep(delay)
+        attempt += 1
+
+
+async def async_chat_completion(model: str, messages: List[Dict[str, Any]], timeout: Optional[float] = None, **kwargs):
+    """chat_completion 의 async 버전 (제한 시간/재시도/메트릭 동일, 동시 호출 제한은 LLM_ASYNC_MAX_CONCURRENCY)"""
+    client, semaphore = _get_async_state()
+    deadline = time.monotonic() + (timeout or LLM_TIMEOUT)
+    attempt = 0
+    while True:
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=max(0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            metrics.LLM_ERRORS.inc(model, "LLMBusyError")
+            metrics.LLM_REQUESTS.inc(model, "false", "error")
+            raise LLMBusyError(f"LLM async concurrency limit ({LLM_ASYNC_MAX_CONCURRENCY}) wait timed out")
+        started = time.perf_counter()
+        error = None
+        try:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=max(0.1, deadline - time.monotonic()),
+                **kwargs
+            )
+            metrics.LLM_REQUESTS.inc(model, "false", "ok")
+            metrics.record_llm_usage(model, getattr(response, "usage", None))
+            return response
+        except TRANSIENT_ERRORS as e:
+            error = type(e).__name__
+            metrics.LLM_ERRORS.inc(model, error)
+            delay = _backoff(attempt)
+            if attempt >= LLM_MAX_RETRIES or time.monotonic() + delay >= deadline:
+                metrics.LLM_REQUESTS.inc(model, "false", "error")
+                raise
+            metrics.LLM_RETRIES.inc(model)
+            logger.warning("LLM call retry", model=model, error=error, attempt=attempt + 1,
+                           max_retries=LLM_MAX_RETRIES, delay=round(delay, 2))
+        except asyncio.CancelledError:
+            error = "cancelled"
+            metrics.LLM_REQUESTS.inc(model, "false", "cancelled")
+            raise
+        except Exception as e:
+            error = type(e).__name__
+            metrics.LLM_ERRORS.inc(model, error)
+            metrics.LLM_REQUESTS.inc(model, "false", "error")
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.LLM_LATENCY.observe(elapsed, model, "false")
+            profiling.record_llm_call(model, False, elapsed, error)
+            semaphore.release()
+
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def stream_chat_completion(model: str, messages: List[Dict[str, Any]], timeout: Optional[float] = None, **kwargs):
+    """
+    chat_completion 의 스트리밍 버전. 응답 텍스트 조각(delta)을 받는 대로 yield 한다.
+    첫 조각을 받기 전의 일시적 오류만 재시도한다 (이미 내보낸 조각은 되돌릴 수 없으므로).
+    """
+    deadline = time.monotonic() + (timeout or LLM_TIMEOUT)
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if not _semaphore.acquire(timeout=max(0, remaining)):
+            metrics.LLM_ERRORS.inc(model, "LLMBusyError")
+            metrics.LLM_REQUESTS.inc(model, "true", "error")
+            raise LLMBusyError(f"LLM concurrency limit ({LLM_MAX_CONCURRENCY}) wait timed out")
+        started = False
+        stream = None
+        begin = time.perf_counter()
+        error = None
+        try:
+            stream = get_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=max(0.1, deadline - time.monotonic()),
+                stream=True,
+                **kwargs
+            )
+            for chunk in stream:
+                # stream_options={"include_usage": True} 를 지원하는 제공자는 마지막 청크에 usage 를 보냄
+                metrics.record_llm_usage(model, getattr(chunk, "usage", None))
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if not started:
+                        metrics.LLM_FIRST_TOKEN.observe(time.perf_counter() - begin, model)
+                    started = True
+                    yield delta
+            metrics.LLM_REQUESTS.inc(model, "true", "ok")
+            return
+        except TRANSIENT_ERRORS as e:
+            error = type(e).__name__
+            metrics.LLM_ERRORS.inc(model, error)
+            delay = _backoff(attempt)
+            if started or attempt >= LLM_MAX_RETRIES or time.monotonic() + delay >= deadline:
+                metrics.LLM_REQUESTS.inc(model, "true", "error")
+                raise
+            metrics.LLM_RETRIES.inc(model)
+            logger.warning("LLM stream retry", model=model, error=error, attempt=attempt + 1,
+                           max_retries=LLM_MAX_RETRIES, delay=round(delay, 2))
+        except GeneratorExit:
+            error = "cancelled"
+            metrics.LLM_REQUESTS.inc(model, "true", "cancelled")
+            raise
+        except Exception as e:
+            error = type(e).__name__
+            metrics.LLM_ERRORS.inc(model, error)
+            metrics.LLM_REQUESTS.inc(model, "true", "error")
+            raise
+        finally:
+            elapsed = time.perf_counter() - begin
+            metrics.LLM_LATENCY.observe(elapsed, model, "true")
+            profiling.record_llm_call(model, True, elapsed, error)
+            # 소비자가 중간에 멈춰도(GeneratorExit) 연결과 동시 호출 슬롯을 돌려줌
+            if stream is not None:
+                stream.close()
+            _semaphore.release()
+
+        time.sleep(delay)
+        attempt += 1
@@ -1,20 +1,14 @@
-from openai import OpenAI
-import os
-from dotenv import load_dotenv
+import json
 
-load_dotenv()
+from app.log import get_logger, payload
+from app.services.llm_client import stream_chat_completion
+from app.services.structured_output import structured_completion, async_structured_completion
 
-def generate_question():
-    client = OpenAI(
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-        api_key=os.getenv("GEMINI_API_KEY"),
-    )
-
-    resp = client.chat.completions.create(
-        model="gemini-2.5-flash",
-        messages=[
-            {"role": "system", "content":
-             """
+logger = get_logger(__name__)
+
+QUESTION_MODEL = "gemini-2.5-flash"
+
+QUESTION_SYSTEM_PROMPT = """
 너는 서울대학교병원 수간호사 면접관이야. 나는 신규 간호사의 뛰어난 문제 해결 능력과 간호사로써 가져야하는 질병에대한 이해 응급상황대처 능력을 중요하게 생각해.\n\n
 
 간호사 채용을 위해 다음 세 가지 유형의 질문을 섞어 총 3개의 질문을 해 줘.\n
@@ -26,60 +20,133 @@ def generate_question():
 - **전문지식 질문에 대한 답:** 관련 의학 지식, 간호 프로토콜 및 구체적인 행동 계획이 포함되어야 해.\n
 - **인성/상황 질문에 대한 답:** 상황, 과제, 행동, 결과를 활용하여 구체적인 경험을 바탕으로 지원자가 구술 하듯 설명하고, 지원자의 책임감과 윤리 의식이 드러나도록 작성해 줘.\n
 
-출력 형식은 다음과 같아야 해:"""
-             "면접 질문 1: ...\n모범 답 1: ...\n\n면접 질문 2: ...\n모범 답 2: ...\n\n면접 질문 3: ...\n모범 답 3: ...\n\n"
-             "<think> 같은 내부 지시는 절대 출력하지 말고 전부 한국어로 출력해."},
-            {"role": "user", "content": "주제: .. "}
-        ],
+"""
+
+# 스트리밍(stream_questions) 용: 줄 단위로 바로 파싱할 수 있는 텍스트 형식
+QUESTION_MESSAGES = [
+    {"role": "system", "content":
+     QUESTION_SYSTEM_PROMPT
+     + "출력 형식은 다음과 같아야 해:"
+     "면접 질문 1: ...\n모범 답 1: ...\n\n면접 질문 2: ...\n모범 답 2: ...\n\n면접 질문 3: ...\n모범 답 3: ...\n\n"
+     "<think> 같은 내부 지시는 절대 출력하지 말고 전부 한국어로 출력해."},
+    {"role": "user", "content": "주제: .. "}
+]
+
+QUESTION_FORMAT_INSTRUCTIONS = {
+    "type": "object",
+    "required": ["questions"],
+    "properties": {
+        "questions": {
+            "type": "array",
+            "minItems": 3,
+            "maxItems": 3,
+            "items": {
+                "type": "object",
+                "required": ["question", "answer"],
+                "properties": {
+                    "question": {"type": "string", "minLength": 1},
+                    "answer": {"type": "string", "minLength": 1}
+                }
+            }
+        }
+    }
+}
+
+# generate_question 용: 스키마를 강제한 JSON 출력
+QUESTION_JSON_MESSAGES = [
+    {"role": "system", "content":
+     QUESTION_SYSTEM_PROMPT
+     + "질문과 모범 답은 'questions' 배열에 순서대로 넣고, 반드시 **유효한 JSON만** 출력해. 전부 한국어로 출력해.\n"
+     "출력은 아래 JSON 스키마를 반드시 따를 것:\n"
+     + json.dumps(QUESTION_FORMAT_INSTRUCTIONS, ensure_ascii=False)},
+    {"role": "user", "content": "주제: .. "}
+]
+
+QUESTION_COMPLETION_ARGS = dict(
+    model=QUESTION_MODEL,
+    messages=QUESTION_JSON_MESSAGES,
+    schema=QUESTION_FORMAT_INSTRUCTIONS,
+    name="interview_questions",
+    temperature=0.7, top_p=0.9,
+)
+
+def generate_question():
+    return _question_list(structured_completion(**QUESTION_COMPLETION_ARGS))
+
+async def async_generate_question():
+    """generate_question 의 async 버전 (ASGI 모드에서 이벤트 루프 위에서 기다림)"""
+    return _question_list(await async_structured_completion(**QUESTION_COMPLETION_ARGS))
+
+def _question_list(parsed):
+    """
+    스키마 검사를 통과한 출력을 질문 세트로. 재시도 후에도 실패했으면 빈 목록
+    (자리표시 질문을 저장하지 않고 호출한 라우트가 생성 실패 응답을 보냄)
+    """
+    if parsed is None:
+        logger.warning("Question generation failed")
+        return []
+    questionList = []
+    for q in parsed["questions"][:3]:
+        questionList.append({
+            "question": q["question"].strip(),
+            "answer": q["answer"].strip(),
+            "type": "간호사"
+        })
+
+    logger.debug("Parsed question list", count=len(questionList), questions=payload(questionList))
+    return questionList
+
+
+def stream_questions():
+    """
+    generate_question 의 스트리밍 버전.
+    LLM 응답을 받는 대로 줄 단위로 파싱해서 "면접 질문 N:" 다음의 "모범 답 N:" 줄이
+    끝나는 순간 그 질문을 바로 yield 한다 (최대 3개, 형식은 generate_question 과 동일).
+    """
+    buffer = ""
+    in_think = False
+    pending_question = None
+    count = 0
+
+    def handle_line(line):
+        nonlocal in_think, pending_question
+        # <think> ... </think> 구간은 무시
+        if "<think>" in line:
+            in_think = True
+        if "</think>" in line:
+            in_think = False
+            line = line.split("</think>", 1)[1]
+        if in_think:
+            return None
+
+        if line.startswith("면접 질문"):
+            pending_question = line.split(":", 1)[1].strip() if ":" in line else ""
+        elif line.startswith("모범 답") and pending_question is not None:
+            answer = line.split(":", 1)[1].strip() if ":" in line else ""
+            item = {"question": pending_question, "answer": answer, "type": "간호사"}
+            pending_question = None
+            return item
+        return None
+
+    for delta in stream_chat_completion(
+        model=QUESTION_MODEL,
+        messages=QUESTION_MESSAGES,
         temperature=0.7, top_p=0.9,
-    )
-
-    message = resp.choices[0].message.content
- 
-    message = message.split("</think>")[1] if "</think>" in message else message
-
-    try:
-        lines = message.strip().split('\n')
-        questions = []
-        answers = []
-        
-        # 3개의 질문과 답변을 파싱
+    ):
+        buffer += delta
+        # 줄바꿈이 들어온 경우에만 나눔 (긴 줄을 delta 마다 다시 나누면 줄 길이의 제곱만큼 복사하게 됨)
+        if "\n" not in delta:
+            continue
+        # 완성된 줄만 처리하고 마지막 미완성 줄은 버퍼에 남김
+        *lines, buffer = buffer.split("\n")
         for line in lines:
-            # 면접 질문 1, 2, 3 패턴 매칭
-            if line.startswith("면접 질문"):
-                question = line.split(":", 1)[1].strip() if ":" in line else ""
-                questions.append(question)
-            # 생성한 답 1, 2, 3 패턴 매칭
-            elif line.startswith("모범 답"):
-                answer = line.split(":", 1)[1].strip() if ":" in line else ""
-                answers.append(answer)
-
-        # 질문과 답변이 3개씩 있는지 확인하고 questionList 생성
-        questionList = []
-        for i in range(min(len(questions), len(answers), 3)):  # 최대 3개까지만
-            questionList.append({
-                "question": questions[i],
-                "answer": answers[i],
-                "type": "간호사"
-            })
-        
-        # 만약 3개 미만이면 기본값으로 채우기
-        while len(questionList) < 3:
-            questionList.append({
-                "question": f"질문 {len(questionList) + 1} 생성 실패",
-                "answer": "답변 생성 실패",
-                "type": "간호사"
-            })
-        
-    except Exception as e:
-        print(f"파싱 오류: {e}")
-        questionList = []
-        for i in range(3):
-            questionList.append({
-                "question": f"Parsing failed - Question {i + 1}",
-                "answer": f"Parsing failed - Answer {i + 1}",
-                "type": "None"
-            })
-
-    print(f"Parsed Question List: {questionList}")
-    return questionList
+            item = handle_line(line)
+            if item:
+                count += 1
+                yield item
+                if count >= 3:
+                    return
+
+    item = handle_line(buffer)
+    if item and count < 3:
+        yield item
@@ -0,0 +1,285 @@
+"""
+면접 질문 풀
+- generate_question() 결과(질문 세트)를 DB(QuestionSet)에 미리 쌓아 둔다
+- /api/interview/start 는 풀에서 세트 하나를 꺼내기만 하고 LLM을 기다리지 않는다
+- 풀이 LOW_WATER 밑으로 내려가면 백그라운드 스레드가 TARGET 까지 다시 채운다
+- 생성 중인 개수는 DB(QuestionPoolState)에 예약해 두므로 워커 프로세스가 여러 개여도 TARGET 을 넘게 채우지 않는다
+"""
+
+import os
+import json
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from flask import current_app
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db, metrics
+from app.log import get_logger
+from app.models import QuestionSet, QuestionPoolState
+from app.services.llm_service import generate_question
+
+logger = get_logger(__name__)
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_started_pid: Optional[int] = None
+
+_stats = {
+    "hits": 0,       # 풀에서 바로 꺼낸 횟수
+    "misses": 0,     # 풀이 비어 LLM을 직접 호출한 횟수
+    "generated": 0,  # 리필로 풀에 넣은 세트 수
+    "failed": 0,     # 리필 중 생성 실패 수
+}
+
+
+def _get_executor(app) -> ThreadPoolExecutor:
+    """프로세스마다 하나의 리필 스레드 풀 (fork 이후에는 새로 만든다)"""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, app.config["QUESTION_POOL_REFILL_WORKERS"]),
+            thread_name_prefix="question-pool",
+        )
+        _executor_pid = pid
+    return _executor
+
+
+def _is_complete(questionList: List[Dict[str, Any]]) -> bool:
+    """생성에 실패한 빈 세트나 기본값이 섞인 세트는 풀에 넣지 않는다"""
+    if not questionList:
+        return False
+    for q in questionList:
+        if q.get("type") == "None" or "생성 실패" in q.get("question", ""):
+            return False
+    return True
+
+
+def _refill_one(app) -> None:
+    with app.app_context():
+        try:
+            questionList = generate_question()
+            if not _is_complete(questionList):
+                with _lock:
+                    _stats["failed"] += 1
+                return
+            db.session.add(QuestionSet(payload=json.dumps(questionList, ensure_ascii=False)))
+            db.session.commit()
+            with _lock:
+                _stats["generated"] += 1
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("Question pool refill failed", error=str(e))
+            with _lock:
+                _stats["failed"] += 1
+        finally:
+            _release_reservation()
+
+
+def pool_size() -> int:
+    return QuestionSet.query.count()
+
+
+def _live_pending(row, ttl: int) -> int:
+    """TTL 동안 진행(예약/완료)이 없던 예약은 생성하던 프로세스가 죽은 것으로 보고 0 으로 본다"""
+    if not row.pending:
+        return 0
+    if row.updated_at is None or row.updated_at < datetime.datetime.utcnow() - datetime.timedelta(seconds=ttl):
+        return 0
+    return row.pending
+
+
+def _read_state():
+    state = QuestionPoolState.__table__
+    query = select(state.c.pending, state.c.version, state.c.updated_at).where(state.c.id == 1)
+    row = db.session.execute(query).first()
+    if row is None:
+        # 마이그레이션이 만들어 두지만, 없으면 여기서 만든다 (동시에 만들면 한쪽은 IntegrityError)
+        try:
+            db.session.add(QuestionPoolState(id=1, pending=0, version=0))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+        row = db.session.execute(query).first()
+    return row
+
+
+def refilling() -> int:
+    """모든 프로세스에서 생성 중인 질문 세트 수"""
+    row = _read_state()
+    return _live_pending(row, current_app.config["QUESTION_POOL_RESERVATION_TTL"])
+
+
+def _reserve(app, size: int) -> int:
+    """
+    TARGET 까지 모자란 개수를 QuestionPoolState.pending 에 예약하고 예약한 개수를 반환한다.
+    version 이 읽은 값과 같을 때만 UPDATE 하므로 여러 프로세스가 동시에 불러도 한 곳만 예약에 성공하고,
+    실패한 쪽은 바뀐 pending 을 다시 읽어 계산한다.
+    """
+    state = QuestionPoolState.__table__
+    for _ in range(3):
+        row = _read_state()
+        pending = _live_pending(row, app.config["QUESTION_POOL_RESERVATION_TTL"])
+        if size + pending >= app.config["QUESTION_POOL_LOW_WATER"]:
+            return 0
+        need = app.config["QUESTION_POOL_TARGET"] - size - pending
+        if need <= 0:
+            return 0
+        result = db.session.execute(
+            update(state)
+            .where(state.c.id == 1, state.c.version == row.version)
+            .values(pending=pending + need, version=row.version + 1, updated_at=datetime.datetime.utcnow())
+        )
+        db.session.commit()
+        if result.rowcount:
+            return need
+    return 0
+
+
+def _release_reservation() -> None:
+    """생성 작업 하나가 끝나면 (성공/실패 모두) 예약을 하나 줄인다"""
+    state = QuestionPoolState.__table__
+    try:
+        db.session.execute(
+            update(state)
+            .where(state.c.id == 1, state.c.pending > 0)
+            .values(pending=state.c.pending - 1, version=state.c.version + 1,
+                    updated_at=datetime.datetime.utcnow())
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        # 줄이지 못한 예약은 QUESTION_POOL_RESERVATION_TTL 뒤에 무시된다
+        logger.warning("Question pool reservation release failed", error=str(e))
+
+
+def request_refill(app) -> int:
+    """
+    풀 크기가 LOW_WATER 미만이면 TARGET 까지 채우도록 생성 작업을 예약한다.
+    다른 프로세스가 진행 중인 생성 작업 수도 DB 예약으로 함께 계산하므로 중복 예약되지 않는다.
+    예약한 작업 수를 반환.
+    """
+    size = pool_size()
+    need = _reserve(app, size)
+    if not need:
+        return 0
+
+    executor = _get_executor(app)
+    for _ in range(need):
+        executor.submit(_refill_one, app)
+    logger.info("Question pool refill scheduled", size=size, scheduled=need)
+    return need
+
+
+def pop_question_set() -> Optional[List[Dict[str, Any]]]:
+    """가장 오래된 질문 세트를 꺼내고 삭제한다. 풀이 비어 있으면 None"""
+    for _ in range(3):
+        row = QuestionSet.query.order_by(QuestionSet.id).first()
+        if row is None:
+            return None
+        payload = row.payload
+        # 다른 워커가 먼저 꺼냈다면 삭제 건수가 0 → 다음 세트로 재시도
+        deleted = QuestionSet.query.filter_by(id=row.id).delete(synchronize_session=False)
+        db.session.commit()
+        if deleted:
+            return json.loads(payload)
+    return None
+
+
+def take_pooled_question_list() -> Optional[List[Dict[str, Any]]]:
+    """
+    풀에서 질문 세트를 꺼내고 hit/miss 를 기록한 뒤 필요하면 리필을 예약한다.
+    풀이 꺼져 있거나 비어 있으면 None (호출자가 LLM 을 직접 호출).
+    """
+    app = current_app._get_current_object()
+    if not app.config["QUESTION_POOL_ENABLED"]:
+        return None
+
+    questionList = pop_question_set()
+    with _lock:
+        if questionList:
+            _stats["hits"] += 1
+        else:
+            _stats["misses"] += 1
+
+    request_refill(app)
+    return questionList
+
+
+def return_question_set(questionList: List[Dict[str, Any]]) -> bool:
+    """
+    꺼내거나 생성했지만 응답으로 나가지 못한 세트를 풀에 되돌린다 (ASGI 모드에서 요청이 실패한 경우).
+    풀이 꺼져 있거나 기본값으로 채워진 세트면 버리고 False
+    """
+    if not current_app.config["QUESTION_POOL_ENABLED"] or not _is_complete(questionList):
+        return False
+    db.session.add(QuestionSet(payload=json.dumps(questionList, ensure_ascii=False)))
+    db.session.commit()
+    logger.info("Question set returned to pool")
+    return True
+
+
+def take_question_list() -> List[Dict[str, Any]]:
+    """
+    /api/interview/start 용 질문 세트.
+    풀에서 꺼내되 비어 있으면 기존처럼 LLM을 직접 호출한다.
+    """
+    return take_pooled_question_list() or generate_question()
+
+
+def get_stats() -> Dict[str, Any]:
+    app = current_app._get_current_object()
+    with _lock:
+        stats = dict(_stats)
+    return {
+        "enabled": app.config["QUESTION_POOL_ENABLED"],
+        "size": pool_size(),
+        "target": app.config["QUESTION_POOL_TARGET"],
+        "low_water": app.config["QUESTION_POOL_LOW_WATER"],
+        "refill_workers": app.config["QUESTION_POOL_REFILL_WORKERS"],
+        "refilling": refilling(),
+        **stats,
+    }
+
+
+def _collect_metrics() -> List[str]:
+    with _lock:
+        stats = dict(_stats)
+    lines = metrics.render_family(
+        "question_pool_events_total", "Question pool hits/misses/refills", "counter",
+        [({"event": key}, value) for key, value in sorted(stats.items())]
+    )
+    # /metrics 요청 안에서 호출되므로 앱 컨텍스트가 있음
+    lines += metrics.render_family("question_pool_refilling", "Question sets being generated", "gauge", [({}, refilling())])
+    lines += metrics.render_family("question_pool_size", "Question sets ready in the pool", "gauge", [({}, pool_size())])
+    return lines
+
+
+metrics.register_collector(_collect_metrics)
+
+
+def _ensure_started() -> None:
+    """프로세스마다 첫 요청 때 한 번 풀 채우기를 시작 (fork 이후 워커에서도)"""
+    global _started_pid
+    pid = os.getpid()
+    with _lock:
+        if _started_pid == pid:
+            return
+        _started_pid = pid
+    request_refill(current_app._get_current_object())
+
+
+def init_app(app) -> None:
+    """
+    첫 요청 때 풀을 채우기 시작한다.
+    gunicorn --preload 처럼 create_app() 뒤에 fork 되는 경우 마스터에서 리필 스레드가 LLM 을 호출하고 있으면
+    워커가 잠긴 상태의 락(llm_client 등)을 물려받아 멈추므로 create_app() 안에서는 시작하지 않는다
+    """
+    if not app.config["QUESTION_POOL_ENABLED"]:
+        return
+    app.before_request(_ensure_started)
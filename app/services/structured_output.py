@@ -0,0 +1,381 @@
+"""
+구조화된(JSON 스키마) LLM 출력
+- 가능하면 제공자에게 response_format=json_schema 로 스키마에 맞는 JSON 출력을 요청한다
+  (400 오류가 response_format/json_schema 를 지원하지 않는다는 내용이면 json_object 로 낮춰서 다시 요청하고,
+  그 모델은 LLM_JSON_SCHEMA_RETRY_AFTER 초 동안 json_object 사용)
+- 받은 JSON 을 가벼운 스키마 검사(validate)로 확인하고, 실패하면 오류를 알려 주고 한 번만 다시 요청한다
+- 모델별 파싱/스키마 실패 횟수를 센다 (get_stats)
+- async_structured_completion: 같은 동작을 async_chat_completion 으로 (ASGI 모드)
+- stream_structured: 같은 response_format 선택/낮추기를 스트리밍 호출에 적용
+"""
+
+import os
+import re
+import json
+import time
+import itertools
+import threading
+from typing import Any, Dict, List, Optional
+
+from openai import BadRequestError
+
+from app import metrics
+from app.log import get_logger
+from app.services.llm_client import chat_completion, async_chat_completion, stream_chat_completion
+
+# json_schema: 스키마 강제 / json_object: JSON 만 강제 / off: response_format 없이 프롬프트로만 요청
+LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "json_schema")
+# 스키마 검사 실패 시 다시 요청하는 횟수
+LLM_REPAIR_RETRIES = int(os.getenv("LLM_REPAIR_RETRIES", "1"))
+# json_schema 가 거부된 모델을 json_object 로 요청하는 시간 (초). 지나면 json_schema 를 다시 시도
+LLM_JSON_SCHEMA_RETRY_AFTER = float(os.getenv("LLM_JSON_SCHEMA_RETRY_AFTER", "3600"))
+
+logger = get_logger(__name__)
+
+_lock = threading.Lock()
+# json_schema 요청이 400 으로 거부된 모델 → json_object 로 요청할 기한 (time.monotonic)
+_json_schema_unsupported: Dict[str, float] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+
+_STAT_KEYS = (
+    "calls",            # structured_completion / check_output 호출 수
+    "ok",               # 첫 응답이 바로 통과
+    "parse_failures",   # JSON 으로 읽을 수 없었던 응답 수 (재요청 포함)
+    "schema_failures",  # JSON 이지만 스키마와 맞지 않았던 응답 수 (재요청 포함)
+    "repairs",          # 다시 요청한 횟수
+    "repaired",         # 다시 요청해서 통과
+    "failed",           # 끝내 실패 (None 반환)
+    "downgraded",       # json_schema 가 거부되어 json_object 로 낮춘 횟수
+)
+
+
+def _count(model: str, key: str) -> None:
+    with _lock:
+        stats = _stats.setdefault(model, {k: 0 for k in _STAT_KEYS})
+        stats[key] += 1
+
+
+def get_stats() -> Dict[str, Any]:
+    with _lock:
+        models = {model: dict(stats) for model, stats in _stats.items()}
+        now = time.monotonic()
+        unsupported = sorted(model for model, until in _json_schema_unsupported.items() if until > now)
+    for stats in models.values():
+        responses = stats["calls"] + stats["repairs"]
+        stats["failure_rate"] = round((stats["parse_failures"] + stats["schema_failures"]) / responses, 4) if responses else 0.0
+    return {"mode": LLM_STRUCTURED_OUTPUT, "json_schema_unsupported": unsupported, "models": models}
+
+
+def _collect_metrics() -> List[str]:
+    with _lock:
+        samples = [
+            ({"model": model, "outcome": key}, value)
+            for model, stats in sorted(_stats.items())
+            for key, value in stats.items()
+        ]
+    return metrics.render_family(
+        "llm_structured_output_total", "Structured output outcomes per model", "counter", samples
+    )
+
+
+metrics.register_collector(_collect_metrics)
+
+
+# -----------------------------
+# 파싱
+# -----------------------------
+def strip_think(text: str) -> str:
+    """일부 모델이 실수로 넣는 </think> 이전 텍스트를 제거"""
+    if "</think>" in text:
+        return text.split("</think>", 1)[-1]
+    return text
+
+
+_decoder = json.JSONDecoder()
+# ``` 또는 ```json 바로 뒤(공백 허용)에 '{' 가 오는 위치
+_CODEBLOCK_OPEN = re.compile(r"```(?:json)?\s*(?=\{)", re.IGNORECASE)
+# 읽어 볼 코드블록 수 (raw_decode 가 실패하면 오류 위치 계산에 입력 길이만큼 걸리므로 횟수를 제한)
+MAX_CODEBLOCKS = 3
+
+
+def _skip_space(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def parse_json(text: str) -> Optional[Any]:
+    """
+    JSON 본문 또는 ```json ... ``` 코드블록 파싱. 실패하면 None.
+    코드블록은 여는 펜스 뒤의 '{' 부터 JSON 하나만 읽고(raw_decode) 닫는 펜스가 이어지는지 본다.
+    (이전의 non-greedy DOTALL 정규식은 닫히지 않은 펜스가 많으면 입력 길이의 제곱에 비례해 느려졌음,
+    benchmarks/bench_parsers.py 참고)
+    너무 깊게 중첩된 입력(RecursionError)도 파싱 실패로 처리한다.
+    """
+    cleaned = strip_think(text).strip()
+    try:
+        return json.loads(cleaned)
+    except (ValueError, RecursionError):
+        pass
+
+    for match in itertools.islice(_CODEBLOCK_OPEN.finditer(cleaned), MAX_CODEBLOCKS):
+        try:
+            value, end = _decoder.raw_decode(cleaned, match.end())
+        except (ValueError, RecursionError):
+            continue
+        if cleaned.startswith("```", _skip_space(cleaned, end)):
+            return value
+    return None
+
+
+# -----------------------------
+# 스키마 검사 (프롬프트에서 쓰는 JSON Schema 부분집합만 지원)
+# -----------------------------
+def _type_ok(value: Any, expected: str) -> bool:
+    if expected == "object":
+        return isinstance(value, dict)
+    if expected == "array":
+        return isinstance(value, list)
+    if expected == "string":
+        return isinstance(value, str)
+    if expected == "boolean":
+        return isinstance(value, bool)
+    if isinstance(value, bool):
+        return False
+    if expected == "integer":
+        return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+    if expected == "number":
+        return isinstance(value, (int, float))
+    return True
+
+
+def validate(value: Any, schema: Dict[str, Any], path: str = "$") -> Optional[str]:
+    """
+    type / required / properties / items / enum / minimum / maximum / minItems / maxItems / minLength 만 확인.
+    통과하면 None, 아니면 첫 번째 오류 설명.
+    """
+    expected = schema.get("type")
+    if expected and not _type_ok(value, expected):
+        return f"{path}: expected {expected}, got {type(value).__name__}"
+
+    if "enum" in schema and value not in schema["enum"]:
+        return f"{path}: must be one of {schema['enum']}"
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            return f"{path}: {value} < minimum {schema['minimum']}"
+        if "maximum" in schema and value > schema["maximum"]:
+            return f"{path}: {value} > maximum {schema['maximum']}"
+
+    if isinstance(value, str) and len(value) < schema.get("minLength", 0):
+        return f"{path}: shorter than {schema['minLength']}"
+
+    if isinstance(value, dict):
+        for key in schema.get("required", ()):
+            if key not in value:
+                return f"{path}: missing '{key}'"
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in value:
+                error = validate(value[key], sub_schema, f"{path}.{key}")
+                if error:
+                    return error
+
+    if isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            return f"{path}: expected at least {schema['minItems']} items, got {len(value)}"
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            return f"{path}: expected at most {schema['maxItems']} items, got {len(value)}"
+        item_schema = schema.get("items")
+        if item_schema:
+            for i, item in enumerate(value):
+                error = validate(item, item_schema, f"{path}[{i}]")
+                if error:
+                    return error
+
+    return None
+
+
+# -----------------------------
+# 호출
+# -----------------------------
+def _schema_unsupported(model: str) -> bool:
+    """json_schema 가 거부된 뒤 아직 LLM_JSON_SCHEMA_RETRY_AFTER 가 지나지 않았는지 (지났으면 기록을 지움)"""
+    with _lock:
+        until = _json_schema_unsupported.get(model)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del _json_schema_unsupported[model]
+            return False
+        return True
+
+
+def response_format_for(model: str, name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """모델이 지원하는 가장 강한 response_format 인자"""
+    mode = LLM_STRUCTURED_OUTPUT
+    if mode == "json_schema" and _schema_unsupported(model):
+        mode = "json_object"
+    if mode == "json_schema":
+        return {"response_format": {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}}
+    if mode == "json_object":
+        return {"response_format": {"type": "json_object"}}
+    return {}
+
+
+def _is_schema_rejection(error: BadRequestError) -> bool:
+    """400 오류가 response_format/json_schema 에 대한 것인지 (메시지/본문에 이름이 나오는지로 판단)"""
+    text = f"{error} {getattr(error, 'body', '') or ''}".lower()
+    return "response_format" in text or "json_schema" in text
+
+
+def _downgrade(model: str, response_format: Dict[str, Any], error: BadRequestError) -> None:
+    """
+    json_schema 요청이 그 기능 때문에 거부됐으면 LLM_JSON_SCHEMA_RETRY_AFTER 초 동안 json_object 로 요청.
+    프롬프트 길이 초과 등 다른 400 이면 그대로 올려 보냄
+    """
+    if response_format.get("response_format", {}).get("type") != "json_schema" or not _is_schema_rejection(error):
+        raise error
+    # 스키마 기능을 지원하지 않는 모델/엔드포인트
+    with _lock:
+        _json_schema_unsupported[model] = time.monotonic() + LLM_JSON_SCHEMA_RETRY_AFTER
+    _count(model, "downgraded")
+    logger.warning("json_schema rejected, falling back to json_object", model=model, error=str(error),
+                   retry_after=LLM_JSON_SCHEMA_RETRY_AFTER)
+
+
+def _create(model: str, messages: List[Dict[str, str]], name: str, schema: Dict[str, Any], **kwargs):
+    response_format = response_format_for(model, name, schema)
+    try:
+        return chat_completion(model=model, messages=messages, **response_format, **kwargs)
+    except BadRequestError as e:
+        _downgrade(model, response_format, e)
+        return chat_completion(model=model, messages=messages, **response_format_for(model, name, schema), **kwargs)
+
+
+async def _async_create(model: str, messages: List[Dict[str, str]], name: str, schema: Dict[str, Any], **kwargs):
+    response_format = response_format_for(model, name, schema)
+    try:
+        return await async_chat_completion(model=model, messages=messages, **response_format, **kwargs)
+    except BadRequestError as e:
+        _downgrade(model, response_format, e)
+        return await async_chat_completion(model=model, messages=messages, **response_format_for(model, name, schema), **kwargs)
+
+
+def stream_structured(model: str, messages: List[Dict[str, str]], name: str, schema: Dict[str, Any], **kwargs):
+    """
+    response_format 을 붙인 stream_chat_completion (delta 를 그대로 yield).
+    json_schema 가 거부되면 _create 와 같이 낮춰서 다시 요청한다 (거부는 첫 조각보다 먼저 오므로 내보낸 조각 없음)
+    """
+    response_format = response_format_for(model, name, schema)
+    started = False
+    try:
+        for delta in stream_chat_completion(model=model, messages=messages, **response_format, **kwargs):
+            started = True
+            yield delta
+        return
+    except BadRequestError as e:
+        if started:
+            raise
+        _downgrade(model, response_format, e)
+    yield from stream_chat_completion(model=model, messages=messages, **response_format_for(model, name, schema), **kwargs)
+
+
+def _check(model: str, raw: str, schema: Dict[str, Any]):
+    """(parsed, error) — 통과하면 error 는 None. 실패 종류만 센다"""
+    parsed = parse_json(raw)
+    if parsed is None:
+        _count(model, "parse_failures")
+        return None, "응답이 유효한 JSON 이 아님"
+    error = validate(parsed, schema)
+    if error:
+        _count(model, "schema_failures")
+        return None, error
+    return parsed, None
+
+
+def check_output(model: str, raw: str, schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """이미 받은 응답(스트리밍 등) 하나를 검사하고 통계에 반영. 실패하면 None"""
+    _count(model, "calls")
+    parsed, error = _check(model, raw, schema)
+    if error is None:
+        _count(model, "ok")
+        return parsed
+    logger.warning("Structured output check failed", model=model, error=error)
+    _count(model, "failed")
+    return None
+
+
+def _repair_messages(model: str, name: str, messages: List[Dict[str, str]], raw: str, error: str, attempt: int):
+    """오류를 알려 주고 다시 요청하는 메시지 (재요청 횟수도 여기서 셈)"""
+    logger.info("Structured output repair", model=model, schema=name, error=error,
+                attempt=attempt + 1, max_repairs=LLM_REPAIR_RETRIES)
+    _count(model, "repairs")
+    return messages + [
+        {"role": "assistant", "content": raw},
+        {"role": "user", "content": (
+            f"직전 출력이 스키마를 따르지 않았어 ({error}). "
+            "설명 없이 스키마에 맞는 JSON 만 다시 출력해."
+        )},
+    ]
+
+
+def structured_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    schema: Dict[str, Any],
+    name: str,
+    **kwargs
+) -> Optional[Dict[str, Any]]:
+    """
+    스키마에 맞는 JSON 을 요청하고 검사를 통과한 dict 를 반환.
+    실패하면 오류를 알려 주며 LLM_REPAIR_RETRIES 번까지만 다시 요청하고, 그래도 실패하면 None.
+    호출 자체의 오류(타임아웃 등)는 그대로 올려 보낸다.
+    """
+    _count(model, "calls")
+    response = _create(model, messages, name, schema, **kwargs)
+    raw = response.choices[0].message.content or ""
+    parsed, error = _check(model, raw, schema)
+    if error is None:
+        _count(model, "ok")
+        return parsed
+
+    for attempt in range(LLM_REPAIR_RETRIES):
+        response = _create(model, _repair_messages(model, name, messages, raw, error, attempt), name, schema, **kwargs)
+        raw = response.choices[0].message.content or ""
+        parsed, error = _check(model, raw, schema)
+        if error is None:
+            _count(model, "repaired")
+            return parsed
+
+    logger.warning("Structured output failed after repair", model=model, schema=name, error=error)
+    _count(model, "failed")
+    return None
+
+
+async def async_structured_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    schema: Dict[str, Any],
+    name: str,
+    **kwargs
+) -> Optional[Dict[str, Any]]:
+    """structured_completion 의 async 버전 (재요청/통계 동일)"""
+    _count(model, "calls")
+    response = await _async_create(model, messages, name, schema, **kwargs)
+    raw = response.choices[0].message.content or ""
+    parsed, error = _check(model, raw, schema)
+    if error is None:
+        _count(model, "ok")
+        return parsed
+
+    for attempt in range(LLM_REPAIR_RETRIES):
+        response = await _async_create(model, _repair_messages(model, name, messages, raw, error, attempt), name, schema, **kwargs)
+        raw = response.choices[0].message.content or ""
+        parsed, error = _check(model, raw, schema)
+        if error is None:
+            _count(model, "repaired")
+            return parsed
+
+    logger.warning("Structured output failed after repair", model=model, schema=name, error=error)
+    _count(model, "failed")
+    return None
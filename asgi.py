@@ -0,0 +1,9 @@
+"""
+ASGI 진입점: LLM 을 기다리는 요청이 스레드를 점유하지 않음 (app/asgi.py 참고)
+    uvicorn asgi:app --host 0.0.0.0 --port 8080
+"""
+
+from app import create_app
+from app.asgi import create_asgi_app
+
+app = create_asgi_app(create_app())
@@ -0,0 +1,194 @@
+"""
+ASGI 모드 벤치마크: LLM 을 기다리는 요청이 많을 때 빠른 엔드포인트(/info)가 밀리는지 비교
+
+같은 uvicorn + 같은 크기(--threads)의 스레드 풀에서 두 가지 모드를 비교한다
+- threadpool : 모든 요청을 스레드 풀에서 동기로 처리 (gunicorn gthread 같은 WSGI 서버와 같은 구조)
+- asgi       : asgi.py 와 같음. LLM 엔드포인트는 이벤트 루프에서 AsyncOpenAI 로 기다린 뒤 Flask 로 넘김
+
+모드마다 스텁 LLM(benchmarks/llm_stub.py, --llm-latency 초)과 임시 DB 로 서버를 별도 프로세스로 띄우고
+GET /api/interview 를 --llm-requests 개 동시에 보내는 동안 /info 를 --probe-interval 간격으로 호출한다.
+출력: LLM 요청 완료 수/처리량/지연 시간, 그 동안의 /info 지연 시간 (p50/p95/max)
+
+실행 (저장소 루트에서, uvicorn 필요):
+    python benchmarks/bench_asgi.py
+    python benchmarks/bench_asgi.py --llm-requests 300 --threads 32 --llm-latency 3
+"""
+
+import os
+import sys
+import time
+import uuid
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import llm_stub  # noqa: E402
+from benchmarks.load_test import percentile  # noqa: E402
+
+MODES = ("threadpool", "asgi")
+
+
+# -----------------------------
+# 서버 (자식 프로세스)
+# -----------------------------
+def serve(mode, port):
+    import uvicorn
+    from app import create_app
+    from app.asgi import create_asgi_app
+
+    asgi = create_asgi_app(create_app())
+    if mode == "threadpool":
+        # 미리 받지 않으면 LLM 호출도 Flask 뷰 안에서 스레드를 붙잡고 기다림
+        asgi.prefetchers.clear()
+    uvicorn.run(asgi, host="127.0.0.1", port=port, log_level="warning", lifespan="on")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode, args, llm_base_url, workdir):
+    port = _free_port()
+    env = {
+        **os.environ,
+        "LLM_BASE_URL": llm_base_url,
+        "GEMINI_API_KEY": "stub",
+        "DATABASE_URL": "sqlite:///" + os.path.join(workdir, f"{mode}.db"),
+        "JWT_SECRET_KEY": "bench-" + "x" * 32,
+        "VIDEO_DIR": os.path.join(workdir, "videos"),
+        "PROFILING_DIR": os.path.join(workdir, "profiles"),
+        "QUESTION_POOL_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+        "ASGI_THREADS": str(args.threads),
+        # 동기 호출 제한이 먼저 걸리지 않도록 두 모드 모두 넉넉하게 (스레드 수만 비교)
+        "LLM_MAX_CONCURRENCY": "1024",
+        "LLM_ASYNC_MAX_CONCURRENCY": "1024",
+        "LLM_TIMEOUT": str(args.request_timeout),
+    }
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", mode, "--port", str(port)],
+                            env=env, cwd=ROOT)
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline:
+        try:
+            requests.get(base + "/info", timeout=1)
+            return proc, base
+        except requests.RequestException:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+# -----------------------------
+# 측정
+# -----------------------------
+def login(base):
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    response = requests.post(base + "/api/auth/join", json={"username": "bench", "email": email, "password": "bench"})
+    return response.json()["data"]["token"]
+
+
+def run_mode(mode, args, llm_base_url, workdir):
+    proc, base = start_server(mode, args, llm_base_url, workdir)
+    try:
+        headers = {"Authorization": "Bearer " + login(base)}
+        llm_latencies, llm_errors, probes = [], [], []
+        done = threading.Event()
+
+        def llm_call(_):
+            session = requests.Session()
+            started = time.perf_counter()
+            try:
+                response = session.get(base + "/api/interview", headers=headers, timeout=args.request_timeout)
+                if response.status_code == 200:
+                    llm_latencies.append(time.perf_counter() - started)
+                else:
+                    llm_errors.append(str(response.status_code))
+            except requests.RequestException as e:
+                llm_errors.append(type(e).__name__)
+
+        def probe():
+            session = requests.Session()
+            while not done.is_set():
+                started = time.perf_counter()
+                try:
+                    session.get(base + "/info", timeout=args.request_timeout)
+                    probes.append(time.perf_counter() - started)
+                except requests.RequestException:
+                    probes.append(args.request_timeout)
+                time.sleep(args.probe_interval)
+
+        prober = threading.Thread(target=probe, daemon=True)
+        started = time.perf_counter()
+        prober.start()
+        with ThreadPoolExecutor(max_workers=args.llm_requests) as executor:
+            list(executor.map(llm_call, range(args.llm_requests)))
+        wall = time.perf_counter() - started
+        done.set()
+        prober.join()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    return {
+        "mode": mode,
+        "ok": len(llm_latencies),
+        "errors": len(llm_errors),
+        "wall": wall,
+        "llm_per_s": len(llm_latencies) / wall,
+        "llm_p50": percentile(llm_latencies, 50),
+        "llm_max": max(llm_latencies) if llm_latencies else None,
+        "info_n": len(probes),
+        "info_p50": percentile(probes, 50),
+        "info_p95": percentile(probes, 95),
+        "info_max": max(probes) if probes else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-requests", type=int, default=200, help="동시에 보내는 GET /api/interview 수")
+    parser.add_argument("--threads", type=int, default=32, help="서버 스레드 풀 크기 (ASGI_THREADS)")
+    parser.add_argument("--llm-latency", type=float, default=2.0, help="스텁 LLM 응답 지연 (초)")
+    parser.add_argument("--probe-interval", type=float, default=0.05, help="/info 호출 간격 (초)")
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--mode", choices=MODES, help="한 모드만 측정")
+    parser.add_argument("--serve", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    stub, llm_base_url = llm_stub.start(settings=llm_stub.StubSettings(latency=args.llm_latency, tokens_per_sec=0))
+    workdir = tempfile.mkdtemp(prefix="bench_asgi_")
+    print(f"llm_requests={args.llm_requests} threads={args.threads} llm_latency={args.llm_latency}s")
+    print(f"{'mode':<12}{'ok':>6}{'err':>5}{'wall_s':>8}{'llm/s':>8}{'llm_p50':>9}{'llm_max':>9}"
+          f"{'info_n':>8}{'info_p50':>10}{'info_p95':>10}{'info_max':>10}")
+    try:
+        for mode in ([args.mode] if args.mode else MODES):
+            r = run_mode(mode, args, llm_base_url, workdir)
+
+            def ms(value):
+                return f"{value * 1000:>10.1f}" if value is not None else f"{'-':>10}"
+
+            print(f"{r['mode']:<12}{r['ok']:>6}{r['errors']:>5}{r['wall']:>8.2f}{r['llm_per_s']:>8.1f}"
+                  f"{r['llm_p50']:>9.2f}{r['llm_max']:>9.2f}{r['info_n']:>8}"
+                  f"{ms(r['info_p50'])}{ms(r['info_p95'])}{ms(r['info_max'])}")
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
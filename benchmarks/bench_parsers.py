@@ -0,0 +1,289 @@
+"""
+LLM 응답 파서 마이크로벤치마크 (실행 시간 + 메모리 할당)
+
+대상
+- parse_json               : structured_output.parse_json (generate_question / analysisByLLM 의 모든 응답)
+- item stream parser       : llm_analysis._ItemStreamParser (분석 SSE, delta 단위로 입력)
+- question line parser     : llm_service.stream_questions 의 줄 단위 파싱 (질문 SSE, delta 단위로 입력)
+각각 이전 구현(legacy_*, 이 파일에 그대로 옮겨 둠)과 현재 구현을 같은 입력으로 비교한다.
+
+입력 코퍼스
+- real        : benchmarks/data/parser_corpus.json 에 기록된 모델 출력
+- truncated   : real 출력을 25/50/90% 지점에서 자른 것 (max_tokens 초과, 연결 끊김)
+- adversarial : 닫히지 않은 코드블록 반복, 깊은 중첩, 아주 긴 문자열/줄 등 (--size 글자)
+
+출력: 케이스마다 구현별 호출당 시간(µs, 최솟값), tracemalloc 최대 할당량(KB), 결과(ok/none/예외 이름)
+      와 두 구현의 결과가 같은지(same/diff).
+
+실행 (저장소 루트에서):
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --size 64000 --only adversarial
+"""
+
+import os
+import re
+import sys
+import json
+import timeit
+import argparse
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import llm_service  # noqa: E402
+from app.services.llm_analysis import _ItemStreamParser  # noqa: E402
+from app.services.structured_output import parse_json, strip_think  # noqa: E402
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "parser_corpus.json")
+DELTA_CHARS = 8  # 스트리밍 delta 하나의 글자 수 (토큰 몇 개 분량)
+
+
+# -----------------------------
+# 이전 구현
+# -----------------------------
+def legacy_parse_json(text: str) -> Optional[Any]:
+    cleaned = strip_think(text).strip()
+    try:
+        return json.loads(cleaned)
+    except ValueError:
+        pass
+    codeblock = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", cleaned, re.DOTALL | re.IGNORECASE)
+    if codeblock:
+        try:
+            return json.loads(codeblock.group(1))
+        except ValueError:
+            return None
+    return None
+
+
+class LegacyItemStreamParser:
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, delta: str) -> List[Dict[str, Any]]:
+        self.text += delta
+        text = self.text
+        items = []
+        for pos in range(self._pos, len(text)):
+            ch = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"' and self._stack:
+                self._in_string = True
+            elif ch in "{[":
+                if ch == "{" and self._stack == ["{", "["]:
+                    self._item_start = pos
+                self._stack.append(ch)
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                if ch == "}" and self._item_start is not None and self._stack == ["{", "["]:
+                    try:
+                        items.append(json.loads(text[self._item_start:pos + 1]))
+                    except ValueError:
+                        pass
+                    self._item_start = None
+        self._pos = len(text)
+        return items
+
+
+def legacy_question_lines(deltas):
+    """stream_questions 의 이전 루프 (delta 마다 버퍼 전체를 split)"""
+    buffer = ""
+    in_think = False
+    pending_question = None
+    items = []
+
+    def handle_line(line):
+        nonlocal in_think, pending_question
+        if "<think>" in line:
+            in_think = True
+        if "</think>" in line:
+            in_think = False
+            line = line.split("</think>", 1)[1]
+        if in_think:
+            return None
+        if line.startswith("면접 질문"):
+            pending_question = line.split(":", 1)[1].strip() if ":" in line else ""
+        elif line.startswith("모범 답") and pending_question is not None:
+            answer = line.split(":", 1)[1].strip() if ":" in line else ""
+            item = {"question": pending_question, "answer": answer, "type": "간호사"}
+            pending_question = None
+            return item
+        return None
+
+    for delta in deltas:
+        buffer += delta
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            item = handle_line(line)
+            if item:
+                items.append(item)
+                if len(items) >= 3:
+                    return items
+    item = handle_line(buffer)
+    if item and len(items) < 3:
+        items.append(item)
+    return items
+
+
+# -----------------------------
+# 현재 구현 감싸기 (스트리밍 파서는 delta 목록을 받도록)
+# -----------------------------
+def _deltas(text: str) -> List[str]:
+    return [text[i:i + DELTA_CHARS] for i in range(0, len(text), DELTA_CHARS)]
+
+
+def stream_items(parser_cls, deltas):
+    parser = parser_cls()
+    items = []
+    for delta in deltas:
+        items.extend(parser.feed(delta))
+    return items, parser.text
+
+
+def current_question_lines(deltas):
+    # LLM 호출 대신 준비된 delta 를 흘려보냄
+    original = llm_service.stream_chat_completion
+    llm_service.stream_chat_completion = lambda **kwargs: iter(deltas)
+    try:
+        return list(llm_service.stream_questions())
+    finally:
+        llm_service.stream_chat_completion = original
+
+
+PARSERS = {
+    "parse_json": (legacy_parse_json, parse_json, lambda text: text),
+    "item_stream": (
+        lambda deltas: stream_items(LegacyItemStreamParser, deltas),
+        lambda deltas: stream_items(_ItemStreamParser, deltas),
+        _deltas,
+    ),
+    "question_lines": (legacy_question_lines, current_question_lines, _deltas),
+}
+
+
+# -----------------------------
+# 코퍼스
+# -----------------------------
+def load_real(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["cases"]
+
+
+def build_cases(real, size):
+    cases = []
+    for case in real:
+        parsers = ["parse_json", "item_stream"] if case["kind"] == "json" else ["question_lines"]
+        for parser in parsers:
+            cases.append(("real", case["name"], parser, case["text"]))
+        for pct in (25, 50, 90):
+            cut = case["text"][:len(case["text"]) * pct // 100]
+            for parser in parsers:
+                cases.append(("truncated", f"{case['name']}@{pct}%", parser, cut))
+
+    analysis = next(c["text"] for c in real if c["name"].endswith("analysis_compact"))
+    item = json.loads(analysis)["items"][0]
+    long_line = "면접 질문 1: " + "가" * size
+    many_items = json.dumps(
+        {"items": [{**item, "index": i + 1} for i in range(max(1, size // len(json.dumps(item))))], "summary": "s"},
+        ensure_ascii=False
+    )
+    adversarial = {
+        "unclosed_fences": "```json {" * (size // 9),
+        "fence_open_brace": '```{"' * (size // 5),
+        "fence_flood_prose": "```\n설명 {예시} 입니다\n" * (size // 20),
+        "deep_array": "[" * size,
+        "deep_object_unclosed": '{"a":' * (size // 5),
+        "huge_string_fenced": "```json\n" + json.dumps({"summary": "가" * size}, ensure_ascii=False) + "\n```",
+        "think_unclosed": "<think>" + "생각 중 {" * (size // 6) + analysis,
+        "trailing_fences": analysis + "```" * (size // 3),
+    }
+    for name, text in adversarial.items():
+        cases.append(("adversarial", name, "parse_json", text))
+    cases.append(("adversarial", "many_items", "parse_json", many_items))
+    cases.append(("adversarial", "many_items", "item_stream", many_items))
+    cases.append(("adversarial", "huge_string_item", "item_stream",
+                  json.dumps({"items": [{"index": 1, "analysis": "가" * size, "score": 1}]}, ensure_ascii=False)))
+    cases.append(("adversarial", "long_line_no_newline", "question_lines", long_line))
+    cases.append(("adversarial", "long_lines", "question_lines",
+                  f"면접 질문 1: {'가' * size}\n모범 답 1: {'나' * size}\n"))
+    return cases
+
+
+# -----------------------------
+# 측정
+# -----------------------------
+def _outcome(fn, arg):
+    try:
+        result = fn(arg)
+    except Exception as e:
+        return type(e).__name__, None
+    if isinstance(result, tuple):
+        result = result[0]
+    return ("ok" if result else "none"), result
+
+
+def measure(fn, arg, min_time):
+    outcome, result = _outcome(fn, arg)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    _outcome(fn, arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timer = timeit.Timer(lambda: _outcome(fn, arg))
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=3, number=number)) / number
+    return {"us": best * 1e6, "peak_kb": peak / 1024, "outcome": outcome, "result": result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--size", type=int, default=32000, help="adversarial 입력 크기 (글자)")
+    parser.add_argument("--only", choices=["real", "truncated", "adversarial"])
+    parser.add_argument("--min-time", type=float, default=0.05, help="구현/케이스당 측정 시간 (초, 대략)")
+    args = parser.parse_args()
+
+    cases = build_cases(load_real(args.data), args.size)
+    print(f"delta={DELTA_CHARS} chars, adversarial size={args.size} chars")
+    print(f"{'category':<12}{'case':<42}{'parser':<15}{'chars':>8}"
+          f"{'legacy_us':>12}{'new_us':>11}{'speedup':>9}{'legacy_kb':>11}{'new_kb':>9}  outcome")
+
+    totals: Dict[str, List[float]] = {}
+    for category, name, parser_name, text in cases:
+        if args.only and category != args.only:
+            continue
+        legacy_fn, current_fn, prepare = PARSERS[parser_name]
+        arg = prepare(text)
+        old = measure(legacy_fn, arg, args.min_time)
+        new = measure(current_fn, arg, args.min_time)
+        same = "same" if (old["outcome"], old["result"]) == (new["outcome"], new["result"]) else "diff"
+        totals.setdefault(category, [0.0, 0.0])
+        totals[category][0] += old["us"]
+        totals[category][1] += new["us"]
+        print(f"{category:<12}{name[:41]:<42}{parser_name:<15}{len(text):>8}"
+              f"{old['us']:>12.1f}{new['us']:>11.1f}{old['us'] / new['us']:>8.1f}x"
+              f"{old['peak_kb']:>11.1f}{new['peak_kb']:>9.1f}  {old['outcome']}/{new['outcome']} {same}")
+
+    print()
+    for category, (old_us, new_us) in totals.items():
+        print(f"total {category:<12} legacy={old_us / 1000:.2f}ms new={new_us / 1000:.2f}ms ({old_us / new_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+분석 프롬프트 full / compact 모드 비교 벤치마크
+
+기록된 면접 세션(benchmarks/data/recorded_sessions.json)으로 두 모드의 프롬프트를 만들어
+- 입력 토큰 수 (estimate_tokens 기준 추정치)
+- 출력 토큰 수 (각 모드의 출력 스키마대로 만든 예상 응답 JSON 기준 추정치)
+- 프롬프트 생성 시간
+을 비교한다. --live 를 주면 설정된 LLM_BASE_URL 로 실제 호출해 wall time 과 usage 토큰도 잰다.
+
+실행 (저장소 루트에서):
+    python benchmarks/bench_prompt_compaction.py
+    python benchmarks/bench_prompt_compaction.py --live --repeat 3
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import llm_analysis  # noqa: E402
+from app.services.llm_analysis import (  # noqa: E402
+    ANALYSIS_MODEL,
+    estimate_tokens,
+    _build_messages,
+    _build_summary_messages,
+    _build_payload_items,
+    _dumps,
+)
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "recorded_sessions.json")
+
+
+def load_sessions(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["sessions"]
+
+
+def _interviews(session):
+    # DB 없이 프롬프트 빌더에 넘길 수 있도록 Interview 속성만 흉내 냄
+    return [
+        SimpleNamespace(
+            question=item["question"],
+            useranswer=item["useranswer"],
+            LLM_gen_answer=item["llm_gen_answer"],
+            analysis=item["analysis"],
+            score=item["score"],
+        )
+        for item in session["items"]
+    ]
+
+
+def _messages_tokens(messages):
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+def expected_output(session, compact):
+    """해당 모드의 스키마대로 모델이 돌려줄 응답 JSON (기록된 분석 결과로 구성)"""
+    items = []
+    for idx, item in enumerate(session["items"], start=1):
+        if compact:
+            items.append({"index": idx, "analysis": item["analysis"], "score": item["score"]})
+        else:
+            items.append({
+                "index": idx,
+                "question": item["question"],
+                "useranswer": item["useranswer"],
+                "llm_gen_answer": item["llm_gen_answer"],
+                "analysis": item["analysis"],
+                "score": item["score"],
+            })
+    return _dumps(
+        {"items": items, "summary": session["summary"], "overall_scores": session["overall_scores"]},
+        compact
+    )
+
+
+def measure(session, compact, iterations):
+    interviews = _interviews(session)
+    payload_items = _build_payload_items(interviews)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        messages = _build_messages(payload_items, compact=compact)
+    build_ms = (time.perf_counter() - started) * 1000 / iterations
+
+    summary_messages = _build_summary_messages(interviews, compact=compact)
+    return {
+        "messages": messages,
+        "input_tokens": _messages_tokens(messages),
+        "summary_input_tokens": _messages_tokens(summary_messages),
+        "output_tokens": estimate_tokens(expected_output(session, compact)),
+        "build_ms": build_ms,
+    }
+
+
+def live_call(messages, repeat):
+    from app.services.llm_client import chat_completion
+
+    walls, prompt_tokens, completion_tokens = [], [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completion = chat_completion(
+            model=ANALYSIS_MODEL,
+            messages=messages,
+            response_format={"type": "json_object"},
+            temperature=0.2,
+        )
+        walls.append(time.perf_counter() - started)
+        usage = getattr(completion, "usage", None)
+        if usage is not None:
+            prompt_tokens.append(usage.prompt_tokens)
+            completion_tokens.append(usage.completion_tokens)
+    return {
+        "wall_s": statistics.median(walls),
+        "prompt_tokens": statistics.median(prompt_tokens) if prompt_tokens else None,
+        "completion_tokens": statistics.median(completion_tokens) if completion_tokens else None,
+    }
+
+
+def _pct(before, after):
+    return f"{(after - before) / before * 100:+.1f}%" if before else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--iterations", type=int, default=200, help="프롬프트 생성 반복 횟수")
+    parser.add_argument("--live", action="store_true", help="설정된 LLM 엔드포인트를 실제로 호출")
+    parser.add_argument("--repeat", type=int, default=1, help="--live 호출 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.data)
+    print(f"model={ANALYSIS_MODEL} field_budget={llm_analysis.ANALYSIS_FIELD_TOKEN_BUDGET} sessions={len(sessions)}")
+    print(f"{'session':<14}{'mode':<9}{'in_tok':>8}{'sum_in':>8}{'out_tok':>9}{'build_ms':>10}")
+
+    totals = {False: {"in": 0, "sum": 0, "out": 0}, True: {"in": 0, "sum": 0, "out": 0}}
+    for session in sessions:
+        for compact in (False, True):
+            r = measure(session, compact, args.iterations)
+            totals[compact]["in"] += r["input_tokens"]
+            totals[compact]["sum"] += r["summary_input_tokens"]
+            totals[compact]["out"] += r["output_tokens"]
+            mode = "compact" if compact else "full"
+            print(f"{session['session_id']:<14}{mode:<9}{r['input_tokens']:>8}{r['summary_input_tokens']:>8}"
+                  f"{r['output_tokens']:>9}{r['build_ms']:>10.3f}")
+            if args.live:
+                live = live_call(r["messages"], args.repeat)
+                print(f"{'':<14}{'live':<9}wall={live['wall_s']:.2f}s "
+                      f"prompt_tokens={live['prompt_tokens']} completion_tokens={live['completion_tokens']}")
+
+    full, compact = totals[False], totals[True]
+    print()
+    print(f"total input tokens   full={full['in']} compact={compact['in']} ({_pct(full['in'], compact['in'])})")
+    print(f"total summary input  full={full['sum']} compact={compact['sum']} ({_pct(full['sum'], compact['sum'])})")
+    print(f"total output tokens  full={full['out']} compact={compact['out']} ({_pct(full['out'], compact['out'])})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+서버 실행 방식 벤치마크: 개발 서버(run.py) vs 운영 서버(gunicorn -c gunicorn.conf.py)
+
+서버 (모드마다 임시 DB 로 별도 프로세스)
+- dev      : run.py 와 같음. app.run(debug=True) → Werkzeug 개발 서버 1 프로세스 + 디버거 + 파일 변경 감시 리로더
+- gunicorn : gunicorn.conf.py 그대로 (preload + gthread, --workers x --threads, max_requests)
+
+사용자 --users 명이 각자 --sessions-per-user 개 세션을 만들어 둔 뒤 (스텁 LLM 사용, 측정에서 제외)
+클라이언트 프로세스 --client-procs 개 x 스레드 --concurrency 개가 --duration 초 동안
+GET /info, GET /api/interview/sessions 를 번갈아 호출한다.
+출력: 엔드포인트별 처리량(rps), p50/p95/p99/max 지연 시간, 오류 수
+
+실행 (저장소 루트에서, gunicorn 필요):
+    python benchmarks/bench_server.py
+    python benchmarks/bench_server.py --workers 4 --threads 8 --concurrency 32 --duration 20
+클라이언트와 서버가 같은 머신의 CPU 를 나눠 쓰므로 코어 수가 적으면 워커 수를 늘려도 처리량이 크게 늘지 않는다.
+
+측정 결과 (CPU 1개, 클라이언트와 서버가 같은 코어를 나눠 씀, 지연 시간 ms)
+    python benchmarks/bench_server.py --workers 2 --threads 8 --duration 15
+    (2 워커 = CPU 1개일 때 SERVER_WORKERS 기본값, 두 번 실행)
+
+    mode      endpoint                        rps      p50      p95      p99      max
+    dev       GET /info                      104.4     67.5     91.3    103.2    137.0
+    dev       GET /api/interview/sessions    104.5     82.8    112.1    130.7    201.6
+    gunicorn  GET /info                      112.0     41.8    100.2    138.6    182.2
+    gunicorn  GET /api/interview/sessions    112.2     92.4    163.4    203.4    265.0
+    dev       GET /info                       80.6     87.7    109.8    131.1    206.4
+    dev       GET /api/interview/sessions     80.6    107.0    133.0    154.6    235.8
+    gunicorn  GET /info                      115.9     38.3    100.9    131.0    205.7
+    gunicorn  GET /api/interview/sessions    116.3     88.8    164.3    207.8    277.0
+
+- gc.freeze() 전(gunicorn.conf.py pre_fork)에는 gunicorn 의 max 가 800~1000 ms 였다.
+  느린 요청이 약 5초 간격으로 모든 요청에서 동시에 나타났고, fork 후 워커의 full GC 가 마스터와 공유하던
+  페이지를 copy-on-write 로 복사하며 전체를 멈춘 것이다 (dev 서버는 fork 하지 않으므로 없음).
+  gc.freeze() 후 max 가 200~280 ms 로 줄었다.
+- 남은 p95/p99 차이: 코어가 1개라 워커 2개가 CPU 를 번갈아 쓴다. keep-alive 연결은 처음 받은 워커에 고정되므로
+  연결이 더 몰린 워커의 요청은 더 오래 기다린다. dev 서버는 한 프로세스 안에서 GIL 이 5 ms 마다 16 개 스레드를
+  돌아가며 넘겨 주므로 모든 요청이 비슷하게 느려진다 (p50 은 높고 분포는 좁음). 가벼운 /info 는 p50 이 절반으로
+  줄고, 무거운 /sessions 는 분포가 넓어진다. 워커 수만큼 코어가 있으면 이 차이는 생기지 않는다.
+- SERVER_MAX_REQUESTS(2000) 에 가까워지는 긴 측정에서는 워커 교체 때 keep-alive 연결이 끊겨
+  RemoteDisconnected 오류가 몇 개 생길 수 있다 (클라이언트가 재시도하면 됨).
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import llm_stub  # noqa: E402
+from benchmarks.load_test import percentile  # noqa: E402
+
+MODES = ("dev", "gunicorn")
+ENDPOINTS = ("GET /info", "GET /api/interview/sessions")
+
+
+# -----------------------------
+# 서버 (자식 프로세스)
+# -----------------------------
+def serve_dev(port):
+    """run.py 와 같은 방식 (리로더가 이 스크립트를 --serve-dev 로 다시 실행함)"""
+    from app import create_app
+
+    app = create_app()
+    app.run(debug=True, host="127.0.0.1", port=port)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode, args, llm_base_url, workdir):
+    port = _free_port()
+    env = {
+        **os.environ,
+        "LLM_BASE_URL": llm_base_url,
+        "GEMINI_API_KEY": "stub",
+        "DATABASE_URL": "sqlite:///" + os.path.join(workdir, f"{mode}.db"),
+        "JWT_SECRET_KEY": "bench-" + "x" * 32,
+        "VIDEO_DIR": os.path.join(workdir, "videos"),
+        "PROFILING_DIR": os.path.join(workdir, "profiles"),
+        "QUESTION_POOL_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+        "SERVER_BIND": f"127.0.0.1:{port}",
+        "SERVER_WORKERS": str(args.workers),
+        "SERVER_THREADS": str(args.threads),
+    }
+    if mode == "dev":
+        command = [sys.executable, os.path.abspath(__file__), "--serve-dev", str(port)]
+    else:
+        command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"]
+    # 리로더/gunicorn 의 자식 프로세스까지 한 번에 종료하도록 새 세션으로 띄움
+    proc = subprocess.Popen(command, env=env, cwd=ROOT, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.perf_counter() + 60
+    while time.perf_counter() < deadline:
+        try:
+            requests.get(base + "/info", timeout=1)
+            return proc, base
+        except requests.RequestException:
+            time.sleep(0.2)
+    stop_server(proc)
+    raise RuntimeError(f"{mode} server did not start")
+
+
+def stop_server(proc):
+    try:
+        os.killpg(proc.pid, 15)
+        proc.wait(timeout=30)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(proc.pid, 9)
+
+
+# -----------------------------
+# 측정
+# -----------------------------
+def seed(base, args):
+    """사용자마다 세션을 만들어 두고 토큰 목록 반환 (세션 목록 조회가 빈 결과가 되지 않도록)"""
+    tokens = []
+    session = requests.Session()
+    for _ in range(args.users):
+        email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+        response = session.post(base + "/api/auth/join",
+                                json={"username": "bench", "email": email, "password": "bench"})
+        token = response.json()["data"]["token"]
+        for _ in range(args.sessions_per_user):
+            session.get(base + "/api/interview/start", headers={"Authorization": "Bearer " + token})
+        tokens.append(token)
+    return tokens
+
+
+def client_proc(base, tokens, threads, duration, seed_value):
+    """클라이언트 프로세스 하나: 스레드들이 duration 초 동안 두 엔드포인트를 번갈아 호출"""
+    results = {name: [] for name in ENDPOINTS}
+    errors = {name: 0 for name in ENDPOINTS}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def loop(index):
+        rng = random.Random(seed_value * 1000 + index)
+        session = requests.Session()
+        headers = {"Authorization": "Bearer " + rng.choice(tokens)}
+        turn = index
+        while time.perf_counter() < deadline:
+            name = ENDPOINTS[turn % 2]
+            turn += 1
+            url = base + ("/info" if name == "GET /info" else "/api/interview/sessions")
+            started = time.perf_counter()
+            try:
+                ok = session.get(url, headers=headers, timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                results[name].append(elapsed)
+                if not ok:
+                    errors[name] += 1
+
+    workers = [threading.Thread(target=loop, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return results, errors
+
+
+def run_mode(mode, args, llm_base_url, workdir):
+    proc, base = start_server(mode, args, llm_base_url, workdir)
+    try:
+        tokens = seed(base, args)
+        per_proc = max(1, args.concurrency // args.client_procs)
+        with multiprocessing.Pool(args.client_procs) as pool:
+            started = time.perf_counter()
+            outputs = pool.starmap(client_proc, [
+                (base, tokens, per_proc, args.duration, i) for i in range(args.client_procs)
+            ])
+            wall = time.perf_counter() - started
+    finally:
+        stop_server(proc)
+
+    rows = []
+    for name in ENDPOINTS:
+        latencies = [v for results, _ in outputs for v in results[name]]
+        errors = sum(errs[name] for _, errs in outputs)
+        rows.append({
+            "mode": mode,
+            "endpoint": name,
+            "count": len(latencies),
+            "errors": errors,
+            "rps": len(latencies) / wall,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies) if latencies else None,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn 워커 프로세스 수 (SERVER_WORKERS)")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn 워커당 스레드 수 (SERVER_THREADS)")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--sessions-per-user", type=int, default=5)
+    parser.add_argument("--client-procs", type=int, default=2, help="부하를 보내는 클라이언트 프로세스 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="전체 동시 클라이언트 스레드 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="모드마다 측정 시간 (초)")
+    parser.add_argument("--mode", choices=MODES, help="한 모드만 측정")
+    parser.add_argument("--serve-dev", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_dev:
+        serve_dev(args.serve_dev)
+        return
+
+    stub, llm_base_url = llm_stub.start(settings=llm_stub.StubSettings(latency=0, tokens_per_sec=0))
+    workdir = tempfile.mkdtemp(prefix="bench_server_")
+    print(f"cpus={os.cpu_count()} workers={args.workers} threads={args.threads} "
+          f"concurrency={args.concurrency} client_procs={args.client_procs} duration={args.duration}s")
+    print(f"{'mode':<10}{'endpoint':<30}{'count':>7}{'err':>5}{'rps':>8}"
+          f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    try:
+        for mode in ([args.mode] if args.mode else MODES):
+            for r in run_mode(mode, args, llm_base_url, workdir):
+
+                def ms(value):
+                    return f"{value * 1000:>9.1f}" if value is not None else f"{'-':>9}"
+
+                print(f"{r['mode']:<10}{r['endpoint']:<30}{r['count']:>7}{r['errors']:>5}{r['rps']:>8.1f}"
+                      f"{ms(r['p50'])}{ms(r['p95'])}{ms(r['p99'])}{ms(r['max'])}")
+    finally:
+        stub.shutdown()
+    print("(latency in ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+부하 테스트용 로컬 OpenAI 호환 LLM 스텁 서버 (POST /v1/chat/completions)
+
+- 실제 모델 대신 요청에 맞는 JSON 을 만들어 돌려준다
+  · response_format=json_schema 면 그 스키마를 만족하는 값을 스키마에서 바로 생성
+  · json_object 면 프롬프트에 붙어 있는 JSON 스키마를 찾아 같은 방식으로 생성
+  · response_format 이 없으면 질문 스트리밍(stream_questions) 용 줄 단위 텍스트
+- 지연 시간: 첫 토큰까지 --latency 초, 이후 --tokens-per-sec 속도로 출력 (스트리밍/비스트리밍 모두)
+- usage(prompt/completion 토큰 수)는 글자 수 기반 추정치
+
+단독 실행 (저장소 루트에서):
+    python benchmarks/llm_stub.py --port 9000 --latency 0.5 --tokens-per-sec 80
+    LLM_BASE_URL=http://127.0.0.1:9000/v1/ GEMINI_API_KEY=stub python run.py
+"""
+
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 한국어 위주라 글자 2개를 토큰 1개로 본다 (usage 와 출력 속도 계산용)
+CHARS_PER_TOKEN = 2
+FILLER = "지원자는 상황을 구체적으로 설명했고 근거도 분명했음. "
+
+
+class StubSettings:
+    def __init__(self, latency=0.5, tokens_per_sec=80.0, text_chars=120, chunk_tokens=8):
+        self.latency = latency                # 첫 토큰까지 걸리는 시간 (초)
+        self.tokens_per_sec = tokens_per_sec  # 출력 속도 (0 이하면 바로 전부 출력)
+        self.text_chars = text_chars          # 생성하는 문자열 필드 하나의 길이
+        self.chunk_tokens = chunk_tokens      # 스트리밍 chunk 하나의 토큰 수
+        self.lock = threading.Lock()
+        self.requests = 0
+
+
+# -----------------------------
+# 응답 내용 생성
+# -----------------------------
+def _text(settings, label=""):
+    body = (FILLER * (settings.text_chars // len(FILLER) + 1))[:settings.text_chars]
+    return f"{label} {body}".strip() if label else body
+
+
+def instance_for(schema, settings, index=1, key=""):
+    """JSON 스키마(프롬프트에서 쓰는 부분집합)를 만족하는 값 하나"""
+    kind = schema.get("type")
+    if "enum" in schema:
+        return schema["enum"][0]
+    if kind == "object":
+        props = schema.get("properties", {})
+        keys = list(schema.get("required", [])) + [k for k in props if k not in schema.get("required", [])]
+        return {k: instance_for(props.get(k, {}), settings, index, k) for k in keys}
+    if kind == "array":
+        count = max(schema.get("minItems", 1), 1)
+        if "maxItems" in schema:
+            count = min(count, schema["maxItems"])
+        return [instance_for(schema.get("items", {}), settings, i) for i in range(1, count + 1)]
+    if kind == "integer":
+        return index if key == "index" else int(schema.get("minimum", 0)) + 1
+    if kind == "number":
+        return max(schema.get("minimum", 0), min(75, schema.get("maximum", 100)))
+    if kind == "boolean":
+        return True
+    if key == "question":
+        return f"면접 질문 {index}: {_text(settings)}?"
+    return _text(settings, key)
+
+
+def _schema_in_prompt(messages):
+    """json_object 요청: 메시지 끝에 붙은 JSON 스키마를 찾는다 (없으면 None)"""
+    decoder = json.JSONDecoder()
+    for message in reversed(messages):
+        content = message.get("content") or ""
+        start = content.rfind('{"type"')
+        while start != -1:
+            try:
+                schema, _ = decoder.raw_decode(content, start)
+                return schema
+            except ValueError:
+                start = content.rfind('{"type"', 0, start)
+    return None
+
+
+def build_content(body, settings):
+    response_format = body.get("response_format") or {}
+    schema = None
+    if response_format.get("type") == "json_schema":
+        schema = response_format.get("json_schema", {}).get("schema")
+    elif response_format.get("type") == "json_object":
+        schema = _schema_in_prompt(body.get("messages", []))
+        if schema is None:
+            return "{}"
+    if schema is not None:
+        return json.dumps(instance_for(schema, settings), ensure_ascii=False)
+    # 텍스트 형식 질문 생성 (stream_questions)
+    return "\n".join(
+        f"면접 질문 {i}: {_text(settings)}?\n모범 답 {i}: {_text(settings)}\n" for i in (1, 2, 3)
+    )
+
+
+def _tokens(text):
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+# -----------------------------
+# HTTP
+# -----------------------------
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    settings = StubSettings()
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, obj):
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid JSON body"}})
+            return
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+
+        settings = self.settings
+        with settings.lock:
+            settings.requests += 1
+        content = build_content(body, settings)
+        model = body.get("model", "stub")
+        prompt_tokens = sum(_tokens(m.get("content") or "") for m in body.get("messages", []))
+        completion_tokens = _tokens(content)
+        per_token = 1.0 / settings.tokens_per_sec if settings.tokens_per_sec > 0 else 0.0
+
+        time.sleep(settings.latency)
+        if body.get("stream"):
+            self._stream(model, content, per_token)
+            return
+
+        time.sleep(completion_tokens * per_token)
+        self._send_json(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _stream(self, model, content, per_token):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        step = self.settings.chunk_tokens * CHARS_PER_TOKEN
+        for i in range(0, len(content), step):
+            piece = content[i:i + step]
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(_tokens(piece) * per_token)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class StubServer(ThreadingHTTPServer):
+    # 기본 listen backlog(5)로는 동시에 수백 개 연결하면 거절되어 재시도가 섞임
+    request_queue_size = 1024
+
+
+def start(host="127.0.0.1", port=0, settings=None):
+    """백그라운드 스레드로 서버를 띄우고 (server, base_url) 반환"""
+    handler = type("Handler", (StubHandler,), {"settings": settings or StubSettings()})
+    server = StubServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="llm-stub", daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/v1/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.5, help="첫 토큰까지 지연 (초)")
+    parser.add_argument("--tokens-per-sec", type=float, default=80.0, help="출력 토큰 속도 (0 이면 제한 없음)")
+    parser.add_argument("--text-chars", type=int, default=120, help="생성하는 문자열 필드 길이")
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency, args.tokens_per_sec, args.text_chars)
+    server, base_url = start(args.host, args.port, settings)
+    print(f"LLM stub listening on {base_url} (latency={args.latency}s, {args.tokens_per_sec} tok/s)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
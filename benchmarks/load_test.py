@@ -0,0 +1,273 @@
+"""
+오프라인 end-to-end 부하 테스트 (외부 LLM/DB 없이 실행)
+
+임시 디렉터리의 SQLite DB 와 로컬 LLM 스텁(benchmarks/llm_stub.py)으로 앱을 띄우고,
+가상 사용자 N 명이 동시에 실제 흐름을 반복한다:
+    join → login → GET /api/interview/start
+    → POST /api/interview/answer × 질문 수 (작은 영상 첨부)
+    → GET /api/analysis/info (202 이면 완료될 때까지 폴링)
+    → GET /api/interview/sessions
+엔드포인트별 요청 수/오류 수/처리량과 p50/p95/p99 지연 시간, 그리고
+마지막 답변 제출부터 분석 결과를 받기까지 걸린 시간(analysis ready)을 출력한다.
+
+실행 (저장소 루트에서):
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --users 20 --sessions 3 --llm-latency 1.0 --llm-tokens-per-sec 50
+    python benchmarks/load_test.py --no-pool --json load_result.json
+
+앱 설정은 환경 변수로 바꿀 수 있다 (예: ANALYSIS_WORKERS=8 LLM_MAX_CONCURRENCY=32).
+이미 떠 있는 서버를 대상으로 하려면 --target http://host:port (그 서버의 LLM_BASE_URL 은 직접 스텁으로 맞출 것).
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import argparse
+import tempfile
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import llm_stub  # noqa: E402
+
+ANALYSIS_READY = "analysis ready (last answer → result)"
+
+
+# -----------------------------
+# 결과 수집
+# -----------------------------
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def add(self, name, seconds, ok=True):
+        with self._lock:
+            self.latencies.setdefault(name, []).append(seconds)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def call(self, session, name, method, url, expected=(200,), **kwargs):
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self.add(name, time.perf_counter() - started, ok=False)
+            raise
+        self.add(name, time.perf_counter() - started, ok=response.status_code in expected)
+        return response
+
+
+def percentile(values, pct):
+    """nearest-rank 백분위수"""
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5 - 1e-9)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(recorder, wall):
+    rows = []
+    for name, values in recorder.latencies.items():
+        rows.append({
+            "endpoint": name,
+            "count": len(values),
+            "errors": recorder.errors.get(name, 0),
+            "rps": round(len(values) / wall, 3) if wall else 0.0,
+            "mean_ms": round(statistics.mean(values) * 1000, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(max(values) * 1000, 2),
+        })
+    return rows
+
+
+def print_report(rows, wall, args, flows):
+    print()
+    print(f"users={args.users} sessions/user={args.sessions} llm_latency={args.llm_latency}s "
+          f"llm_tok/s={args.llm_tokens_per_sec} video={args.video_kb}KB pool={'off' if args.no_pool else 'on'}")
+    print(f"wall={wall:.2f}s completed_flows={flows['ok']} failed_flows={flows['failed']} "
+          f"flows/s={flows['ok'] / wall:.3f}")
+    header = f"{'endpoint':<42}{'count':>7}{'err':>5}{'rps':>9}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['endpoint']:<42}{r['count']:>7}{r['errors']:>5}{r['rps']:>9.2f}{r['mean_ms']:>10.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}")
+    print("(latency in ms)")
+
+
+# -----------------------------
+# 가상 사용자 흐름
+# -----------------------------
+def run_user(base, user_no, args, recorder, video):
+    session = requests.Session()
+    email = f"load-{user_no}-{uuid.uuid4().hex[:8]}@example.com"
+    password = "load-test"
+
+    recorder.call(session, "POST /api/auth/join", "POST", f"{base}/api/auth/join",
+                  json={"username": f"load{user_no}", "email": email, "password": password})
+    response = recorder.call(session, "POST /api/auth/login", "POST", f"{base}/api/auth/login",
+                             json={"email": email, "password": password})
+    session.headers["Authorization"] = "Bearer " + response.json()["data"]["token"]
+
+    ok = failed = 0
+    for _ in range(args.sessions):
+        try:
+            run_session(session, base, args, recorder, video)
+            ok += 1
+        except Exception as e:
+            failed += 1
+            print(f"[user {user_no}] flow failed: {e}", file=sys.stderr)
+    return ok, failed
+
+
+def run_session(session, base, args, recorder, video):
+    response = recorder.call(session, "GET /api/interview/start", "GET", f"{base}/api/interview/start",
+                             timeout=args.request_timeout)
+    data = response.json()["data"]
+    session_id = data["session_id"]
+
+    for i, q in enumerate(data["questionList"]):
+        response = recorder.call(
+            session, "POST /api/interview/answer", "POST", f"{base}/api/interview/answer",
+            data={"interview_id": q["interview_id"], "useranswer": f"부하 테스트 답변 {i + 1}. " * 10,
+                  "type": q.get("type", "normal"), "session_id": session_id},
+            files={"video": (f"answer{i + 1}.webm", video, "video/webm")},
+            timeout=args.request_timeout,
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"answer {i + 1} returned {response.status_code}")
+    answered = time.perf_counter()
+
+    deadline = answered + args.analysis_timeout
+    while True:
+        response = recorder.call(session, "GET /api/analysis/info", "GET", f"{base}/api/analysis/info",
+                                 expected=(200, 202), params={"session_id": session_id},
+                                 timeout=args.request_timeout)
+        if response.status_code == 200:
+            recorder.add(ANALYSIS_READY, time.perf_counter() - answered)
+            break
+        if response.status_code != 202 or time.perf_counter() > deadline:
+            recorder.add(ANALYSIS_READY, time.perf_counter() - answered, ok=False)
+            raise RuntimeError(f"analysis not ready (status {response.status_code})")
+        time.sleep(args.poll_interval)
+
+    recorder.call(session, "GET /api/interview/sessions", "GET", f"{base}/api/interview/sessions",
+                  timeout=args.request_timeout)
+
+
+def wait_pool_idle(base, timeout):
+    """질문 풀 리필이 끝날 때까지 대기 (시작 직후 워밍업 / 종료 전 임시 DB 삭제 전)"""
+    session = requests.Session()
+    email = f"load-warmup-{uuid.uuid4().hex[:8]}@example.com"
+    response = session.post(f"{base}/api/auth/join",
+                            json={"username": "load-warmup", "email": email, "password": "load-test"})
+    session.headers["Authorization"] = "Bearer " + response.json()["data"]["token"]
+    deadline = time.perf_counter() + timeout
+    while True:
+        stats = session.get(f"{base}/api/interview/pool").json()["data"]
+        if not stats["enabled"] or stats["refilling"] == 0 or time.perf_counter() > deadline:
+            return stats
+        time.sleep(0.2)
+
+
+# -----------------------------
+# 앱 기동
+# -----------------------------
+def start_app(args, workdir, llm_base_url):
+    """임시 DB/영상 폴더 + 스텁 LLM 으로 앱을 띄우고 base URL 반환"""
+    # llm_client / structured_output 은 import 시점에 환경 변수를 읽으므로 앱 import 전에 설정
+    os.environ["LLM_BASE_URL"] = llm_base_url
+    os.environ["GEMINI_API_KEY"] = "stub"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ["QUESTION_POOL_ENABLED"] = "false" if args.no_pool else "true"
+
+    import config
+    config.Config.SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(workdir, "load_test.db")
+    config.Config.JWT_SECRET_KEY = config.Config.JWT_SECRET_KEY or "load-test-secret-" + "x" * 32
+    config.Config.VIDEO_DIR = os.path.join(workdir, "videos")
+    config.Config.PROFILING_DIR = os.path.join(workdir, "profiles")
+
+    import logging
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    app = create_app()
+    # 요청마다 찍히는 werkzeug 접근 로그는 측정에 방해가 되므로 끔
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="load-test-app", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="동시 가상 사용자 수")
+    parser.add_argument("--sessions", type=int, default=2, help="사용자당 면접 세션 반복 횟수")
+    parser.add_argument("--video-kb", type=int, default=64, help="답변마다 첨부하는 영상 크기 (KB)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="스텁 LLM 첫 토큰 지연 (초)")
+    parser.add_argument("--llm-tokens-per-sec", type=float, default=200.0, help="스텁 LLM 출력 속도 (0 이면 제한 없음)")
+    parser.add_argument("--no-pool", action="store_true", help="질문 풀 끄기 (start 마다 LLM 직접 호출)")
+    parser.add_argument("--pool-warmup", type=float, default=60.0, help="시작 전 질문 풀이 찰 때까지 기다리는 최대 시간 (초)")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="analysis/info 폴링 간격 (초)")
+    parser.add_argument("--analysis-timeout", type=float, default=120.0, help="분석 완료를 기다리는 최대 시간 (초)")
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--target", help="이미 떠 있는 서버 URL (주면 앱/스텁을 띄우지 않음)")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--keep", action="store_true", help="임시 DB/영상 폴더를 지우지 않음")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="load_test_")
+    servers = []
+    try:
+        if args.target:
+            base = args.target.rstrip("/")
+        else:
+            stub, llm_base_url = llm_stub.start(settings=llm_stub.StubSettings(
+                latency=args.llm_latency, tokens_per_sec=args.llm_tokens_per_sec
+            ))
+            app_server, base = start_app(args, workdir, llm_base_url)
+            servers = [app_server, stub]
+        print(f"target={base} workdir={workdir}")
+        if not args.no_pool:
+            stats = wait_pool_idle(base, args.pool_warmup)
+            print(f"question pool ready: size={stats['size']} refilling={stats['refilling']}")
+
+        video = os.urandom(args.video_kb * 1024)
+        recorder = Recorder()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as executor:
+            results = list(executor.map(lambda n: run_user(base, n, args, recorder, video), range(args.users)))
+        wall = time.perf_counter() - started
+
+        flows = {"ok": sum(r[0] for r in results), "failed": sum(r[1] for r in results)}
+        rows = summarize(recorder, wall)
+        print_report(rows, wall, args, flows)
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump({"args": vars(args), "wall_s": round(wall, 3), "flows": flows, "endpoints": rows},
+                          f, ensure_ascii=False, indent=2)
+            print(f"saved {args.json_path}")
+    finally:
+        if servers and not args.no_pool:
+            # 남은 리필 작업이 임시 DB 를 지운 뒤에 쓰지 않도록 끝날 때까지 기다림
+            wait_pool_idle(base, args.pool_warmup)
+        for server in servers:
+            server.shutdown()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+운영 서버 설정 (run.py 의 app.run(debug=True) 는 개발용: 단일 프로세스 + 코드 변경 시 재시작)
+    gunicorn -c gunicorn.conf.py
+
+- preload: 마스터에서 create_app() (마이그레이션 포함)을 한 번만 하고 워커는 fork 로 띄운다
+  (질문 풀 리필처럼 스레드를 쓰는 작업은 워커에서 첫 요청 때 시작)
+- fork 직전에 gc.freeze(): 마스터에서 만든 객체를 GC 대상에서 빼서, 워커의 첫 full GC 가 공유 페이지를 전부
+  copy-on-write 로 복사하며 모든 요청을 수백 ms 멈추게 하지 않도록 함 (benchmarks/bench_server.py 결과 참고)
+- 워커: SERVER_WORKERS 개 프로세스 x SERVER_THREADS 스레드 (gthread)
+- 워커마다 SERVER_MAX_REQUESTS (+ 0~JITTER) 개를 처리하면 처리 중인 요청을 마친 뒤 새 워커로 교체
+- 무중단 재시작: kill -HUP <마스터 pid>  → 새 워커를 띄우고 기존 워커는 SERVER_GRACEFUL_TIMEOUT 안에서 마무리
+  (preload 라 HUP 으로는 코드가 다시 로드되지 않음. 배포 시에는 USR2 로 새 마스터를 띄운 뒤 기존 마스터에 TERM)
+- 설정 값은 config.py / .env (SERVER_*)
+- LLM 을 오래 기다리는 요청이 많으면 ASGI 모드(asgi.py)도 참고
+"""
+
+import gc
+
+from config import Config
+
+wsgi_app = "run:app"
+
+bind = Config.SERVER_BIND
+workers = Config.SERVER_WORKERS
+worker_class = "gthread"
+threads = Config.SERVER_THREADS
+preload_app = True
+
+max_requests = Config.SERVER_MAX_REQUESTS
+max_requests_jitter = Config.SERVER_MAX_REQUESTS_JITTER
+timeout = Config.SERVER_TIMEOUT
+graceful_timeout = Config.SERVER_GRACEFUL_TIMEOUT
+keepalive = Config.SERVER_KEEPALIVE
+
+# 앱 로그는 app/log.py 가 stdout 으로 내보내므로 gunicorn 은 자체 로그만
+accesslog = None
+errorlog = "-"
+
+
+def pre_fork(server, worker):
+    """preload 한 앱 객체를 permanent generation 으로 옮김 (워커 GC 가 훑지 않으므로 공유 페이지가 복사되지 않음)"""
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """마스터에서 연 DB 연결(create_all, 마이그레이션)을 워커가 같이 쓰지 않도록 풀을 비움"""
+    from app import db
+
+    app = server.app.wsgi()
+    with app.app_context():
+        # close=False: 마스터가 쓰는 연결을 워커에서 닫지 않고 버리기만 함
+        db.engine.dispose(close=False)
+    server.log.info("Worker %s forked", worker.pid)
@@ -1,3 +1,8 @@
+"""
+개발 서버 (단일 프로세스 + 디버거 + 코드 변경 시 재시작)
+운영에서는 gunicorn -c gunicorn.conf.py (멀티 프로세스, gunicorn.conf.py 참고)
+"""
+
 from app import create_app
 
 app = create_app()
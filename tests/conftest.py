@@ -0,0 +1,95 @@
+"""
+테스트 공용 fixture
+- 테스트마다 임시 폴더의 SQLite DB 로 create_app() (마이그레이션 포함)
+- 질문 풀/답변 단위 분석처럼 백그라운드에서 LLM 을 부르는 기능은 끔
+"""
+
+import os
+
+# llm_client / structured_output 등은 import 시점에 환경 변수를 읽으므로 앱 import 전에 설정
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+import pytest  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+import config  # noqa: E402
+
+
+@pytest.fixture
+def app_factory(tmp_path, monkeypatch):
+    """
+    임시 폴더(tmp_path/test.db)를 쓰도록 설정하고 create_app() 을 부르는 함수를 반환.
+    같은 테스트에서 여러 번 부르면 같은 DB 로 앱을 다시 띄운다 (재시작/마이그레이션 재실행 확인용)
+    """
+    monkeypatch.setattr(config.Config, "SQLALCHEMY_DATABASE_URI", "sqlite:///" + str(tmp_path / "test.db"))
+    monkeypatch.setattr(config.Config, "JWT_SECRET_KEY", "test-secret-" + "x" * 32)
+    monkeypatch.setattr(config.Config, "VIDEO_DIR", str(tmp_path / "videos"))
+    monkeypatch.setattr(config.Config, "PROFILING_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setattr(config.Config, "QUESTION_POOL_ENABLED", False)
+    monkeypatch.setattr(config.Config, "ANALYSIS_PER_ANSWER", False)
+
+    from app import create_app, db
+
+    apps = []
+
+    def factory():
+        app = create_app()
+        app.config["TESTING"] = True
+        apps.append(app)
+        return app
+
+    yield factory
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+@pytest.fixture
+def app(app_factory):
+    return app_factory()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user(app):
+    """테스트 사용자 하나를 만들고 (id, Authorization 헤더) 반환"""
+    from app import db
+    from app.models import User
+
+    with app.app_context():
+        row = User(username="tester", email="tester@example.com", password="x")
+        db.session.add(row)
+        db.session.commit()
+        token = create_access_token(identity=str(row.id))
+        return row.id, {"Authorization": "Bearer " + token}
+
+
+@pytest.fixture
+def count_queries(app):
+    """with count_queries() as statements: ... → 블록 안에서 실행된 SQL 문 목록"""
+    from contextlib import contextmanager
+    from app import db
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
@@ -0,0 +1,49 @@
+"""프로파일 관리자 API: 프로파일링이 꺼져 있거나 토큰이 없으면 404, 토큰이 다르면 401"""
+
+from collections import deque
+
+import pytest
+
+from app import profiling
+
+
+@pytest.fixture
+def profiles(app, monkeypatch):
+    profile = {
+        "id": "p-1", "started_at": "2024-01-01T00:00:00", "method": "GET", "path": "/api/interview/sessions",
+        "route": "/api/interview/sessions", "status": 200, "duration_ms": 1500.0, "reason": "slow",
+        "sql": [], "sql_dropped": 0, "llm": [], "samples": 3,
+    }
+    monkeypatch.setattr(profiling, "_recent", deque([profile]))
+    app.config["PROFILING_ENABLED"] = True
+    app.config["PROFILING_ADMIN_TOKEN"] = "admin-token"
+    return profile
+
+
+def test_profiles_hidden_when_disabled_or_without_token(app, client, profiles):
+    headers = {"Authorization": "Bearer admin-token"}
+    app.config["PROFILING_ENABLED"] = False
+    assert client.get("/api/admin/profiles", headers=headers).status_code == 404
+
+    app.config["PROFILING_ENABLED"] = True
+    app.config["PROFILING_ADMIN_TOKEN"] = None
+    for path in ("/api/admin/profiles", "/api/admin/profiles/p-1"):
+        response = client.get(path, headers={"Authorization": "Bearer None"})
+        assert response.status_code == 404
+        assert response.get_json()["message"] == "Profiling disabled"
+
+
+def test_profiles_require_matching_token(client, profiles):
+    for headers in ({}, {"Authorization": "Bearer wrong"}, {"Authorization": "admin-token"}):
+        assert client.get("/api/admin/profiles", headers=headers).status_code == 401
+        assert client.get("/api/admin/profiles/p-1", headers=headers).status_code == 401
+
+    headers = {"Authorization": "Bearer admin-token"}
+    response = client.get("/api/admin/profiles", headers=headers)
+    assert response.status_code == 200
+    assert [(p["id"], p["sql_count"], p["samples"]) for p in response.get_json()["data"]] == [("p-1", 0, 3)]
+
+    assert client.get("/api/admin/profiles/p-1", headers=headers).get_json()["data"] == profiles
+    response = client.get("/api/admin/profiles/missing", headers=headers)
+    assert response.status_code == 404
+    assert response.get_json()["message"] == "Profile not found"
@@ -0,0 +1,149 @@
+"""세션 분석 작업이 DB 에 남은 답변 분석 표시(interview.analysis_requested_at)를 보고 기다리는지"""
+
+import time
+import datetime
+import threading
+
+from app import db
+from app.models import Interview, InterviewSession, AnalysisJob
+from app.services import analysis_jobs, interview_sessions
+
+
+def _add_interview(app, user_id, requested_at=None):
+    with app.app_context():
+        row = Interview(user_id=user_id, session_id="s-1", question_order=0, question="질문",
+                        useranswer="답변", analysis_requested_at=requested_at)
+        db.session.add(row)
+        db.session.commit()
+        return row.id
+
+
+def test_wait_returns_when_other_worker_clears_marker(app, user, monkeypatch):
+    user_id, _ = user
+    monkeypatch.setattr(analysis_jobs, "ANSWER_POLL_INTERVAL", 0.05)
+    interview_id = _add_interview(app, user_id, datetime.datetime.utcnow())
+
+    def finish_answer():
+        # 다른 프로세스의 답변 분석 작업처럼 별도 연결에서 표시를 지움
+        time.sleep(0.3)
+        with app.app_context():
+            Interview.query.filter_by(id=interview_id).update({"analysis_requested_at": None})
+            db.session.commit()
+
+    worker = threading.Thread(target=finish_answer)
+    worker.start()
+    with app.app_context():
+        assert analysis_jobs.pending_answer_count(user_id, "s-1") == 1
+        started = time.monotonic()
+        analysis_jobs._wait_pending_answers(user_id, "s-1", timeout=5)
+        elapsed = time.monotonic() - started
+    worker.join()
+    assert 0.2 < elapsed < 2
+
+
+def test_stale_marker_is_not_waited_for(app, user):
+    user_id, _ = user
+    old = datetime.datetime.utcnow() - datetime.timedelta(seconds=app.config["ANALYSIS_JOB_TIMEOUT"] + 60)
+    _add_interview(app, user_id, old)
+    with app.app_context():
+        assert analysis_jobs.pending_answer_count(user_id, "s-1") == 0
+
+
+def test_answer_job_clears_only_its_own_marker(app, user, monkeypatch):
+    user_id, _ = user
+    monkeypatch.setattr(analysis_jobs, "analyze_answer", lambda interview_id: False)
+    first = datetime.datetime(2024, 1, 1, 0, 0, 0, 1)
+    second = datetime.datetime(2024, 1, 1, 0, 0, 0, 2)
+    interview_id = _add_interview(app, user_id, second)
+
+    # 다시 제출되기 전의 작업이 끝나도 새 요청의 표시는 남음
+    analysis_jobs._run_answer_job(app, "s-1", interview_id, first)
+    with app.app_context():
+        assert db.session.get(Interview, interview_id).analysis_requested_at == second
+
+    analysis_jobs._run_answer_job(app, "s-1", interview_id, second)
+    with app.app_context():
+        assert db.session.get(Interview, interview_id).analysis_requested_at is None
+
+
+def _add_session(app, user_id, answers_version=0):
+    with app.app_context():
+        db.session.add(InterviewSession(id="s-1", user_id=user_id, answers_version=answers_version))
+        db.session.commit()
+
+
+def test_outdated_session_analysis_is_not_recorded(app, user):
+    user_id, _ = user
+    _add_interview(app, user_id)
+    _add_session(app, user_id)
+    with app.app_context():
+        # 분석이 시작된 뒤 답변이 다시 제출됨
+        interview_sessions.refresh("s-1", analysis_stale=True)
+        db.session.commit()
+        assert interview_sessions.record_analysis("s-1", {"summary": "이전 답변"}, 0) is None
+        assert interview_sessions.record_analysis("s-1", {"summary": "최신 답변"}, 1) is not None
+        db.session.commit()
+        session = db.session.get(InterviewSession, "s-1")
+        assert (session.summary, session.status) == ("최신 답변", "analyzed")
+
+
+def test_enqueue_queues_follow_up_for_outdated_running_job(app, user, monkeypatch):
+    user_id, _ = user
+    monkeypatch.setattr(analysis_jobs, "_run_job", lambda app, job_id: None)
+    _add_session(app, user_id, answers_version=2)
+    with app.app_context():
+        running = AnalysisJob(id="job-1", user_id=user_id, session_id="s-1", status="running", answers_version=2)
+        db.session.add(running)
+        db.session.commit()
+        # 최신 답변으로 실행 중이면 그 작업을 그대로 반환
+        assert analysis_jobs.enqueue_analysis(user_id, "s-1").id == "job-1"
+
+        interview_sessions.refresh("s-1", analysis_stale=True)
+        db.session.commit()
+        follow_up = analysis_jobs.enqueue_analysis(user_id, "s-1")
+        assert follow_up.id != "job-1" and follow_up.status == "queued"
+        # 후속 작업이 대기 중이면 다시 만들지 않음
+        assert analysis_jobs.enqueue_analysis(user_id, "s-1").id == follow_up.id
+
+
+def test_job_is_failed_when_setup_raises(app, user, monkeypatch):
+    user_id, _ = user
+    _add_session(app, user_id)
+
+    def locked(session_id):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(interview_sessions, "answers_version", locked)
+    with app.app_context():
+        db.session.add(AnalysisJob(id="job-1", user_id=user_id, session_id="s-1", status="queued"))
+        db.session.commit()
+    analysis_jobs._run_job(app, "job-1")
+    with app.app_context():
+        job = db.session.get(AnalysisJob, "job-1")
+        assert (job.status, job.error) == ("failed", "database is locked")
+
+
+def test_failed_job_is_not_requeued_until_retry_after(app, client, user, monkeypatch):
+    user_id, headers = user
+    monkeypatch.setattr(analysis_jobs, "_run_job", lambda app, job_id: None)
+    _add_interview(app, user_id)
+    _add_session(app, user_id, answers_version=1)
+    with app.app_context():
+        db.session.add(AnalysisJob(id="job-1", user_id=user_id, session_id="s-1", status="failed",
+                                   error="LLM unavailable", answers_version=1))
+        db.session.commit()
+
+    for _ in range(3):
+        response = client.get("/api/analysis/info?session_id=s-1", headers=headers)
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) > 0
+        assert response.get_json()["data"]["job_id"] == "job-1"
+    with app.app_context():
+        assert AnalysisJob.query.count() == 1
+
+    # 기다린 뒤에는 한 번만 다시 큐에 넣음
+    app.config["ANALYSIS_RETRY_AFTER"] = 0
+    assert client.get("/api/analysis/info?session_id=s-1", headers=headers).status_code == 202
+    assert client.get("/api/analysis/info?session_id=s-1", headers=headers).status_code == 202
+    with app.app_context():
+        assert AnalysisJob.query.count() == 2
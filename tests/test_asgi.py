@@ -0,0 +1,169 @@
+"""
+ASGI 모드: 요청 본문을 Flask 가 읽는 만큼만 receive() 로 받고 응답을 그대로 돌려주는지,
+미리 꺼낸 질문 세트가 실패한 요청에서 풀로 돌아가는지, 미리 받는 LLM 호출이 프로파일에 남는지
+"""
+
+import json
+import asyncio
+from types import SimpleNamespace
+
+from flask_jwt_extended import create_refresh_token
+
+from app import db, profiling
+from app.asgi import create_asgi_app
+from app.models import AnalysisJob, Interview, QuestionSet
+from app.services import analysis_jobs, interview_sessions, llm_client, question_pool
+
+QUESTIONS = [{"question": f"질문 {i}", "answer": f"답 {i}", "type": "간호사"} for i in range(3)]
+
+
+def _call(asgi, method, path, headers, messages):
+    """messages 를 receive() 로 하나씩 넘기고 (status, body, receive 호출 수) 반환"""
+    scope = {
+        "type": "http", "method": method, "path": path, "root_path": "", "query_string": b"",
+        "http_version": "1.1", "scheme": "http", "server": ("testserver", 80), "client": ("127.0.0.1", 5000),
+        "headers": [(k.lower().encode("latin1"), v.encode("latin1")) for k, v in headers.items()],
+    }
+    pending = list(messages)
+    received, sent = [], []
+
+    async def receive():
+        received.append(1)
+        return pending.pop(0) if pending else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi(scope, receive, send))
+    assert sent[0]["type"] == "http.response.start"
+    return sent[0]["status"], b"".join(m.get("body", b"") for m in sent[1:]), len(received)
+
+
+def _upload(app, client, user):
+    user_id, headers = user
+    with app.app_context():
+        row = Interview(user_id=user_id, session_id="s-1", question_order=0, question="질문")
+        db.session.add(row)
+        db.session.commit()
+        interview_id = row.id
+    response = client.post("/api/interview/video/upload", headers=headers,
+                           json={"interview_id": interview_id, "filename": "answer.webm", "size": 10})
+    return response.get_json()["data"]["upload_id"]
+
+
+def test_request_body_is_streamed_from_receive(app, client, user):
+    _, headers = user
+    upload_id = _upload(app, client, user)
+    asgi = create_asgi_app(app)
+    status, body, _ = _call(asgi, "PATCH", f"/api/interview/video/upload/{upload_id}",
+                            {**headers, "Upload-Offset": "0", "Content-Length": "10"},
+                            [{"type": "http.request", "body": b"01234", "more_body": True},
+                             {"type": "http.request", "body": b"56789", "more_body": False}])
+    assert status == 200
+    assert b'"offset":10' in body.replace(b" ", b"")
+
+
+def test_oversized_chunk_is_rejected_before_reading_body(app, client, user):
+    _, headers = user
+    upload_id = _upload(app, client, user)
+    asgi = create_asgi_app(app)
+    status, _, receives = _call(asgi, "PATCH", f"/api/interview/video/upload/{upload_id}",
+                                {**headers, "Upload-Offset": "0", "Content-Length": "11"},
+                                [{"type": "http.request", "body": b"x" * 11, "more_body": False}])
+    assert status == 413
+    assert receives == 0
+
+
+def _pool(app, monkeypatch, sets=1):
+    app.config["QUESTION_POOL_ENABLED"] = True
+    monkeypatch.setattr(question_pool, "request_refill", lambda app: 0)
+    with app.app_context():
+        for _ in range(sets):
+            db.session.add(QuestionSet(payload=json.dumps(QUESTIONS, ensure_ascii=False)))
+        db.session.commit()
+
+
+def _pool_size(app):
+    with app.app_context():
+        return QuestionSet.query.count()
+
+
+def test_pooled_set_is_used_by_successful_start(app, user, monkeypatch):
+    _, headers = user
+    _pool(app, monkeypatch)
+    status, body, _ = _call(create_asgi_app(app), "GET", "/api/interview/start", headers, [])
+    assert status == 200
+    assert json.loads(body)["data"]["questionList"][0]["question"] == "질문 0"
+    assert _pool_size(app) == 0
+
+
+def test_pooled_set_is_returned_when_view_fails(app, user, monkeypatch):
+    _, headers = user
+    _pool(app, monkeypatch)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(interview_sessions, "create", broken)
+    # 운영에서처럼 뷰 예외를 500 응답으로
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+    status, _, _ = _call(create_asgi_app(app), "GET", "/api/interview/start", headers, [])
+    assert status == 500
+    assert _pool_size(app) == 1
+
+
+def test_refresh_token_does_not_take_pooled_set(app, user, monkeypatch):
+    user_id, _ = user
+    _pool(app, monkeypatch)
+    with app.app_context():
+        token = create_refresh_token(identity=str(user_id))
+    status, _, _ = _call(create_asgi_app(app), "GET", "/api/interview/start",
+                         {"Authorization": "Bearer " + token}, [])
+    assert status == 422
+    assert _pool_size(app) == 1
+
+
+def test_analysis_is_served_from_the_job_in_both_modes(app, client, user, monkeypatch):
+    user_id, headers = user
+
+    def finish(app, job_id):
+        with app.app_context():
+            job = db.session.get(AnalysisJob, job_id)
+            job.status, job.result = "done", json.dumps({"summary": "총평"})
+            db.session.commit()
+
+    # WSGI: 작업만 큐에 넣고 202
+    monkeypatch.setattr(analysis_jobs, "_run_job", lambda app, job_id: None)
+    response = client.get("/api/interview/analysis", headers=headers)
+    assert response.status_code == 202
+    job_id = response.get_json()["data"]["job_id"]
+
+    # ASGI: 작업이 끝날 때까지 이벤트 루프에서 기다린 뒤 같은 뷰가 결과를 반환
+    monkeypatch.setattr(analysis_jobs, "_run_job", finish)
+    with app.app_context():
+        db.session.get(AnalysisJob, job_id).status = "failed"
+        db.session.commit()
+    app.config["ANALYSIS_RETRY_AFTER"] = 0
+    status, body, _ = _call(create_asgi_app(app), "GET", "/api/interview/analysis", headers, [])
+    assert status == 200
+    assert json.loads(body)["data"] == {"summary": "총평"}
+    # 같은 결과를 WSGI 에서도 그대로 읽음
+    assert client.get("/api/interview/analysis", headers=headers).get_json()["data"] == {"summary": "총평"}
+
+
+def test_prefetch_llm_calls_are_recorded_in_profile(monkeypatch):
+    monkeypatch.setitem(profiling._config, "slow_ms", 0)
+
+    async def create(**kwargs):
+        return SimpleNamespace(usage=None)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm_client, "_get_async_state", lambda: (client, asyncio.Semaphore(1)))
+
+    async def prefetch():
+        profile = profiling.start_prefetch()
+        await llm_client.async_chat_completion("model-a", [])
+        return profile
+
+    profile = asyncio.run(prefetch())
+    assert [call["model"] for call in profile["llm"]] == ["model-a"]
@@ -0,0 +1,46 @@
+"""DB 백엔드 설정: SQLite 연결마다 PRAGMA 적용, 백엔드별 엔진 옵션"""
+
+from sqlalchemy import text
+
+from app import db, database
+
+
+def _config(uri, **overrides):
+    config = {
+        "SQLALCHEMY_DATABASE_URI": uri,
+        "DB_POOL_SIZE": 10, "DB_MAX_OVERFLOW": 20, "DB_POOL_TIMEOUT": 30,
+        "DB_POOL_RECYCLE": 1800, "DB_POOL_PRE_PING": True,
+        "SQLITE_BUSY_TIMEOUT_MS": 5000,
+    }
+    config.update(overrides)
+    return config
+
+
+def test_sqlite_pragmas_applied_to_every_connection(app):
+    with app.app_context():
+        # 새 연결 두 개 모두 같은 PRAGMA
+        for _ in range(2):
+            with db.engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+                assert conn.execute(text("PRAGMA busy_timeout")).scalar() == app.config["SQLITE_BUSY_TIMEOUT_MS"]
+
+
+def test_sqlite_engine_options():
+    options = database.engine_options(_config("sqlite:////tmp/interview.db"))
+    assert options["pool_size"] == 10 and options["max_overflow"] == 20
+    # pysqlite 의 busy handler 도 PRAGMA busy_timeout 과 같은 값
+    assert options["connect_args"] == {"timeout": 5.0}
+    assert "pool_pre_ping" not in options
+
+    # 메모리 DB 는 풀 크기를 설정하지 않음
+    assert "pool_size" not in database.engine_options(_config("sqlite://"))
+
+
+def test_postgresql_engine_options():
+    uri = "postgresql+psycopg2://user:pass@db:5432/interview"
+    options = database.engine_options(_config(uri, SQLALCHEMY_ENGINE_OPTIONS={"pool_size": 3}))
+    assert database.backend(uri) == "postgresql"
+    # 직접 준 옵션이 우선
+    assert options["pool_size"] == 3
+    assert options["pool_recycle"] == 1800 and options["pool_pre_ping"] is True
+    assert "connect_args" not in options
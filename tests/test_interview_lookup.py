@@ -0,0 +1,87 @@
+"""답변/영상 요청의 인터뷰 찾기 우선순위: interview_id > session_id + question_order > (deprecated) 질문 본문"""
+
+import pytest
+
+from app import db
+from app.interview_lookup import find_interview, has_lookup_args, InvalidLookup
+from app.models import Interview, User
+from app.services import interview_sessions
+
+
+@pytest.fixture
+def rows(app, user):
+    """같은 질문이 두 번 나오는 세션 하나와 다른 사용자의 인터뷰 하나 → (user_id, [id, ...], other_id)"""
+    user_id, _ = user
+    with app.app_context():
+        other = User(username="other", email="other@example.com", password="x")
+        db.session.add(other)
+        db.session.flush()
+        interviews = [
+            Interview(user_id=user_id, session_id="s-1", question_order=order, question="같은 질문")
+            for order in range(2)
+        ]
+        foreign = Interview(user_id=other.id, session_id="s-2", question_order=0, question="같은 질문")
+        db.session.add_all(interviews + [foreign])
+        interview_sessions.create(user_id, "s-1", [{"question": "같은 질문", "type": "간호사"}] * 2)
+        db.session.commit()
+        return user_id, [itv.id for itv in interviews], foreign.id
+
+
+def _find(app, user_id, args):
+    with app.app_context():
+        interview = find_interview(user_id, args)
+        return interview.id if interview else None
+
+
+def test_interview_id_wins(app, rows):
+    user_id, ids, _ = rows
+    args = {"interview_id": str(ids[1]), "session_id": "s-1", "question_order": "0", "question": "같은 질문"}
+    assert _find(app, user_id, args) == ids[1]
+
+
+def test_other_users_interview_id_is_not_found(app, rows):
+    user_id, _, foreign_id = rows
+    # 다른 조건으로 넘어가지 않고 None
+    assert _find(app, user_id, {"interview_id": foreign_id, "session_id": "s-1", "question_order": 0}) is None
+
+
+def test_question_order_wins_over_question_text(app, rows):
+    user_id, ids, _ = rows
+    assert _find(app, user_id, {"session_id": "s-1", "question_order": "1", "question": "같은 질문"}) == ids[1]
+    assert _find(app, user_id, {"session_id": "s-1", "question_order": "5"}) is None
+
+
+def test_deprecated_question_text_finds_first_row(app, rows):
+    user_id, ids, _ = rows
+    assert _find(app, user_id, {"session_id": "s-1", "question": "같은 질문"}) == ids[0]
+    assert _find(app, user_id, {"session_id": "s-2", "question": "같은 질문"}) is None
+
+
+def test_invalid_numbers_raise(app, rows):
+    user_id, _, _ = rows
+    with pytest.raises(InvalidLookup, match="interview_id"):
+        _find(app, user_id, {"interview_id": "abc"})
+    with pytest.raises(InvalidLookup, match="question_order"):
+        _find(app, user_id, {"session_id": "s-1", "question_order": "first"})
+
+
+def test_has_lookup_args():
+    assert has_lookup_args({"interview_id": "3"})
+    assert has_lookup_args({"session_id": "s-1", "question_order": "0"})
+    assert has_lookup_args({"session_id": "s-1", "question": "같은 질문"})
+    assert not has_lookup_args({"question_order": "0"})
+    assert not has_lookup_args({"session_id": "s-1", "question_order": ""})
+
+
+def test_answer_route_updates_row_by_question_order(app, client, user, rows):
+    _, headers = user
+    _, ids, _ = rows
+    form = {"session_id": "s-1", "question_order": "1", "question": "같은 질문", "useranswer": "두 번째 답", "type": "간호사"}
+    response = client.post("/api/interview/answer", data=form, headers=headers)
+    assert response.status_code == 200
+    with app.app_context():
+        assert [db.session.get(Interview, i).useranswer for i in ids] == ["응답 없음", "두 번째 답"]
+
+    response = client.post("/api/interview/answer", data={**form, "question_order": "x"}, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json() == {"result": "fail", "code": "400", "message": "Invalid question_order"}
@@ -0,0 +1,202 @@
+"""분석 결과 항목을 목록 순서가 아니라 index 로 매칭하는지 (_apply_parsed / 전체 이력 map-reduce / 스트리밍)"""
+
+import json
+
+from app import db
+from app.models import Interview
+from app.services import llm_analysis, structured_output
+
+
+def _interviews(n):
+    return [Interview(question=f"질문 {i}", useranswer=f"답변 {i}", analysis="응답 없음", score=None) for i in range(n)]
+
+
+def test_apply_parsed_matches_by_index():
+    interviews = _interviews(4)
+    parsed = {
+        "items": [
+            {"index": 3, "analysis": "세 번째", "score": 30},
+            {"index": 1, "analysis": "첫 번째", "score": 10},
+            {"index": 1, "analysis": "중복", "score": 99},     # 같은 index 는 처음 것만
+            {"index": 9, "analysis": "범위 밖", "score": 99},
+            {"index": 0, "analysis": "범위 밖", "score": 99},
+            {"index": "2", "analysis": "정수 아님", "score": 99},
+        ],
+        "summary": "총평",
+        "overall_scores": {},
+    }
+    result = llm_analysis._apply_parsed(interviews, parsed)
+
+    assert [(i.analysis, i.score) for i in interviews] == [
+        ("첫 번째", 10.0), ("응답 없음", None), ("세 번째", 30.0), ("응답 없음", None),
+    ]
+    assert [item["analysis"] for item in result["InterviewList"]] == ["첫 번째", "응답 없음", "세 번째", "응답 없음"]
+
+
+def test_map_reduce_history_uses_global_index(app, monkeypatch):
+    payload_items = [{"index": i, "question": f"q{i}"} for i in range(1, 6)]
+
+    def analyze_chunk(chunk):
+        if chunk[0]["question"] == "q3":
+            # 두 번째 구간: 순서를 뒤집고 하나는 빠뜨림
+            return {"items": [{"index": 2, "analysis": "q4", "score": 4}], "summary": "b", "overall_scores": {}}
+        return {"items": [{"index": k, "analysis": item["question"], "score": k} for k, item in enumerate(chunk, 1)],
+                "summary": "a", "overall_scores": {}}
+
+    monkeypatch.setattr(llm_analysis, "_analyze_chunk", analyze_chunk)
+    monkeypatch.setattr(llm_analysis, "_merge_summaries", lambda summaries: " ".join(summaries))
+    with app.app_context():
+        parsed = llm_analysis._map_reduce_history(payload_items, chunk_size=2, workers=1)
+
+    assert sorted((item["index"], item["analysis"]) for item in parsed["items"]) == [
+        (1, "q1"), (2, "q2"), (4, "q4"), (5, "q5"),
+    ]
+
+
+def test_stream_analysis_matches_by_index(app, user, monkeypatch):
+    user_id, _ = user
+    with app.app_context():
+        for order in range(4):
+            db.session.add(Interview(user_id=user_id, session_id="s-1", question_order=order,
+                                     question=f"질문 {order}", useranswer=f"답변 {order}"))
+        db.session.commit()
+
+    output = json.dumps({
+        "items": [
+            {"index": 2, "analysis": "두 번째", "score": 20},
+            {"index": 2, "analysis": "중복", "score": 99},
+            {"index": 7, "analysis": "범위 밖", "score": 99},
+            {"index": 1, "analysis": "첫 번째", "score": 10},
+        ],
+        "summary": "총평",
+        "overall_scores": {key: 50 for key in llm_analysis.SCORE_KEYS},
+    }, ensure_ascii=False)
+    monkeypatch.setattr(structured_output, "stream_chat_completion",
+                        lambda **kwargs: iter(output[i:i + 7] for i in range(0, len(output), 7)))
+
+    with app.app_context():
+        events = list(llm_analysis.stream_analysis(user_id, "s-1"))
+        rows = Interview.query.filter_by(session_id="s-1").order_by(Interview.question_order).all()
+        assert [(r.analysis, r.score) for r in rows] == [
+            ("첫 번째", 10.0), ("두 번째", 20.0), ("응답 없음", None), ("응답 없음", None),
+        ]
+
+    items = [data for event, data in events if event == "item"]
+    assert [(item["index"], item["analysis"]) for item in items] == [(2, "두 번째"), (1, "첫 번째")]
+    assert events[-1][0] == "summary"
+
+
+def test_integral_float_index_matches_like_schema_check():
+    # 스키마 검사는 1.0 을 integer 로 통과시키므로 매칭에서도 버리지 않음
+    index_schema = llm_analysis._analysis_schema(2)["properties"]["items"]["items"]["properties"]["index"]
+    assert structured_output.validate(2.0, index_schema) is None
+    parsed = {"items": [{"index": 2.0, "analysis": "두 번째", "score": 20}], "summary": "총평", "overall_scores": {}}
+    interviews = _interviews(2)
+    llm_analysis._apply_parsed(interviews, parsed)
+    assert [i.analysis for i in interviews] == ["응답 없음", "두 번째"]
+
+
+def _add_session(app, user_id, answers):
+    with app.app_context():
+        for order, answer in enumerate(answers):
+            db.session.add(Interview(user_id=user_id, session_id="s-1", question_order=order,
+                                     question=f"질문 {order}", useranswer=answer))
+        db.session.commit()
+
+
+def _counting_completion(monkeypatch):
+    calls = []
+
+    def structured_completion(**kwargs):
+        calls.append(kwargs["name"])
+        return {"items": [{"index": k, "analysis": f"분석 {k}", "score": 10 * k} for k in (1, 2)],
+                "summary": "총평", "overall_scores": {key: 50 for key in llm_analysis.SCORE_KEYS}}
+
+    monkeypatch.setattr(llm_analysis, "structured_completion", structured_completion)
+    return calls
+
+
+def test_analysis_cache_hit_skips_llm(app, user, monkeypatch):
+    user_id, _ = user
+    _add_session(app, user_id, ["답변 0", "답변 1"])
+    calls = _counting_completion(monkeypatch)
+
+    with app.app_context():
+        first = llm_analysis.analysisByLLM(user_id, "s-1")
+    with app.app_context():
+        second = llm_analysis.analysisByLLM(user_id, "s-1")
+    assert calls == ["session_analysis"]
+    assert second == first
+
+
+def test_analysis_cache_misses_on_new_prompt_version_or_answer(app, user, monkeypatch):
+    user_id, _ = user
+    _add_session(app, user_id, ["답변 0", "답변 1"])
+    calls = _counting_completion(monkeypatch)
+
+    with app.app_context():
+        llm_analysis.analysisByLLM(user_id, "s-1")
+    # 프롬프트가 바뀌면 같은 답변이라도 다시 분석
+    monkeypatch.setattr(llm_analysis, "PROMPT_VERSION", llm_analysis.PROMPT_VERSION + "-next")
+    with app.app_context():
+        llm_analysis.analysisByLLM(user_id, "s-1")
+        assert len(calls) == 2
+        # 답변이 바뀌어도 다시 분석하고, 그 결과는 다음 호출에서 캐시로 씀
+        Interview.query.filter_by(question_order=1).update({"useranswer": "바뀐 답변"})
+        db.session.commit()
+    with app.app_context():
+        llm_analysis.analysisByLLM(user_id, "s-1")
+        llm_analysis.analysisByLLM(user_id, "s-1")
+    assert len(calls) == 3
+
+
+def test_map_reduce_history_chunks_and_merges(app, monkeypatch):
+    payload_items = [{"index": i, "question": f"q{i}"} for i in range(1, 6)]
+    chunks = []
+
+    def analyze_chunk(chunk):
+        chunks.append(chunk)
+        score = {"q1": 10, "q3": 40, "q5": 100}[chunk[0]["question"]]
+        return {"items": [], "summary": chunk[0]["question"],
+                "overall_scores": {key: score for key in llm_analysis.SCORE_KEYS}}
+
+    def merge_summaries(summaries):
+        return summaries[0] if len(summaries) == 1 else "(" + "+".join(summaries) + ")"
+
+    monkeypatch.setattr(llm_analysis, "_analyze_chunk", analyze_chunk)
+    monkeypatch.setattr(llm_analysis, "_merge_summaries", merge_summaries)
+    with app.app_context():
+        parsed = llm_analysis._map_reduce_history(payload_items, chunk_size=2, workers=2)
+
+    # 구간마다 index 를 1부터 다시 매김
+    assert sorted([item["index"] for item in chunk] for chunk in chunks) == [[1], [1, 2], [1, 2]]
+    # 총평 3개 → 2개씩 묶어 합치기를 하나가 될 때까지 반복
+    assert parsed["summary"] == "((q1+q3)+q5)"
+    # 구간 크기 가중 평균: (10*2 + 40*2 + 100*1) / 5
+    assert parsed["overall_scores"] == {key: 40.0 for key in llm_analysis.SCORE_KEYS}
+
+
+def test_map_reduce_history_skips_failed_chunks(app, monkeypatch):
+    payload_items = [{"index": i, "question": f"q{i}"} for i in range(1, 5)]
+
+    def analyze_chunk(chunk):
+        if chunk[0]["question"] == "q1":
+            return None
+        return {"items": [{"index": 1, "analysis": "a", "score": 1}], "summary": "b",
+                "overall_scores": {key: 80 for key in llm_analysis.SCORE_KEYS}}
+
+    monkeypatch.setattr(llm_analysis, "_analyze_chunk", analyze_chunk)
+    with app.app_context():
+        parsed = llm_analysis._map_reduce_history(payload_items, chunk_size=2, workers=1)
+        assert parsed["items"] == [{"index": 3, "analysis": "a", "score": 1}]
+        assert parsed["summary"] == "b"
+        # 실패한 구간은 점수 평균에 넣지 않음
+        assert parsed["overall_scores"] == {key: 80.0 for key in llm_analysis.SCORE_KEYS}
+
+        monkeypatch.setattr(llm_analysis, "_analyze_chunk", lambda chunk: None)
+        assert llm_analysis._map_reduce_history(payload_items, chunk_size=2, workers=1) is None
+
+
+def test_merge_summaries_falls_back_to_joined_text(monkeypatch):
+    monkeypatch.setattr(llm_analysis, "structured_completion", lambda **kwargs: None)
+    assert llm_analysis._merge_summaries(["a", "b"]) == "a\nb"
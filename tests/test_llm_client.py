@@ -0,0 +1,132 @@
+"""공용 LLM 클라이언트: 일시적 오류만 제한된 횟수로 재시도하고 전체 제한 시간(deadline)을 넘기지 않는지"""
+
+import threading
+from types import SimpleNamespace
+
+import httpx2
+import pytest
+from openai import APITimeoutError
+
+from app.services import llm_client
+
+
+class StubClient:
+    """chat.completions.create 가 outcomes 를 차례로 돌려주거나(예외면) 던지는 가짜 클라이언트"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, timeout, **kwargs):
+        self.timeouts.append(timeout)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _timeout_error():
+    return APITimeoutError(request=httpx2.Request("POST", "http://llm.test/chat/completions"))
+
+
+def _chunk(text):
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class Stream(list):
+    def close(self):
+        pass
+
+
+class BrokenStream(Stream):
+    """첫 조각을 내보낸 뒤 끊기는 스트림"""
+
+    def __iter__(self):
+        yield from super().__iter__()
+        raise _timeout_error()
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_MAX_RETRIES", 2)
+    monkeypatch.setattr(llm_client, "_backoff", lambda attempt: 0)
+    monkeypatch.setattr(llm_client, "_semaphore", threading.BoundedSemaphore(2))
+
+    def install(outcomes):
+        client = StubClient(outcomes)
+        monkeypatch.setattr(llm_client, "get_client", lambda: client)
+        return client
+
+    return install
+
+
+def _semaphore_free():
+    """동시 호출 슬롯이 모두 반환됐는지"""
+    acquired = [llm_client._semaphore.acquire(blocking=False) for _ in range(2)]
+    for ok in acquired:
+        if ok:
+            llm_client._semaphore.release()
+    return all(acquired)
+
+
+def test_transient_errors_are_retried(stub):
+    response = SimpleNamespace(usage=None)
+    client = stub([_timeout_error(), _timeout_error(), response])
+    assert llm_client.chat_completion("m", [], timeout=5) is response
+    assert len(client.timeouts) == 3
+    # 호출마다 남은 시간만 넘김
+    assert all(t <= 5 for t in client.timeouts)
+    assert _semaphore_free()
+
+
+def test_gives_up_after_max_retries(stub):
+    client = stub([_timeout_error() for _ in range(5)])
+    with pytest.raises(APITimeoutError):
+        llm_client.chat_completion("m", [], timeout=5)
+    assert len(client.timeouts) == llm_client.LLM_MAX_RETRIES + 1
+    assert _semaphore_free()
+
+
+def test_no_retry_when_backoff_passes_deadline(stub, monkeypatch):
+    monkeypatch.setattr(llm_client, "_backoff", lambda attempt: 10)
+    client = stub([_timeout_error(), SimpleNamespace(usage=None)])
+    with pytest.raises(APITimeoutError):
+        llm_client.chat_completion("m", [], timeout=1)
+    assert len(client.timeouts) == 1
+
+
+def test_non_transient_error_is_not_retried(stub):
+    client = stub([ValueError("bad request"), SimpleNamespace(usage=None)])
+    with pytest.raises(ValueError):
+        llm_client.chat_completion("m", [], timeout=5)
+    assert len(client.timeouts) == 1
+    assert _semaphore_free()
+
+
+def test_busy_when_no_slot_before_deadline(stub):
+    client = stub([SimpleNamespace(usage=None)])
+    llm_client._semaphore.acquire()
+    llm_client._semaphore.acquire()
+    try:
+        with pytest.raises(llm_client.LLMBusyError):
+            llm_client.chat_completion("m", [], timeout=0.05)
+    finally:
+        llm_client._semaphore.release()
+        llm_client._semaphore.release()
+    assert client.timeouts == []
+
+
+def test_stream_retries_only_before_first_chunk(stub):
+    stub([_timeout_error(), Stream([_chunk("가"), _chunk("나")])])
+    assert list(llm_client.stream_chat_completion("m", [], timeout=5)) == ["가", "나"]
+
+    client = stub([BrokenStream([_chunk("가")]), Stream([_chunk("다시")])])
+    received = []
+    with pytest.raises(APITimeoutError):
+        for delta in llm_client.stream_chat_completion("m", [], timeout=5):
+            received.append(delta)
+    # 이미 내보낸 조각은 되돌릴 수 없으므로 다시 요청하지 않음
+    assert received == ["가"]
+    assert len(client.timeouts) == 1
+    assert _semaphore_free()
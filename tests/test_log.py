@@ -0,0 +1,64 @@
+"""구조화 로깅: 필드가 JSON 한 줄에 들어가는지, payload 샘플링, 큐가 가득 차면 기다리지 않고 버리는지"""
+
+import os
+import json
+import queue
+import logging
+
+from app import log
+
+
+def _record(msg, **fields):
+    """get_logger(...).info(msg, **fields) 가 만드는 레코드"""
+    records = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    logger = logging.getLogger("tests.log")
+    logger.propagate = False
+    handler = Collect()
+    logger.addHandler(handler)
+    try:
+        log.get_logger("tests.log").warning(msg, **fields)
+    finally:
+        logger.removeHandler(handler)
+    return records[0]
+
+
+def test_json_formatter_puts_fields_on_one_line():
+    line = log.JsonFormatter().format(_record("Analysis job queued", job_id="j-1", session_id="s-1"))
+    assert "\n" not in line
+    entry = json.loads(line)
+    assert (entry["msg"], entry["level"], entry["job_id"], entry["session_id"]) == \
+        ("Analysis job queued", "WARNING", "j-1", "s-1")
+
+
+def test_payload_is_summarized_unless_sampled(monkeypatch):
+    monkeypatch.setitem(log._config, "payload_max_chars", 10)
+    assert log._Payload(["a", "b"], sampled=False).render() == {"omitted": True, "type": "list", "size": 2}
+    assert log._Payload({"a": 1}, sampled=True).render() == {"a": 1}
+    truncated = log._Payload("x" * 50, sampled=True).render()
+    assert truncated["truncated"] and truncated["chars"] == 52 and len(truncated["head"]) == 10
+
+    monkeypatch.setitem(log._config, "payload_sample_rate", 0.0)
+    entry = json.loads(log.JsonFormatter().format(_record("Analysis info", data=log.payload([1, 2, 3]))))
+    assert entry["data"] == {"omitted": True, "type": "list", "size": 3}
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = log._NonBlockingQueueHandler(queue.Queue(maxsize=1), logging.NullHandler())
+    # 리스너가 이미 떠 있는 것처럼 두어 큐를 비우지 않음
+    handler._listener_pid = os.getpid()
+    record = _record("Question pool refill scheduled")
+    for _ in range(3):
+        handler.emit(record)
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
+
+
+def test_parse_levels():
+    assert log._parse_levels("app.routes.interview=debug, app.services.llm_client=WARNING,,bad") == {
+        "app.routes.interview": "DEBUG", "app.services.llm_client": "WARNING",
+    }
@@ -0,0 +1,21 @@
+"""/metrics 토큰: 설정하지 않으면 응답하지 않고 (METRICS_PUBLIC 제외), 설정하면 Bearer 토큰이 맞아야 조회"""
+
+
+def test_metrics_disabled_without_token(app, client):
+    app.config["METRICS_TOKEN"] = None
+    assert client.get("/metrics").status_code == 404
+
+    app.config["METRICS_PUBLIC"] = True
+    assert client.get("/metrics").status_code == 200
+
+
+def test_metrics_requires_matching_token(app, client):
+    app.config["METRICS_TOKEN"] = "scrape-token"
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "scrape-token"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert "http_requests_total" in response.get_data(as_text=True)
@@ -0,0 +1,138 @@
+"""
+처음 배포된 스키마(인덱스/세션 테이블이 없는 user, interview 만 있는 DB)에 마이그레이션을 적용하고,
+다시 적용해도 (재시작, schema_migration 기록 유실) 오류나 중복 없이 같은 결과인지 확인
+"""
+
+import sqlite3
+import threading
+
+from sqlalchemy import inspect
+
+from app import db
+from app.migrations import MIGRATIONS, run_migrations
+from app.models import InterviewSession, SchemaMigration
+
+BASELINE_SCHEMA = """
+CREATE TABLE user (
+    id INTEGER NOT NULL PRIMARY KEY,
+    username VARCHAR(80) NOT NULL,
+    email VARCHAR(120) NOT NULL UNIQUE,
+    password VARCHAR(120) NOT NULL
+);
+CREATE TABLE interview (
+    id INTEGER NOT NULL PRIMARY KEY,
+    user_id INTEGER REFERENCES user (id),
+    question TEXT NOT NULL,
+    useranswer TEXT NOT NULL,
+    "LLM_gen_answer" TEXT NOT NULL,
+    video TEXT,
+    type VARCHAR(80) NOT NULL,
+    analysis TEXT NOT NULL,
+    session_id VARCHAR(36),
+    question_order INTEGER,
+    summary TEXT,
+    score FLOAT,
+    timestamp DATETIME
+);
+"""
+
+EXPECTED_INDEXES = {
+    "interview": {"ix_interview_user_session_order", "ix_interview_user_timestamp", "ix_interview_user_id"},
+    "interview_session": {"ix_interview_session_user_created"},
+    "analysis_job": {"ix_analysis_job_user_session"},
+}
+
+
+def _create_baseline_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.execute("INSERT INTO user (id, username, email, password) VALUES (1, 'tester', 'tester@example.com', 'x')")
+    rows = [
+        # (session_id, question_order, useranswer, analysis, score)
+        ("s-1", 0, "답변", "좋음", 80.0),
+        ("s-1", 1, "답변", "보통", 60.0),
+        ("s-2", 0, "답변", "응답 없음", None),
+        ("s-2", 1, "응답 없음", "응답 없음", None),
+    ]
+    for n, (session_id, order, answer, analysis, score) in enumerate(rows):
+        conn.execute(
+            "INSERT INTO interview (user_id, question, useranswer, LLM_gen_answer, type, analysis,"
+            " session_id, question_order, summary, score, timestamp)"
+            " VALUES (1, ?, ?, '모범 답안', '인성', ?, ?, ?, '응답 없음', ?, ?)",
+            (f"질문 {n}", answer, analysis, session_id, order, score, f"2024-01-01 00:00:0{n}"),
+        )
+    conn.commit()
+    conn.close()
+
+
+def _snapshot():
+    """인덱스와 세션 행 (마이그레이션 재적용 전후 비교용)"""
+    inspector = inspect(db.engine)
+    indexes = {table: {ix["name"] for ix in inspector.get_indexes(table)} for table in EXPECTED_INDEXES}
+    sessions = sorted(
+        (s.id, s.status, s.question_count, s.answered_count, s.analyzed_count)
+        for s in InterviewSession.query.all()
+    )
+    return indexes, sessions
+
+
+def test_migrations_upgrade_baseline_db_idempotently(app_factory, tmp_path):
+    _create_baseline_db(tmp_path / "test.db")
+    versions = sorted(version for version, _, _ in MIGRATIONS)
+
+    app = app_factory()
+    with app.app_context():
+        assert sorted(m.version for m in SchemaMigration.query.all()) == versions
+        indexes, sessions = _snapshot()
+        for table, names in EXPECTED_INDEXES.items():
+            assert names <= indexes[table], table
+        assert sessions == [("s-1", "answered", 2, 2, 2), ("s-2", "in_progress", 2, 1, 0)]
+
+    # 재시작: 이미 적용된 버전은 다시 실행하지 않음
+    app = app_factory()
+    with app.app_context():
+        assert run_migrations() == []
+        assert _snapshot() == (indexes, sessions)
+
+        # 적용 기록이 없어져 모든 마이그레이션이 다시 실행돼도 같은 결과
+        SchemaMigration.query.delete()
+        db.session.commit()
+        assert run_migrations() == versions
+        assert _snapshot() == (indexes, sessions)
+
+
+def test_concurrent_startups_apply_each_migration_once(app_factory, tmp_path):
+    _create_baseline_db(tmp_path / "test.db")
+    versions = sorted(version for version, _, _ in MIGRATIONS)
+    app = app_factory()
+    with app.app_context():
+        expected = _snapshot()
+        # 처음 배포 직후처럼 적용 기록과 백필된 세션이 없는 상태로 되돌림
+        SchemaMigration.query.delete()
+        InterviewSession.query.delete()
+        db.session.commit()
+
+    # 여러 워커 프로세스가 동시에 create_app() 하는 상황: 각자 run_migrations 를 부름
+    barrier = threading.Barrier(4)
+    results, errors = [], []
+
+    def start():
+        with app.app_context():
+            barrier.wait()
+            try:
+                results.append(run_migrations())
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    workers = [threading.Thread(target=start) for _ in range(4)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    assert errors == []
+    assert sorted(v for done in results for v in done) == versions
+    with app.app_context():
+        assert _snapshot() == expected
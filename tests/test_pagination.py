@@ -0,0 +1,31 @@
+"""GET /api/interview/sessions 커서 페이지네이션: 최신순, created_at 이 같으면 id 내림차순, 페이지 사이 중복/누락 없음"""
+
+import datetime
+
+from app import db
+from app.models import InterviewSession
+
+
+def test_sessions_are_paged_newest_first(app, client, user):
+    user_id, headers = user
+    base = datetime.datetime(2024, 1, 1)
+    with app.app_context():
+        # 같은 created_at 을 가진 세션이 페이지 경계에 걸치도록
+        for n, minute in enumerate([0, 1, 1, 1, 2, 3, 3]):
+            db.session.add(InterviewSession(id=f"s-{n}", user_id=user_id, created_at=base + datetime.timedelta(minutes=minute)))
+        db.session.commit()
+        expected = [
+            s.id for s in sorted(InterviewSession.query.all(), key=lambda s: (s.created_at, s.id), reverse=True)
+        ]
+
+    seen, cursor = [], None
+    while True:
+        url = "/api/interview/sessions?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(url, headers=headers).get_json()["data"]
+        seen += [s["session_id"] for s in data["sessions"]]
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == expected
+    assert seen[:2] == ["s-6", "s-5"]
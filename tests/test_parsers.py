@@ -0,0 +1,53 @@
+"""LLM 응답 파서: 기록된 모델 출력(benchmarks/data/parser_corpus.json)과 악의적인 입력에서의 결과"""
+
+import os
+import json
+import time
+
+import pytest
+
+from app.services import llm_service
+from app.services.llm_analysis import _ItemStreamParser
+from app.services.structured_output import parse_json
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "data", "parser_corpus.json")
+with open(CORPUS, encoding="utf-8") as f:
+    CASES = json.load(f)["cases"]
+
+
+def _deltas(text, size=8):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("case", [c for c in CASES if c["kind"] == "json"], ids=lambda c: c["name"])
+def test_parse_json_reads_recorded_outputs(case):
+    parsed = parse_json(case["text"])
+    assert isinstance(parsed, dict) and parsed
+
+
+@pytest.mark.parametrize("case", [c for c in CASES if "/analysis_" in c["name"]], ids=lambda c: c["name"])
+def test_item_stream_parser_matches_parse_json(case):
+    parser = _ItemStreamParser()
+    items = [item for delta in _deltas(case["text"]) for item in parser.feed(delta)]
+    assert parser.text == case["text"]
+    assert items == parse_json(case["text"])["items"]
+
+
+@pytest.mark.parametrize("case", [c for c in CASES if c["kind"] == "question_lines"], ids=lambda c: c["name"])
+def test_stream_questions_reads_recorded_lines(case, monkeypatch):
+    monkeypatch.setattr(llm_service, "stream_chat_completion", lambda **kwargs: iter(_deltas(case["text"])))
+    questions = list(llm_service.stream_questions())
+    assert len(questions) == 3
+    assert all(q["question"] and q["answer"] for q in questions)
+
+
+@pytest.mark.parametrize("text", [
+    "```json\n{" * 4000,                       # 닫히지 않은 코드블록 반복 (예전 정규식은 입력 길이의 제곱)
+    "[" * 20000 + "]" * 20000,                 # 깊은 중첩 (예전에는 RecursionError)
+    "```json\n" + "{\"a\": " * 20000 + "\n```",
+    "```json\n{\"a\": 1}",                     # 닫는 펜스 없음
+], ids=["unclosed-fences", "deep-nesting", "deep-nesting-fenced", "no-closing-fence"])
+def test_parse_json_fails_fast_on_adversarial_input(text):
+    started = time.perf_counter()
+    assert parse_json(text) is None
+    assert time.perf_counter() - started < 0.5
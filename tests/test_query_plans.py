@@ -0,0 +1,119 @@
+"""
+이력/세션 목록/답변 제출 경로의 interview 조회가 인덱스를 타는지 EXPLAIN QUERY PLAN 으로 확인
+(요청이 실제로 실행한 SQL 을 그대로 가져와 같은 파라미터로 계획을 본다)
+"""
+
+import re
+import uuid
+import datetime
+
+from app import db
+from app.models import Interview, InterviewSession
+
+UNANSWERED = "응답 없음"
+
+
+def _seed(app, user_id, sessions=3, questions=3):
+    """세션마다 마지막 질문은 답하지 않은 상태로 (답변 제출 시 세션 분석 작업이 큐에 들어가지 않도록)"""
+    ids = []
+    with app.app_context():
+        base = datetime.datetime(2024, 1, 1)
+        for n in range(sessions):
+            session_id = str(uuid.uuid4())
+            created = base + datetime.timedelta(minutes=n)
+            db.session.add(InterviewSession(
+                id=session_id, user_id=user_id, type="인성", question_count=questions,
+                answered_count=questions - 1, created_at=created,
+            ))
+            for order in range(questions):
+                db.session.add(Interview(
+                    user_id=user_id, session_id=session_id, question_order=order, question=f"질문 {order}",
+                    useranswer=f"답변 {order}" if order < questions - 1 else UNANSWERED,
+                    type="인성", timestamp=created + datetime.timedelta(seconds=order),
+                ))
+            ids.append(session_id)
+        db.session.commit()
+    return ids
+
+
+def _plans(app, statements, table):
+    """statements 중 FROM <table> 인 SELECT 의 쿼리 계획 (문장마다 detail 을 한 줄로 합침)"""
+    plans = []
+    with app.app_context():
+        conn = db.session.connection()
+        for statement, parameters in statements:
+            match = re.search(r"\bFROM (\w+)", statement)
+            if not statement.lstrip().upper().startswith("SELECT") or not match or match.group(1) != table:
+                continue
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+            plans.append(" | ".join(row[3] for row in rows))
+    assert plans, f"no SELECT on {table}"
+    return plans
+
+
+def _uses_index(plan, name):
+    return re.search(rf"USING (COVERING )?INDEX {name}\b", plan) is not None
+
+
+def test_history_by_session_uses_session_order_index(app, client, user, count_queries):
+    user_id, headers = user
+    session_id = _seed(app, user_id)[0]
+
+    with count_queries() as statements:
+        response = client.get(f"/api/interview/info?session_id={session_id}", headers=headers)
+    assert response.status_code == 200
+
+    for plan in _plans(app, statements, "interview"):
+        assert _uses_index(plan, "ix_interview_user_session_order"), plan
+
+
+def test_history_pages_use_timestamp_index(app, client, user, count_queries):
+    user_id, headers = user
+    _seed(app, user_id)
+
+    with count_queries() as statements:
+        first = client.get("/api/interview/info?limit=2", headers=headers).get_json()["data"]
+        cursor = first["next_cursor"]
+        assert cursor
+        response = client.get(f"/api/interview/info?limit=2&cursor={cursor}", headers=headers)
+    assert response.status_code == 200
+
+    plans = _plans(app, statements, "interview")
+    assert len(plans) == 2
+    for plan in plans:
+        assert _uses_index(plan, "ix_interview_user_timestamp"), plan
+
+
+def test_session_list_uses_indexes(app, client, user, count_queries):
+    user_id, headers = user
+    _seed(app, user_id)
+
+    with count_queries() as statements:
+        first = client.get("/api/interview/sessions?limit=2", headers=headers).get_json()["data"]
+        response = client.get(f"/api/interview/sessions?limit=2&cursor={first['next_cursor']}", headers=headers)
+    assert response.status_code == 200
+
+    for plan in _plans(app, statements, "interview_session"):
+        assert _uses_index(plan, "ix_interview_session_user_created"), plan
+    for plan in _plans(app, statements, "interview"):
+        assert _uses_index(plan, "ix_interview_user_session_order"), plan
+
+
+def test_answer_lookup_uses_session_order_index(app, client, user, count_queries):
+    user_id, headers = user
+    session_id = _seed(app, user_id)[0]
+
+    with count_queries() as statements:
+        response = client.post("/api/interview/answer", headers=headers, data={
+            "session_id": session_id, "question_order": "1", "useranswer": "새 답변", "type": "인성",
+        })
+    assert response.status_code == 200
+
+    plans = _plans(app, statements, "interview")
+    lookups = [p for p in plans if "question_order=?" in p]
+    assert lookups
+    for plan in lookups:
+        assert _uses_index(plan, "ix_interview_user_session_order"), plan
+    # 세션 카운터 재계산도 전체 스캔 없이
+    for plan in plans:
+        assert "SCAN interview" not in plan, plan
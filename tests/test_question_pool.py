@@ -0,0 +1,135 @@
+"""질문 풀: DB 예약(QuestionPoolState 조건부 UPDATE)과 세트 꺼내기가 여러 워커에서도 중복되지 않는지"""
+
+import json
+import datetime
+import threading
+
+from sqlalchemy import update
+
+from app import db
+from app.models import QuestionSet, QuestionPoolState
+from app.services import question_pool
+
+
+def _question_set(n):
+    return [{"type": "기술", "question": "질문 %d-%d" % (n, i)} for i in range(3)]
+
+
+def _add_sets(app, count):
+    with app.app_context():
+        for n in range(count):
+            db.session.add(QuestionSet(payload=json.dumps(_question_set(n), ensure_ascii=False)))
+        db.session.commit()
+
+
+def _pending(app):
+    with app.app_context():
+        return db.session.get(QuestionPoolState, 1).pending
+
+
+def test_reserve_counts_other_workers_reservation(app):
+    target = app.config["QUESTION_POOL_TARGET"]
+    with app.app_context():
+        assert question_pool._reserve(app, 0) == target
+        # 다른 워커가 같은 풀 크기를 보고 불러도 이미 예약된 만큼은 다시 예약하지 않음
+        assert question_pool._reserve(app, 0) == 0
+    assert _pending(app) == target
+
+
+def test_reserve_rereads_when_version_changed(app, monkeypatch):
+    state = QuestionPoolState.__table__
+    read_state = question_pool._read_state
+    calls = []
+
+    def racing_read_state():
+        row = read_state()
+        if not calls:
+            # 읽은 직후 다른 워커가 먼저 3개를 예약 → 이쪽 UPDATE 는 version 이 달라 0건
+            with app.app_context():
+                db.session.execute(update(state).where(state.c.id == 1).values(
+                    pending=3, version=row.version + 1, updated_at=datetime.datetime.utcnow()))
+                db.session.commit()
+        calls.append(row.version)
+        return row
+
+    monkeypatch.setattr(question_pool, "_read_state", racing_read_state)
+    with app.app_context():
+        need = question_pool._reserve(app, 0)
+    assert len(calls) == 2
+    assert need == app.config["QUESTION_POOL_TARGET"] - 3
+    assert _pending(app) == app.config["QUESTION_POOL_TARGET"]
+
+
+def test_expired_reservation_is_ignored(app):
+    old = datetime.datetime.utcnow() - datetime.timedelta(seconds=app.config["QUESTION_POOL_RESERVATION_TTL"] + 60)
+    with app.app_context():
+        QuestionPoolState.query.filter_by(id=1).update({"pending": 5, "updated_at": old})
+        db.session.commit()
+        assert question_pool.refilling() == 0
+        assert question_pool._reserve(app, 0) == app.config["QUESTION_POOL_TARGET"]
+
+
+def test_release_reservation_stops_at_zero(app):
+    with app.app_context():
+        QuestionPoolState.query.filter_by(id=1).update({"pending": 1})
+        db.session.commit()
+        question_pool._release_reservation()
+        question_pool._release_reservation()
+    assert _pending(app) == 0
+
+
+def test_request_refill_submits_reserved_jobs(app, monkeypatch):
+    submitted = []
+
+    class Executor:
+        def submit(self, fn, *args):
+            submitted.append(args)
+
+    monkeypatch.setattr(question_pool, "_get_executor", lambda app: Executor())
+    size = app.config["QUESTION_POOL_LOW_WATER"] - 1
+    _add_sets(app, size)
+    with app.app_context():
+        assert question_pool.request_refill(app) == app.config["QUESTION_POOL_TARGET"] - size
+        # 예약이 남아 있는 동안에는 다시 불러도 추가로 제출하지 않음
+        assert question_pool.request_refill(app) == 0
+    assert len(submitted) == app.config["QUESTION_POOL_TARGET"] - size
+
+
+def test_concurrent_pops_never_hand_out_the_same_set(app):
+    _add_sets(app, 12)
+    taken = []
+    errors = []
+    barrier = threading.Barrier(4)
+
+    def worker():
+        with app.app_context():
+            try:
+                barrier.wait()
+                while True:
+                    questionList = question_pool.pop_question_set()
+                    if questionList:
+                        taken.append(questionList[0]["question"])
+                    elif question_pool.pool_size() == 0:
+                        # 경합으로 세 번 모두 다른 워커에 밀리면 세트가 남아 있어도 None 이므로 풀이 빈 경우에만 끝냄
+                        return
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(taken) == sorted(_question_set(n)[0]["question"] for n in range(12))
+    with app.app_context():
+        assert question_pool.pool_size() == 0
+
+
+def test_return_question_set_skips_incomplete_sets(app):
+    app.config["QUESTION_POOL_ENABLED"] = True
+    with app.app_context():
+        assert not question_pool.return_question_set([{"type": "None", "question": "질문 1 생성 실패"}])
+        assert question_pool.return_question_set(_question_set(0))
+        assert question_pool.pop_question_set() == _question_set(0)
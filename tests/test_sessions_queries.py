@@ -0,0 +1,47 @@
+"""GET /api/interview/sessions 는 세션 수와 관계없이 쿼리 수가 같아야 한다 (세션마다 쿼리하는 N+1 회귀 방지)"""
+
+import uuid
+import datetime
+
+from app import db
+from app.models import Interview, InterviewSession
+
+
+def _seed_sessions(app, user_id, count, questions=3):
+    with app.app_context():
+        base = datetime.datetime(2024, 1, 1)
+        for n in range(count):
+            session_id = str(uuid.uuid4())
+            created = base + datetime.timedelta(minutes=n)
+            db.session.add(InterviewSession(
+                id=session_id, user_id=user_id, type="인성", status="answered",
+                question_count=questions, answered_count=questions, created_at=created,
+            ))
+            for order in range(questions):
+                db.session.add(Interview(
+                    user_id=user_id, session_id=session_id, question_order=order,
+                    question=f"질문 {order}", useranswer=f"답변 {order}", type="인성", timestamp=created,
+                ))
+        db.session.commit()
+
+
+def _fetch_sessions(client, headers, count_queries):
+    with count_queries() as statements:
+        response = client.get("/api/interview/sessions?limit=100", headers=headers)
+    assert response.status_code == 200
+    return response.get_json()["data"]["sessions"], len(statements)
+
+
+def test_session_list_query_count_does_not_grow_with_sessions(app, client, user, count_queries):
+    user_id, headers = user
+
+    _seed_sessions(app, user_id, 2)
+    sessions, few = _fetch_sessions(client, headers, count_queries)
+    assert len(sessions) == 2
+
+    _seed_sessions(app, user_id, 48)
+    sessions, many = _fetch_sessions(client, headers, count_queries)
+    assert len(sessions) == 50
+    assert all(len(s["interviews"]) == 3 for s in sessions)
+
+    assert many == few
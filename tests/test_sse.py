@@ -0,0 +1,131 @@
+"""SSE 엔드포인트: 메시지 형식(event/data/빈 줄)과 실패 시 'error' 이벤트, 실패한 질문 세트를 저장하지 않는지"""
+
+import json
+
+from app import db
+from app.models import Interview
+from app.routes import interview as interview_routes
+from app.services import interview_sessions, llm_service
+
+
+def _events(response):
+    """응답 본문을 (event, data) 목록으로 (메시지마다 'event:' 줄, 'data:' 줄, 빈 줄)"""
+    body = response.get_data(as_text=True)
+    assert body.endswith("\n\n")
+    events = []
+    for message in body.split("\n\n")[:-1]:
+        event_line, data_line = message.split("\n")
+        assert event_line.startswith("event: ") and data_line.startswith("data: ")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+def _questions(count):
+    return [{"question": f"질문 {i}", "answer": f"모범 답 {i}", "type": "간호사"} for i in range(count)]
+
+
+def test_question_stream_events(app, client, user, monkeypatch):
+    user_id, headers = user
+    monkeypatch.setattr(interview_routes, "stream_questions", lambda: iter(_questions(3)))
+    # EventSource 는 헤더를 못 붙이므로 ?jwt= 로 인증
+    token = headers["Authorization"].split(" ", 1)[1]
+    response = client.get("/api/interview/start/stream?jwt=" + token)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    events = _events(response)
+    assert [event for event, _ in events] == ["session", "question", "question", "question", "done"]
+    session_id = events[0][1]["session_id"]
+    assert [data["index"] for event, data in events if event == "question"] == [0, 1, 2]
+    done = events[-1][1]
+    assert done["session_id"] == session_id
+    with app.app_context():
+        rows = Interview.query.filter_by(session_id=session_id).order_by(Interview.question_order).all()
+        assert [(q["interview_id"], q["question_order"]) for q in done["questionList"]] == \
+            [(row.id, row.question_order) for row in rows]
+
+
+def test_question_stream_error_event_saves_nothing(app, client, user, monkeypatch):
+    _, headers = user
+
+    def failing_stream():
+        yield _questions(1)[0]
+        raise RuntimeError("LLM down")
+
+    monkeypatch.setattr(interview_routes, "stream_questions", failing_stream)
+    events = _events(client.get("/api/interview/start/stream", headers=headers))
+    assert [event for event, _ in events] == ["session", "question", "error"]
+    assert events[-1][1] == {"code": "500", "message": "Failed to generate question"}
+
+    # 3개를 다 받지 못한 경우도 자리표시 질문 없이 실패
+    monkeypatch.setattr(interview_routes, "stream_questions", lambda: iter(_questions(2)))
+    events = _events(client.get("/api/interview/start/stream", headers=headers))
+    assert [event for event, _ in events] == ["session", "question", "question", "error"]
+    with app.app_context():
+        assert Interview.query.count() == 0
+
+
+def test_stream_questions_parses_split_lines(monkeypatch):
+    text = "<think>면접 질문 0: 무시</think>\n면접 질문 1: 첫 질문\n모범 답 1: 첫 답\n면접 질문 2: 둘째\n모범 답 2: 둘째 답\n"
+    # 줄 중간에서 끊겨 들어와도 완성된 줄만 처리
+    monkeypatch.setattr(llm_service, "stream_chat_completion",
+                        lambda **kwargs: iter(text[i:i + 5] for i in range(0, len(text), 5)))
+    assert list(llm_service.stream_questions()) == [
+        {"question": "첫 질문", "answer": "첫 답", "type": "간호사"},
+        {"question": "둘째", "answer": "둘째 답", "type": "간호사"},
+    ]
+
+
+def _add_session(app, user_id):
+    with app.app_context():
+        questionList = _questions(2)
+        for order, q in enumerate(questionList):
+            db.session.add(Interview(user_id=user_id, session_id="s-1", question_order=order,
+                                     question=q["question"], useranswer=f"답변 {order}"))
+        interview_sessions.create(user_id, "s-1", questionList)
+        db.session.commit()
+
+
+def test_analysis_stream_events_and_saved_result(app, client, user, monkeypatch):
+    user_id, headers = user
+    _add_session(app, user_id)
+    scores = {"구체성": 70, "논리성": 80, "적합성": 60, "표현력": 50, "전문성": 90}
+
+    def stream_analysis(user_id, session_id):
+        yield "item", {"index": 2, "analysis": "두 번째", "score": 20}
+        yield "item", {"index": 1, "analysis": "첫 번째", "score": 10}
+        yield "summary", {"InterviewList": [], "summary": "총평", "scores": scores}
+
+    monkeypatch.setattr(interview_routes, "stream_analysis", stream_analysis)
+    events = _events(client.get("/api/analysis/stream?session_id=s-1", headers=headers))
+    assert [event for event, _ in events] == ["session", "item", "item", "summary", "done"]
+    assert [data["index"] for event, data in events if event == "item"] == [2, 1]
+    # summary 이벤트에는 총평과 점수만 (항목은 이미 보냄)
+    assert events[3][1] == {"summary": "총평", "scores": scores}
+
+    # 스트리밍 결과가 저장되어 /api/analysis/info 가 작업을 다시 큐에 넣지 않고 바로 반환
+    response = client.get("/api/analysis/info?session_id=s-1", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["data"]["summary"]["summary"] == "총평"
+
+
+def test_analysis_stream_error_event(app, client, user, monkeypatch):
+    user_id, headers = user
+    _add_session(app, user_id)
+
+    def stream_analysis(user_id, session_id):
+        yield "item", {"index": 1, "analysis": "첫 번째", "score": 10}
+        raise ValueError("analysis stream ended without valid JSON")
+
+    monkeypatch.setattr(interview_routes, "stream_analysis", stream_analysis)
+    events = _events(client.get("/api/analysis/stream?session_id=s-1", headers=headers))
+    assert [event for event, _ in events] == ["session", "item", "error"]
+    assert events[-1][1] == {"code": "500", "message": "Analysis failed"}
+
+
+def test_analysis_stream_unknown_session_is_json_404(client, user):
+    _, headers = user
+    response = client.get("/api/analysis/stream?session_id=missing", headers=headers)
+    assert response.status_code == 404
+    assert response.get_json() == {"result": "fail", "code": "404", "message": "No interviews found for this session"}
@@ -0,0 +1,92 @@
+"""json_schema → json_object 낮추기: response_format 관련 400 에만, 기한이 지나면 다시 json_schema, 스트리밍도 같은 규칙"""
+
+import pytest
+from openai import BadRequestError
+
+from app.services import structured_output
+
+SCHEMA = {"type": "object", "required": ["a"], "properties": {"a": {"type": "integer"}}}
+
+
+def _bad_request(message):
+    # 생성자는 openai 버전마다 다른 HTTP 응답 객체를 요구하므로 필요한 속성만 채움
+    error = BadRequestError.__new__(BadRequestError)
+    Exception.__init__(error, message)
+    error.message = message
+    error.body = {"error": {"message": message}}
+    return error
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    monkeypatch.setattr(structured_output, "LLM_STRUCTURED_OUTPUT", "json_schema")
+    monkeypatch.setattr(structured_output, "_json_schema_unsupported", {})
+
+
+def _format_type(kwargs):
+    return kwargs.get("response_format", {}).get("type")
+
+
+def test_unrelated_bad_request_does_not_downgrade(monkeypatch):
+    def chat_completion(**kwargs):
+        raise _bad_request("The input token count exceeds the maximum")
+
+    monkeypatch.setattr(structured_output, "chat_completion", chat_completion)
+    with pytest.raises(BadRequestError):
+        structured_output._create("m", [], "x", SCHEMA)
+    assert _format_type(structured_output.response_format_for("m", "x", SCHEMA)) == "json_schema"
+
+
+def test_schema_rejection_downgrades_until_expiry(monkeypatch):
+    calls = []
+
+    def chat_completion(**kwargs):
+        calls.append(_format_type(kwargs))
+        if _format_type(kwargs) == "json_schema":
+            raise _bad_request("Invalid value for 'response_format': json_schema is not supported")
+        return "ok"
+
+    monkeypatch.setattr(structured_output, "chat_completion", chat_completion)
+    now = [1000.0]
+    monkeypatch.setattr(structured_output.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(structured_output, "LLM_JSON_SCHEMA_RETRY_AFTER", 60)
+
+    assert structured_output._create("m", [], "x", SCHEMA) == "ok"
+    assert calls == ["json_schema", "json_object"]
+    assert structured_output.get_stats()["json_schema_unsupported"] == ["m"]
+
+    now[0] += 30
+    assert _format_type(structured_output.response_format_for("m", "x", SCHEMA)) == "json_object"
+    now[0] += 31
+    assert _format_type(structured_output.response_format_for("m", "x", SCHEMA)) == "json_schema"
+    assert structured_output.get_stats()["json_schema_unsupported"] == []
+
+
+def test_stream_falls_back_on_schema_rejection(monkeypatch):
+    calls = []
+
+    def stream_chat_completion(**kwargs):
+        calls.append(_format_type(kwargs))
+        if _format_type(kwargs) == "json_schema":
+            raise _bad_request("response_format.json_schema is not supported by this model")
+        yield '{"a":'
+        yield ' 1}'
+
+    monkeypatch.setattr(structured_output, "stream_chat_completion", stream_chat_completion)
+    assert "".join(structured_output.stream_structured("m", [], "x", SCHEMA)) == '{"a": 1}'
+    assert calls == ["json_schema", "json_object"]
+
+
+def test_failed_question_generation_is_not_padded(app, client, user, monkeypatch):
+    from app.services import llm_service
+
+    _, headers = user
+    # 스키마 검사와 재시도까지 실패 → 자리표시 질문 없이 빈 목록, 라우트는 생성 실패 응답
+    monkeypatch.setattr(llm_service, "structured_completion", lambda **kwargs: None)
+    assert llm_service.generate_question() == []
+    response = client.get("/api/interview/start", headers=headers)
+    assert response.status_code == 500
+    assert client.get("/api/interview", headers=headers).status_code == 500
+    with app.app_context():
+        from app.models import Interview
+        assert Interview.query.count() == 0
@@ -0,0 +1,128 @@
+"""이어 받기 업로드: 같은 오프셋 동시 기록 방지, 끊긴 요청의 오프셋, 인터뷰 삭제 후 finalize, 만료 정리"""
+
+import io
+import os
+import datetime
+
+import pytest
+
+from app import db
+from app.models import Interview, VideoUpload
+from app.routes.video import sweep_expired_uploads
+
+
+@pytest.fixture
+def interview_id(app, user):
+    user_id, _ = user
+    with app.app_context():
+        row = Interview(user_id=user_id, session_id="s-1", question_order=0, question="질문")
+        db.session.add(row)
+        db.session.commit()
+        return row.id
+
+
+def _start(client, headers, interview_id, size):
+    response = client.post("/api/interview/video/upload", headers=headers,
+                           json={"interview_id": interview_id, "filename": "answer.webm", "size": size})
+    assert response.status_code == 200
+    return response.get_json()["data"]["upload_id"]
+
+
+def _patch(client, headers, upload_id, offset, body):
+    return client.patch(f"/api/interview/video/upload/{upload_id}", data=body,
+                        headers={**headers, "Upload-Offset": str(offset)})
+
+
+def test_upload_in_chunks_and_finalize(app, client, user, interview_id):
+    _, headers = user
+    upload_id = _start(client, headers, interview_id, 10)
+
+    assert _patch(client, headers, upload_id, 0, b"01234").get_json()["data"]["offset"] == 5
+    assert _patch(client, headers, upload_id, 0, b"01234").status_code == 409  # 이미 받은 오프셋
+    assert _patch(client, headers, upload_id, 5, b"56789").get_json()["data"]["offset"] == 10
+
+    response = client.post(f"/api/interview/video/upload/{upload_id}/finalize", headers=headers)
+    assert response.get_json()["data"]["status"] == "complete"
+    with app.app_context():
+        path = db.session.get(Interview, interview_id).video
+    with open(path, "rb") as f:
+        assert f.read() == b"0123456789"
+
+
+def test_same_offset_is_written_by_one_request(app, client, user, interview_id):
+    _, headers = user
+    upload_id = _start(client, headers, interview_id, 10)
+    with app.app_context():
+        # 다른 요청이 오프셋 0 을 쓰는 중
+        VideoUpload.query.filter_by(id=upload_id).update(
+            {"status": "writing", "updated_at": datetime.datetime.utcnow()})
+        db.session.commit()
+
+    response = _patch(client, headers, upload_id, 0, b"01234")
+    assert response.status_code == 409
+    assert response.get_json()["message"] == "Upload in progress"
+
+    with app.app_context():
+        # 쓰던 요청이 죽어 제한 시간이 지나면 이어서 쓸 수 있음
+        VideoUpload.query.filter_by(id=upload_id).update(
+            {"updated_at": datetime.datetime.utcnow() - datetime.timedelta(hours=1)})
+        db.session.commit()
+    assert _patch(client, headers, upload_id, 0, b"01234").get_json()["data"] == {
+        "upload_id": upload_id, "offset": 5, "size": 10, "status": "uploading"}
+
+
+class _BrokenStream(io.BytesIO):
+    """앞의 몇 바이트만 보내고 연결이 끊기는 요청 본문"""
+
+    def read(self, size=-1):
+        data = super().read(size)
+        if not data:
+            raise ConnectionResetError("client disconnected")
+        return data
+
+
+def test_interrupted_chunk_keeps_written_offset(app, client, user, interview_id):
+    _, headers = user
+    upload_id = _start(client, headers, interview_id, 10)
+    app.config["VIDEO_CHUNK_BUFFER"] = 3
+
+    # werkzeug 는 본문을 읽다 난 연결 오류를 본문 끝으로 처리함
+    client.patch(f"/api/interview/video/upload/{upload_id}", input_stream=_BrokenStream(b"012"),
+                 headers={**headers, "Upload-Offset": "0", "Content-Length": "10"})
+
+    data = client.get(f"/api/interview/video/upload/{upload_id}", headers=headers).get_json()["data"]
+    assert data["offset"] == 3
+    assert data["status"] == "uploading"
+    assert _patch(client, headers, upload_id, 3, b"3456789").get_json()["data"]["offset"] == 10
+
+
+def test_finalize_after_interview_deleted_returns_404(app, client, user, interview_id):
+    _, headers = user
+    upload_id = _start(client, headers, interview_id, 3)
+    _patch(client, headers, upload_id, 0, b"abc")
+    with app.app_context():
+        Interview.query.filter_by(id=interview_id).delete()
+        db.session.commit()
+
+    response = client.post(f"/api/interview/video/upload/{upload_id}/finalize", headers=headers)
+    assert response.status_code == 404
+
+
+def test_sweep_removes_abandoned_uploads(app, client, user, interview_id):
+    _, headers = user
+    abandoned = _start(client, headers, interview_id, 10)
+    active = _start(client, headers, interview_id, 10)
+    uploads_dir = os.path.join(app.config["VIDEO_DIR"], ".uploads")
+    orphan = os.path.join(uploads_dir, "orphan.part")
+    open(orphan, "wb").close()
+    old = datetime.datetime.utcnow() - datetime.timedelta(seconds=app.config["VIDEO_UPLOAD_EXPIRY"] + 60)
+    os.utime(orphan, (old.timestamp(), old.timestamp() - 86400))
+
+    with app.app_context():
+        VideoUpload.query.filter_by(id=abandoned).update({"updated_at": old})
+        db.session.commit()
+        assert sweep_expired_uploads() == 1
+        assert db.session.get(VideoUpload, abandoned) is None
+        assert db.session.get(VideoUpload, active) is not None
+
+    assert sorted(os.listdir(uploads_dir)) == [f"{active}.part"]